@@ -0,0 +1,129 @@
+"""
+Embedding backend parity / throughput benchmark.
+
+fp32 torch backend를 기준으로 다른 backend(torch-int8, onnx)의 dense cosine drift와
+sparse(lexical weight) drift를 fixture corpus에서 측정하고, backend별 처리량(texts/sec)을 비교합니다.
+`--max-drift`를 넘으면 exit code 1로 종료하므로 배포 전 parity 검사로 사용할 수 있습니다.
+
+    cd app
+    python -m benchmarks.embedding_backend --backend torch-int8
+    python -m benchmarks.embedding_backend --backend onnx --onnx-path /models/bge-m3.int8.onnx
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from util.embedding_backend import EmbeddingBackend, load_bgem3_model
+
+FIXTURE_CORPUS = [
+    "What is BGE M3?",
+    "Defination of BM25",
+    "서울은 대한민국의 수도이며 정치, 경제, 문화의 중심지이다.",
+    "RAG는 검색 증강 생성(Retrieval-Augmented Generation)의 약자로, 외부 지식을 검색하여 답변 생성에 활용한다.",
+    "BGE M3 is an embedding model supporting dense retrieval, lexical matching and multi-vector interaction.",
+    "BM25 is a bag-of-words retrieval function that ranks a set of documents based on the query terms "
+    "appearing in each document.",
+    "Milvus는 대규모 벡터 데이터를 저장하고 유사도 검색을 수행하는 오픈소스 벡터 데이터베이스이다.",
+    "The knowledge base is split into chunks of a configurable length with overlap before embedding.",
+    "지식 데이터는 파일 업로드 후 청크 단위로 분할되어 dense vector와 sparse vector로 저장된다.",
+    "Hybrid search combines dense semantic similarity with sparse lexical matching using weighted fusion.",
+    "모델 레지스트리는 MLflow를 통해 모델 버전과 학습 기록을 관리한다.",
+    "Quantization reduces model size and inference latency by representing weights with lower precision.",
+    " ".join(["긴 문서의 임베딩 처리량을 측정하기 위한 반복 문장입니다."] * 40),
+    " ".join(["This sentence is repeated to measure throughput on long inputs."] * 40),
+]
+
+
+def _encode(model, texts: list[str], batch_size: int, max_length: int) -> dict:
+    return model.encode(
+        texts,
+        batch_size=batch_size,
+        max_length=max_length,
+        return_dense=True,
+        return_sparse=True,
+        return_colbert_vecs=False,
+    )
+
+
+def _sparse_cosine(left: dict, right: dict) -> float:
+    dot = sum(float(weight) * float(right.get(token, 0)) for token, weight in left.items())
+    left_norm = np.sqrt(sum(float(weight) ** 2 for weight in left.values()))
+    right_norm = np.sqrt(sum(float(weight) ** 2 for weight in right.values()))
+    if left_norm == 0 or right_norm == 0:
+        return 1.0 if left_norm == right_norm else 0.0
+    return dot / (left_norm * right_norm)
+
+
+def measure_parity(reference: dict, candidate: dict) -> dict[str, float]:
+    """
+    기준 backend와 비교 backend의 encode 결과 차이를 계산합니다.
+
+    Args:
+        reference (dict): 기준(fp32) encode 결과.
+        candidate (dict): 비교 대상 encode 결과.
+
+    Returns:
+        dict[str, float]: dense/sparse cosine 유사도의 평균·최솟값과 최대 drift(1 - 최소 cosine).
+    """
+    reference_dense = np.asarray(reference["dense_vecs"], dtype=np.float32)
+    candidate_dense = np.asarray(candidate["dense_vecs"], dtype=np.float32)
+    dense_cosine = np.sum(reference_dense * candidate_dense, axis=1) / (
+        np.linalg.norm(reference_dense, axis=1) * np.linalg.norm(candidate_dense, axis=1)
+    )
+    sparse_cosine = np.array(
+        [_sparse_cosine(left, right) for left, right in zip(reference["lexical_weights"], candidate["lexical_weights"])]
+    )
+    return {
+        "dense_cosine_mean": float(dense_cosine.mean()),
+        "dense_cosine_min": float(dense_cosine.min()),
+        "dense_max_drift": float(1 - dense_cosine.min()),
+        "sparse_cosine_mean": float(sparse_cosine.mean()),
+        "sparse_cosine_min": float(sparse_cosine.min()),
+        "sparse_max_drift": float(1 - sparse_cosine.min()),
+    }
+
+
+def measure_throughput(model, texts: list[str], *, batch_size: int, max_length: int, repeats: int) -> float:
+    """encode를 `repeats`번 반복하여 초당 처리한 텍스트 수를 반환합니다."""
+    _encode(model, texts[:1], batch_size, max_length)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _encode(model, texts, batch_size, max_length)
+    return len(texts) * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-name", default="BAAI/bge-m3")
+    parser.add_argument(
+        "--backend", default=EmbeddingBackend.TORCH_INT8.value, choices=[backend.value for backend in EmbeddingBackend]
+    )
+    parser.add_argument("--onnx-path")
+    parser.add_argument("--batch-size", type=int, default=12)
+    parser.add_argument("--max-length", type=int, default=8192)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-drift", type=float, default=0.02)
+    args = parser.parse_args()
+
+    reference_model = load_bgem3_model(args.model_name, EmbeddingBackend.TORCH)
+    candidate_model = load_bgem3_model(args.model_name, args.backend, onnx_path=args.onnx_path)
+
+    report = measure_parity(
+        _encode(reference_model, FIXTURE_CORPUS, args.batch_size, args.max_length),
+        _encode(candidate_model, FIXTURE_CORPUS, args.batch_size, args.max_length),
+    )
+    throughput_kwargs = {"batch_size": args.batch_size, "max_length": args.max_length, "repeats": args.repeats}
+    report["reference_texts_per_sec"] = measure_throughput(reference_model, FIXTURE_CORPUS, **throughput_kwargs)
+    report["candidate_texts_per_sec"] = measure_throughput(candidate_model, FIXTURE_CORPUS, **throughput_kwargs)
+    report["speedup"] = report["candidate_texts_per_sec"] / report["reference_texts_per_sec"]
+    report["backend"] = args.backend
+    print(json.dumps(report, indent=2))
+
+    if report["dense_max_drift"] > args.max_drift or report["sparse_max_drift"] > args.max_drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Retrieval parameter sweep benchmark.
+
+정답 chunk가 표시된 query 집합으로 검색 유형, top_k, dense search params, hybrid 가중치의 조합마다
+recall@k, MRR, query당 latency(p50/p95/p99), QPS를 측정하여 표와 JSON으로 출력합니다.
+
+오프라인 모드(--corpus): corpus를 임시 컬렉션에 적재한 뒤 MilvusSearchManager로 검색합니다.
+query 인코딩은 한 번만 하므로 latency는 Milvus 검색(+rescoring) 시간입니다. 실행 후 임시 컬렉션은 삭제합니다.
+MILVUS_URI를 로컬 파일로 지정하면 Milvus 서버 없이 Milvus Lite로 실행되며(Milvus Lite는 FLAT, IVF_FLAT, AUTOINDEX만 지원),
+--engine local이면 프로세스 안의 local vector engine(FLAT 또는 HNSW)으로 실행됩니다.
+
+    cd app
+    MILVUS_URI=./benchmark.db python -m benchmarks.retrieval_sweep \\
+        --corpus corpus.jsonl --queries queries.jsonl --top-k 5,10 --search-params '[{"nprobe": 8}, {"nprobe": 32}]'
+
+지식 모드(--knowledge-id): 이미 적재된 지식에 EvaluationService.retrieve로 검색합니다.
+latency는 query 인코딩을 포함한 end-to-end 시간이며, search params는 DB에 저장하지 않고 실행 중에만 바꿉니다.
+
+    python -m benchmarks.retrieval_sweep --knowledge-id 3 --queries queries.jsonl --weights 0.3,0.5,0.7
+
+queries.jsonl은 {"query": ..., "relevant_ids": [...]} 형식입니다. 오프라인 모드의 relevant_ids는
+corpus.jsonl({"id": ..., "text": ...})의 id이고 (corpus 순번을 chunk id로 적재하여 대응),
+지식 모드의 relevant_ids는 retrieval API가 반환하는 chunk id입니다.
+"""
+import argparse
+import itertools
+import json
+import math
+import time
+from typing import Callable
+
+import numpy as np
+from util.embedding import encode_texts
+from util.fusion import FusionMode
+from util.sparse import prune_sparse_vectors
+from util.vector_database import (
+    CHUNK_ID_FIELD,
+    DENSE_VECTOR_FIELD,
+    METADATA_DEFAULTS,
+    SEARCH_TYPE_VECTOR_FIELDS,
+    SPARSE_VECTOR_FIELD,
+)
+from util.vector_engine import VectorEngine, get_search_manager_class, get_vector_manager
+
+SEARCH_TYPE_NAMES = {1: "dense", 2: "sparse", 3: "hybrid"}
+
+
+def _read_labelled_jsonl(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _configurations(search_types: list[int], top_ks: list[int], search_params: list, weights: list[float]):
+    """검색 유형별로 의미 있는 parameter 조합만 만듭니다. (sparse 검색은 dense search params, 가중치와 무관)"""
+    for search_type, top_k in itertools.product(search_types, top_ks):
+        params_grid = [None] if search_type == 2 else search_params
+        weight_grid = weights if search_type == 3 else [None]
+        for params, dense_weight in itertools.product(params_grid, weight_grid):
+            yield {
+                "search_type": SEARCH_TYPE_NAMES[search_type],
+                "search_type_id": search_type,
+                "top_k": top_k,
+                "search_params": params,
+                "dense_weight": dense_weight,
+            }
+
+
+def _measure(search: Callable[[int], list], relevant: list[set], warmup: int) -> dict:
+    """
+    query마다 `search(query_index)`를 순서대로 호출하여 검색 품질과 latency를 측정합니다.
+
+    Args:
+        search (Callable[[int], list]): query index → 순위대로 정렬된 결과 key 목록.
+        relevant (list[set]): query별 정답 key 집합.
+        warmup (int): 측정 전에 호출할 query 수.
+
+    Returns:
+        dict: recall@k, MRR, latency(ms) 분위수, QPS.
+    """
+    for index in range(min(warmup, len(relevant))):
+        search(index)
+
+    recalls, reciprocal_ranks, latencies = [], [], []
+    start = time.perf_counter()
+    for index, expected in enumerate(relevant):
+        query_start = time.perf_counter()
+        keys = search(index)
+        latencies.append(time.perf_counter() - query_start)
+        recalls.append(len(expected & set(keys)) / len(expected) if expected else 0.0)
+        rank = next((rank for rank, key in enumerate(keys, 1) if key in expected), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "recall_at_k": float(np.mean(recalls)),
+        "mrr": float(np.mean(reciprocal_ranks)),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "qps": len(relevant) / elapsed,
+    }
+
+
+def sweep_collection(
+    corpus: list[dict],
+    queries: list[dict],
+    configurations: list[dict],
+    *,
+    collection_name: str,
+    engine: VectorEngine | str,
+    index_type: str | None,
+    index_params: dict | None,
+    warmup: int,
+    fusion_mode: FusionMode | str = FusionMode.SERVER,
+) -> list[dict]:
+    """corpus를 임시 컬렉션에 적재하고 vector engine의 search manager로 조합별 검색을 측정합니다."""
+    texts = [document["text"] for document in corpus]
+    relevant = [set(query["relevant_ids"]) for query in queries]
+
+    documents = encode_texts(texts)
+    query_embeddings = encode_texts([query["query"] for query in queries])
+    query_sparse = prune_sparse_vectors(query_embeddings["lexical_weights"])
+
+    vector_manager = get_vector_manager(engine)
+    vector_manager.drop_collection(collection_name)
+    vector_manager.create_collection(
+        collection_name,
+        dimension=documents["dense_vecs"].shape[-1],
+        index_type=index_type,
+        index_params=index_params,
+    )
+    try:
+        vector_manager.embed_documents(
+            collection_name,
+            {
+                CHUNK_ID_FIELD: list(range(len(corpus))),
+                DENSE_VECTOR_FIELD: list(documents["dense_vecs"]),
+                SPARSE_VECTOR_FIELD: prune_sparse_vectors(documents["lexical_weights"]),
+                "text": texts,
+                **{name: [default] * len(texts) for name, default in METADATA_DEFAULTS.items()},
+            },
+            flush=True,
+        )
+        reports = []
+        for configuration in configurations:
+            search_manager = get_search_manager_class(engine)(
+                collection_name,
+                configuration["top_k"],
+                index_type=index_type,
+                search_params=configuration["search_params"],
+            )
+
+            def search(index: int) -> list:
+                dense = query_embeddings["dense_vecs"][index : index + 1]
+                sparse = query_sparse[index : index + 1]
+                if configuration["search_type_id"] == 1:
+                    hits = search_manager.dense_search(dense)
+                elif configuration["search_type_id"] == 2:
+                    hits = search_manager.sparse_search(sparse)
+                else:
+                    dense_weight = configuration["dense_weight"]
+                    hits = search_manager.hybrid_search(
+                        dense, sparse, dense_weight, 1 - dense_weight, fusion_mode=fusion_mode
+                    )
+                return [corpus[hit.id]["id"] for hit in hits[0]]
+
+            reports.append({**configuration, **_measure(search, relevant, warmup)})
+        return reports
+    finally:
+        vector_manager.drop_collection(collection_name)
+
+
+def sweep_knowledge(knowledge_id: int, queries: list[dict], configurations: list[dict], *, warmup: int) -> list[dict]:
+    """적재된 지식에 EvaluationService.retrieve로 조합별 검색을 측정합니다. DB 변경 사항은 commit하지 않습니다."""
+    from config.db.session import SessionLocal
+    from repos.knowledge import knowledge_repository
+    from schemas.evaluation import RetrievalRequestSchema
+    from services.evaluation_service import EvaluationService
+
+    relevant = [set(query["relevant_ids"]) for query in queries]
+    db = SessionLocal()
+    try:
+        knowledge_model = knowledge_repository.get(db, knowledge_id)
+        vector_fields = set(knowledge_model.vector_fields)
+        stored_search_params = knowledge_model.search_params
+        reports = []
+        for configuration in configurations:
+            if not set(SEARCH_TYPE_VECTOR_FIELDS[configuration["search_type_id"]]) <= vector_fields:
+                continue
+            # retrieve가 같은 session에서 조회하는 지식 객체에 실행 중에만 적용 (null이면 저장된 값)
+            knowledge_model.search_params = configuration["search_params"] or stored_search_params
+            dense_weight = configuration["dense_weight"] or 0.0
+
+            def search(index: int) -> list:
+                request = RetrievalRequestSchema(
+                    query=queries[index]["query"],
+                    knowledge_id=knowledge_id,
+                    search_type_id=configuration["search_type_id"],
+                    top_k=configuration["top_k"],
+                    threshold_score=-math.inf,
+                    dense_weight=dense_weight,
+                    sparse_weight=1 - dense_weight,
+                )
+                return [item["id"] for item in EvaluationService.retrieve(request, db)]
+
+            reports.append({**configuration, **_measure(search, relevant, warmup)})
+        return reports
+    finally:
+        db.rollback()
+        db.close()
+
+
+TABLE_COLUMNS = (
+    "search_type", "top_k", "search_params", "dense_weight", "recall_at_k", "mrr", "p50_ms", "p95_ms", "p99_ms", "qps"
+)
+
+
+def _format_cell(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
+
+def _format_table(reports: list[dict]) -> str:
+    columns = TABLE_COLUMNS
+    rows = [[_format_cell(report[column]) for column in columns] for report in reports]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths))]
+    lines += ["  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", help="오프라인 모드: {id, text} JSONL")
+    source.add_argument("--knowledge-id", type=int, help="지식 모드: 적재된 지식 ID")
+    parser.add_argument("--queries", required=True, help="{query, relevant_ids} JSONL")
+    parser.add_argument("--search-types", default="1,2,3", help="1=dense, 2=sparse, 3=hybrid")
+    parser.add_argument("--top-k", default="5,10")
+    parser.add_argument("--search-params", default="[null]", help='dense search params JSON 목록, 예: [{"ef": 64}]')
+    parser.add_argument("--weights", default="0.4,0.6,0.8", help="hybrid 검색의 dense 가중치 (sparse = 1 - dense)")
+    parser.add_argument(
+        "--engine", default=VectorEngine.MILVUS.value, choices=[engine.value for engine in VectorEngine]
+    )
+    parser.add_argument(
+        "--fusion-mode",
+        default=FusionMode.SERVER.value,
+        choices=[mode.value for mode in FusionMode],
+        help="오프라인 모드 hybrid 검색의 fusion 위치",
+    )
+    parser.add_argument("--index-type", help="오프라인 모드 컬렉션의 dense index 유형")
+    parser.add_argument("--index-params", type=json.loads, help="오프라인 모드 컬렉션의 dense index build params JSON")
+    parser.add_argument("--collection", default="benchmark_retrieval_sweep")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    queries = _read_labelled_jsonl(args.queries)
+    configurations = list(
+        _configurations(
+            [int(item) for item in args.search_types.split(",")],
+            [int(item) for item in args.top_k.split(",")],
+            json.loads(args.search_params),
+            [float(item) for item in args.weights.split(",")],
+        )
+    )
+    if args.corpus:
+        reports = sweep_collection(
+            _read_labelled_jsonl(args.corpus),
+            queries,
+            configurations,
+            collection_name=args.collection,
+            engine=args.engine,
+            index_type=args.index_type,
+            index_params=args.index_params,
+            warmup=args.warmup,
+            fusion_mode=args.fusion_mode,
+        )
+    else:
+        reports = sweep_knowledge(args.knowledge_id, queries, configurations, warmup=args.warmup)
+
+    print(_format_table(reports))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
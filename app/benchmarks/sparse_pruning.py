@@ -0,0 +1,110 @@
+"""
+Sparse vector pruning benchmark.
+
+corpus와 query를 BGE-M3 sparse vector로 인코딩한 뒤, pruning하지 않은 inner product top-k를 정답으로 삼아
+ingestion/query pruning 설정별 recall@k와 document당 평균 term 수(insert payload / index 크기)를 비교합니다.
+
+    cd app
+    python -m benchmarks.sparse_pruning --corpus corpus.jsonl --queries queries.jsonl --top-k 10
+
+corpus.jsonl은 {"text": ...}, queries.jsonl은 {"query": ...} 형식의 JSONL이며,
+지정하지 않으면 embedding backend benchmark의 fixture corpus를 사용합니다.
+"""
+import argparse
+import itertools
+import json
+
+import numpy as np
+from benchmarks.embedding_backend import FIXTURE_CORPUS
+from util.embedding import encode_texts
+from util.sparse import prune_sparse_vectors
+
+
+def _read_jsonl(path: str, key: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)[key] for line in f if line.strip()]
+
+
+def _build_inverted_index(documents: list[dict[int, float]]) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    postings: dict[int, tuple[list[int], list[float]]] = {}
+    for doc_id, weights in enumerate(documents):
+        for token, weight in weights.items():
+            doc_ids, values = postings.setdefault(token, ([], []))
+            doc_ids.append(doc_id)
+            values.append(weight)
+    return {
+        token: (np.asarray(doc_ids, dtype=np.int64), np.asarray(values, dtype=np.float32))
+        for token, (doc_ids, values) in postings.items()
+    }
+
+
+def _search(index: dict, num_documents: int, query: dict[int, float], top_k: int) -> np.ndarray:
+    scores = np.zeros(num_documents, dtype=np.float32)
+    for token, weight in query.items():
+        if token in index:
+            doc_ids, values = index[token]
+            np.add.at(scores, doc_ids, values * weight)
+    top_k = min(top_k, num_documents)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def run(corpus: list[str], queries: list[str], top_k: int, top_n_grid: list, min_weight_grid: list) -> list[dict]:
+    documents = prune_sparse_vectors(encode_texts(corpus, return_dense=False)["lexical_weights"])
+    query_vectors = prune_sparse_vectors(encode_texts(queries, return_dense=False)["lexical_weights"])
+
+    exact_index = _build_inverted_index(documents)
+    ground_truth = [set(_search(exact_index, len(documents), query, top_k).tolist()) for query in query_vectors]
+    baseline_terms = np.mean([len(weights) for weights in documents])
+
+    reports = []
+    for top_n, min_weight in itertools.product(top_n_grid, min_weight_grid):
+        pruned_documents = prune_sparse_vectors(documents, top_n=top_n, min_weight=min_weight)
+        pruned_queries = prune_sparse_vectors(query_vectors, top_n=top_n, min_weight=min_weight)
+        index = _build_inverted_index(pruned_documents)
+        recalls = [
+            len(expected & set(_search(index, len(pruned_documents), query, top_k).tolist())) / len(expected)
+            for query, expected in zip(pruned_queries, ground_truth)
+        ]
+        terms = np.mean([len(weights) for weights in pruned_documents])
+        reports.append(
+            {
+                "top_n": top_n,
+                "min_weight": min_weight,
+                f"recall@{top_k}": float(np.mean(recalls)),
+                "avg_terms_per_doc": float(terms),
+                "payload_ratio": float(terms / baseline_terms) if baseline_terms else 1.0,
+                # int64 index + float32 weight (Milvus sparse row 기준)
+                "avg_bytes_per_doc": float(terms * 12),
+            }
+        )
+    return reports
+
+
+def _parse_grid(value: str, cast) -> list:
+    return [None if item == "none" else cast(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus")
+    parser.add_argument("--queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--top-n", default="none,256,128,64,32")
+    parser.add_argument("--min-weight", default="none,0.01,0.05,0.1")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    corpus = _read_jsonl(args.corpus, "text") if args.corpus else FIXTURE_CORPUS
+    queries = _read_jsonl(args.queries, "query") if args.queries else FIXTURE_CORPUS[:4]
+    reports = run(corpus, queries, args.top_k, _parse_grid(args.top_n, int), _parse_grid(args.min_weight, float))
+
+    for report in reports:
+        print("  ".join(f"{key}={value}" for key, value in report.items()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Dense vector storage mode benchmark.
+
+corpus와 query를 dense vector로 인코딩한 뒤, float32 brute-force cosine top-k를 정답으로 삼아
+저장 모드(float16, binary, truncated)별 coarse search recall@k와 rescoring 후 recall@k,
+chunk 100만 개당 메모리(dense vector + text + primary key)를 비교합니다.
+
+    cd app
+    python -m benchmarks.vector_storage --corpus corpus.jsonl --queries queries.jsonl --top-k 10
+
+corpus.jsonl은 {"text": ...}, queries.jsonl은 {"query": ...} 형식의 JSONL이며,
+지정하지 않으면 embedding backend benchmark의 fixture corpus를 사용합니다.
+"""
+import argparse
+import json
+
+import numpy as np
+from benchmarks.embedding_backend import FIXTURE_CORPUS
+from benchmarks.sparse_pruning import _read_jsonl
+from util.embedding import encode_texts
+from util.vector_storage import (
+    VectorStorageMode,
+    bytes_per_vector,
+    cosine_scores,
+    to_storage_vectors,
+)
+
+CHUNKS_PER_MILLION = 1_000_000
+# primary key(INT64)
+ID_BYTES = 8
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def _recall(results: list[np.ndarray], ground_truth: list[set]) -> float:
+    recalls = [len(expected & set(result.tolist())) / len(expected) for result, expected in zip(results, ground_truth)]
+    return float(np.mean(recalls))
+
+
+def _coarse_scores(
+    documents: np.ndarray, query: np.ndarray, mode: VectorStorageMode, truncated_dimension: int | None
+) -> np.ndarray:
+    """Milvus가 저장 모드에서 계산하는 점수를 흉내냅니다. 값이 클수록 가까운 후보입니다."""
+    stored = to_storage_vectors(documents, mode, truncated_dimension)
+    stored_query = to_storage_vectors(query[None, :], mode, truncated_dimension)[0]
+    if mode == VectorStorageMode.BINARY:
+        bits = np.unpackbits(np.frombuffer(b"".join(stored), dtype=np.uint8).reshape(len(stored), -1), axis=-1)
+        query_bits = np.unpackbits(np.frombuffer(stored_query, dtype=np.uint8))
+        return -np.count_nonzero(bits != query_bits, axis=-1).astype(np.float32)
+    return cosine_scores(np.asarray(stored_query, dtype=np.float32), np.asarray(stored, dtype=np.float32))
+
+
+def run(
+    corpus: list[str], queries: list[str], top_k: int, modes: list[tuple[VectorStorageMode, int | None]], multipliers
+) -> list[dict]:
+    documents = encode_texts(corpus, return_sparse=False)["dense_vecs"]
+    query_vectors = encode_texts(queries, return_sparse=False)["dense_vecs"]
+    dimension = documents.shape[-1]
+    text_bytes = np.mean([len(text.encode("utf-8")) for text in corpus])
+    ground_truth = [set(_top_k(cosine_scores(query, documents), top_k).tolist()) for query in query_vectors]
+
+    reports = []
+    for mode, truncated_dimension in modes:
+        vector_bytes = bytes_per_vector(mode, dimension, truncated_dimension)
+        coarse = [_coarse_scores(documents, query, mode, truncated_dimension) for query in query_vectors]
+        report = {
+            "mode": mode.value,
+            "dimension": truncated_dimension or dimension,
+            "bytes_per_vector": vector_bytes,
+            "vector_gib_per_million": vector_bytes * CHUNKS_PER_MILLION / 2**30,
+            "total_gib_per_million": (vector_bytes + text_bytes + ID_BYTES) * CHUNKS_PER_MILLION / 2**30,
+            f"coarse_recall@{top_k}": _recall([_top_k(scores, top_k) for scores in coarse], ground_truth),
+        }
+        for multiplier in multipliers:
+            rescored = []
+            for query, scores in zip(query_vectors, coarse):
+                candidates = _top_k(scores, top_k * multiplier)
+                rescored.append(candidates[_top_k(cosine_scores(query, documents[candidates]), top_k)])
+            report[f"rescored_recall@{top_k}_x{multiplier}"] = _recall(rescored, ground_truth)
+        reports.append(report)
+    return reports
+
+
+def _format(value) -> str:
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+def _parse_modes(value: str) -> list[tuple[VectorStorageMode, int | None]]:
+    """`float16,binary,truncated:256` 형식"""
+    modes = []
+    for item in value.split(","):
+        name, _, truncated_dimension = item.partition(":")
+        modes.append((VectorStorageMode(name), int(truncated_dimension) if truncated_dimension else None))
+    return modes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus")
+    parser.add_argument("--queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--modes", default="float32,float16,binary,truncated:512,truncated:256")
+    parser.add_argument("--rescore-multipliers", default="2,4,8")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    corpus = _read_jsonl(args.corpus, "text") if args.corpus else FIXTURE_CORPUS
+    queries = _read_jsonl(args.queries, "query") if args.queries else FIXTURE_CORPUS[:4]
+    multipliers = [int(item) for item in args.rescore_multipliers.split(",")]
+    reports = run(corpus, queries, args.top_k, _parse_modes(args.modes), multipliers)
+
+    for report in reports:
+        print("  ".join(f"{key}={_format(value)}" for key, value in report.items()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
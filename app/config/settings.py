@@ -55,6 +55,70 @@ class Settings(BaseSettings):
     MILVUS_DB_PORT: str
     MILVUS_DB_NAME: str
     MILVUS_ADMIN_PORT: str
+    # 지정하면 HOST/PORT 대신 사용하는 Milvus URI. 로컬 파일 경로(예: ./milvus.db)는 Milvus Lite로 실행 (benchmark, 오프라인 환경)
+    MILVUS_URI: str | None = None
+    # Milvus insert: batch당 최대 크기(byte)·행 수, 동시에 진행할 insert 수, 파일 적재 후 flush 여부, collection 일관성 수준
+    MILVUS_INSERT_MAX_BATCH_BYTES: int = 16 * 1024 * 1024
+    MILVUS_INSERT_MAX_BATCH_ROWS: int = 5000
+    MILVUS_INSERT_MAX_IN_FLIGHT: int = 4
+    MILVUS_FLUSH_AFTER_INSERT: bool = True
+    MILVUS_CONSISTENCY_LEVEL: str = "Bounded"
+    # Milvus bulk import: Milvus가 읽는 object storage bucket, 파일 형식(parquet | numpy), 작업당 행 수, polling 간격·제한 시간(초)
+    MILVUS_BULK_IMPORT_BUCKET: str = "a-bucket"
+    MILVUS_BULK_IMPORT_FORMAT: str = "parquet"
+    MILVUS_BULK_IMPORT_ROWS_PER_FILE: int = 100000
+    MILVUS_BULK_IMPORT_POLL_INTERVAL: float = 2.0
+    MILVUS_BULK_IMPORT_TIMEOUT: float = 3600.0
+    # Milvus collection residency: 사용 여부(기본 꺼짐, 지식 컬렉션만 관리), query node 메모리 예산(byte), 재배치 주기·미사용 release 시간·사용량 반감기(초),
+    # 예산을 넘는 컬렉션의 mmap load 여부와 mmap 컬렉션의 메모리 비율, release된 컬렉션 첫 검색의 load 대기 시간(초)
+    MILVUS_RESIDENCY_ENABLED: bool = False
+    MILVUS_RESIDENCY_MEMORY_BUDGET: int = 8 * 1024**3
+    MILVUS_RESIDENCY_INTERVAL: float = 60.0
+    MILVUS_RESIDENCY_IDLE_TIMEOUT: float = 3600.0
+    MILVUS_RESIDENCY_HALF_LIFE: float = 600.0
+    MILVUS_RESIDENCY_MMAP_ENABLED: bool = True
+    MILVUS_RESIDENCY_MMAP_MEMORY_RATIO: float = 0.1
+    MILVUS_RESIDENCY_WARM_WAIT: float = 3.0
+    # shared 컬렉션(collection_layout=shared인 지식): partition key(지식 id)로 나누는 파티션 수, 이전 시 한 번에 읽는 엔티티 수
+    MILVUS_SHARED_NUM_PARTITIONS: int = 64
+    MILVUS_SHARED_MIGRATION_BATCH_SIZE: int = 1000
+
+    # Partition routing(partition_routing_top_n을 지정한 지식): 파일 centroid similarity의 softmax temperature
+    PARTITION_ROUTING_TEMPERATURE: float = 0.05
+    # Hybrid 검색(client fusion): dense 검색을 sparse 검색과 동시에 실행하는 thread 수
+    HYBRID_SEARCH_WORKERS: int = 8
+
+    # Local vector engine(vector_engine=local인 지식): collection 파일을 저장할 디렉터리
+    LOCAL_VECTOR_ENGINE_DIR: str = "./data/local_vectors"
+
+    # Embedding model: 로드할 모델 이름, fp16 사용 여부, 앱 시작 시 warm-up 여부
+    EMBEDDING_MODEL_NAME: str = "BAAI/bge-m3"
+    EMBEDDING_USE_FP16: bool = False
+    EMBEDDING_WARMUP_ON_STARTUP: bool = True
+    # Embedding backend: torch | torch-int8 | onnx (onnx는 EMBEDDING_ONNX_PATH 필요)
+    EMBEDDING_BACKEND: str = "torch"
+    EMBEDDING_ONNX_PATH: str | None = None
+
+    # Embedding cache: 메모리 LRU 항목 수, 디스크 캐시 경로(None이면 메모리 캐시만 사용)
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_DIR: str | None = None
+
+    # Embedding micro-batching: 동시 요청을 모으는 최대 대기 시간(ms)과 한 번에 인코딩할 최대 텍스트 수
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+
+    # Embedding encode: 최대 토큰 길이, batch당 토큰 예산(padding 포함), batch당 최대 텍스트 수
+    EMBEDDING_MAX_LENGTH: int = 8192
+    EMBEDDING_TOKEN_BUDGET: int = 16384
+    EMBEDDING_MAX_BATCH_SIZE: int = 64
+
+    # Embedding process pool: worker 수(0이면 비활성), worker당 torch thread 수, worker에 나눠줄 shard 크기
+    EMBEDDING_POOL_WORKERS: int = 0
+    EMBEDDING_POOL_THREADS_PER_WORKER: int = 1
+    EMBEDDING_POOL_SHARD_SIZE: int = 64
+
+    # Knowledge별 임베딩 모델(model registry): 동시에 메모리에 유지할 최대 모델 수
+    EMBEDDER_POOL_MAX_MODELS: int = 3
 
     LOADED_LLM: dict[str, dict] = {}
     LOADED_EMBEDDING_MODEL: dict[str, dict] = {}
@@ -43,3 +43,60 @@ class InvalidDocumentNameException(BaseCustomException):
     이름은 영문 소문자로 시작해야 하며, 사용할 수 있는 문자는 영문 소문자, 숫자, 언더스코어(_)만 사용할 수 있습니다.
     다음과 같은 특수문자는 사용할 수 없습니다. (\", *, +, /, \\, |, ?, #, >, <")
     """
+
+
+class UnsupportedSearchTypeException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "지원하지 않는 검색 유형입니다. 지식에 저장되지 않은 vector field로는 검색할 수 없습니다."
+
+
+class InvalidIndexConfigurationException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "유효하지 않은 index 설정입니다. binary 저장 모드는 BIN_FLAT, BIN_IVF_FLAT index만 사용할 수 있습니다."
+
+
+class InvalidReplicaConfigurationException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "replica 수를 적용할 수 없습니다. replica 수는 Milvus query node 수보다 많을 수 없습니다."
+
+
+class CollectionWarmingException(BaseCustomException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "지식 컬렉션을 메모리에 올리는 중입니다. 잠시 후 다시 시도하세요."
+
+    def __init__(self, retry_after: int = 5):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class InvalidVectorStorageException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = """유효하지 않은 vector 저장 설정입니다. :
+    truncated 모드는 임베딩 모델 차원 이하의 truncated_dimension이 필요하며, binary 모드는 8의 배수 차원만 지원합니다.
+    """
+
+
+class UnsupportedCollectionLayoutException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = """지원하지 않는 컬렉션 구성입니다. :
+    shared 구성은 milvus engine에서만 사용할 수 있으며, index를 다시 만들거나 지식별 shard·replica 수를 지정할 수 없습니다.
+    """
+
+
+class UnsupportedEmbeddingOutputException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = """임베딩 모델이 지원하지 않는 출력입니다. :
+    sentence-transformers 모델은 dense vector만, onnx backend는 dense·sparse vector만 만들 수 있습니다.
+    """
+
+
+class UnsupportedSearchFilterException(BaseCustomException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "검색 filter를 사용할 수 없는 지식입니다. metadata field가 있는 milvus 컬렉션에서만 filter를 사용할 수 있습니다."
+
+
+class MissingRescoreVectorsException(BaseCustomException):
+    status_code = status.HTTP_409_CONFLICT
+    detail = """rescoring에 사용할 full-precision vector가 저장되지 않은 chunk가 있습니다. :
+    tools/backfill_rescore_vectors.py로 vector를 채우거나, 텍스트를 저장하는 기존 컬렉션은 shared 컬렉션으로 옮긴 뒤 검색하세요.
+    """
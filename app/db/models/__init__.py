@@ -2,6 +2,7 @@ from .base import Base
 from .knowledge import (
     FileType,
     Knowledge,
+    KnowledgeChunk,
     KnowledgeFile,
     Language,
     Permission,
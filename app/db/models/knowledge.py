@@ -4,7 +4,7 @@ from db.models.base import (
     TimestampMixin,
     TimestampUpdateMixin,
 )
-from sqlalchemy import BigInteger, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, BigInteger, Boolean, Float, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -25,6 +25,40 @@ class Knowledge(BaseModel, TimestampMixin):
     score: Mapped[float] = mapped_column(Float)
     chunk_length: Mapped[int] = mapped_column(Integer)
     overlap: Mapped[int] = mapped_column(Integer)
+    # 검색에 사용하지 않는 vector field는 저장하지 않도록 선택
+    use_dense_vector: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    use_sparse_vector: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # sparse vector pruning (None이면 pruning하지 않음)
+    sparse_ingest_top_n: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    sparse_ingest_min_weight: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sparse_query_top_n: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    sparse_query_min_weight: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # dense vector 저장 모드(float32 | float16 | binary | truncated)와 압축 모드의 rescoring 후보 배수
+    vector_storage_mode: Mapped[str] = mapped_column(String(20), nullable=False, default="float32")
+    truncated_dimension: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rescore_multiplier: Mapped[int] = mapped_column(Integer, nullable=False, default=4)
+    # 검색 engine(milvus | local). local은 프로세스 안에서 memory-map 파일로 검색하는 소규모 지식용 engine
+    vector_engine: Mapped[str] = mapped_column(String(20), nullable=False, default="milvus")
+    # Milvus 컬렉션 구성(dedicated | shared). shared는 지식 id를 partition key로 쓰는 공유 컬렉션에 저장
+    collection_layout: Mapped[str] = mapped_column(String(20), nullable=False, default="dedicated")
+    shared_collection: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Milvus 컬렉션의 shard 수(생성 시 고정)와 load할 replica 수(query node에 나누어 검색 처리량을 늘림)
+    shards_num: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    replica_number: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # partition routing: 검색할 파일(파티션) 수(None이면 전체 검색)와 routing 신뢰도가 이보다 낮으면 전체 검색
+    partition_routing_top_n: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    partition_routing_min_confidence: Mapped[float] = mapped_column(Float, nullable=False, default=0.5)
+    # dense vector index 유형·build params(None이면 저장 모드의 기본값)와 search params(ef, nprobe, search_list 등)
+    index_type: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    index_params: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    search_params: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # hybrid 검색 fusion 방식(weighted | rrf | normalized)과 weighted·normalized 가중치, rrf smoothing 상수
+    fusion_method: Mapped[str] = mapped_column(String(20), nullable=False, default="weighted")
+    # fusion 위치(server: Milvus ranker | client: dense/sparse 검색을 동시에 실행하고 프로세스에서 합침)
+    fusion_mode: Mapped[str] = mapped_column(String(20), nullable=False, default="server")
+    dense_weight: Mapped[float] = mapped_column(Float, nullable=False, default=0.6)
+    sparse_weight: Mapped[float] = mapped_column(Float, nullable=False, default=0.4)
+    rrf_k: Mapped[int] = mapped_column(Integer, nullable=False, default=60)
 
     permission: Mapped["Permission"] = relationship("Permission")
     language: Mapped["Language"] = relationship("Language")
@@ -33,6 +67,21 @@ class Knowledge(BaseModel, TimestampMixin):
     chunk_type: Mapped["ChunkType"] = relationship("ChunkType")
     dataset: Mapped[list["KnowledgeFile"] | None] = relationship("KnowledgeFile", back_populates="knowledge")
 
+    @property
+    def vector_fields(self) -> tuple[str, ...]:
+        """Milvus collection에 저장하는 vector field 이름 목록"""
+        fields = []
+        if self.use_dense_vector:
+            fields.append("dense_vector")
+        if self.use_sparse_vector:
+            fields.append("sparse_vector")
+        return tuple(fields)
+
+    @property
+    def collection_name(self) -> str:
+        """지식의 vector를 저장하는 컬렉션 이름 (shared 구성이면 공유 컬렉션)"""
+        return self.shared_collection or self.name
+
 
 class KnowledgeFile(BaseModel, TimestampCreateMixin, TimestampUpdateMixin):
     __tablename__ = "knowledge_file"
@@ -43,10 +92,44 @@ class KnowledgeFile(BaseModel, TimestampCreateMixin, TimestampUpdateMixin):
     knowledge_id: Mapped[int] = mapped_column(ForeignKey("knowledge.id", ondelete="CASCADE"))
     file_type: Mapped[str] = mapped_column(String(10), nullable=False)
     chunk_number: Mapped[int] = mapped_column(Integer)
+    # Milvus bulk import 진행 상태 (insert로 적재한 파일은 None)
+    import_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    import_progress: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    imported_rows: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    import_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # partition routing에 사용하는 파일 chunk dense vector의 정규화된 평균 (float32 byte)
+    centroid: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
     knowledge: Mapped["Model"] = relationship("Knowledge", back_populates="dataset", passive_deletes=True)
 
 
+class KnowledgeChunk(BaseModel, TimestampCreateMixin):
+    """chunk 텍스트 저장소. Milvus에는 vector와 chunk id(primary key)만 저장하고 텍스트는 검색 후 id로 조회합니다."""
+
+    __tablename__ = "knowledge_chunk"
+    # 같은 지식 안에서 내용이 같은 chunk 조회 (중복 제거, 재색인)
+    __table_args__ = (Index("ix_knowledge_chunk_knowledge_id_content_hash", "knowledge_id", "content_hash"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    knowledge_id: Mapped[int] = mapped_column(ForeignKey("knowledge.id", ondelete="CASCADE"), nullable=False)
+    # dedicated 컬렉션의 _default 파티션에서 옮겨온 chunk는 파일이 없음
+    knowledge_file_id: Mapped[int | None] = mapped_column(
+        ForeignKey("knowledge_file.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    page: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # 원문에서의 문자 위치 (loader가 start_index를 제공한 경우)
+    start_offset: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    end_offset: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    # 텍스트의 sha256 hex digest
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 지식의 임베딩 모델 tokenizer 기준 token 수 (special token 제외)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 압축 저장 모드(float16, binary, truncated) 지식의 rescoring에 사용하는 full-precision dense vector (float32 byte)
+    dense_vector: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+
 class FileType(BaseModel):
     __tablename__ = "file_type"
 
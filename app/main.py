@@ -1,7 +1,17 @@
+from contextlib import asynccontextmanager
+
+from config.db.session import SessionLocal
 # from core.middlewares import log_and_handle_exceptions
+from config.settings import get_settings
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import api_router
+from services.knowledge_service import KnowledgeService
+from services.solution_service import SolutionService
+from util.collection_residency import get_collection_residency
+from util.embedding import get_embedding_model_holder
+from util.embedding_pool import shutdown_embedding_pool
+from util.vector_database import get_vector_store
 
 SWAGGER_TITLE = "AI-PaaS RAG Workflow"
 SWAGGER_SUMMARY = "RAG Workflow Backend Server"
@@ -19,7 +29,30 @@ SWAGGER_DESCRIPTION = """
 """
 
 
-app = FastAPI(title=SWAGGER_TITLE, summary=SWAGGER_SUMMARY, description=SWAGGER_DESCRIPTION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 임베딩 모델은 백그라운드에서 로드하고, 준비 여부는 /health/ready로 확인
+    if get_settings().EMBEDDING_WARMUP_ON_STARTUP:
+        get_embedding_model_holder().warmup_in_background()
+    # solution이 사용하는 지식 컬렉션을 먼저 load하고, 이후 검색 사용량에 따라 load/release
+    residency = get_collection_residency()
+    if residency.enabled:
+        db = SessionLocal()
+        try:
+            residency.start(
+                managed=KnowledgeService.get_collection_names(db),
+                preload=SolutionService.get_knowledge_collection_names(db),
+                replica_numbers=KnowledgeService.get_replica_numbers(db),
+            )
+        finally:
+            db.close()
+    yield
+    residency.stop()
+    shutdown_embedding_pool()
+    get_vector_store().close()
+
+
+app = FastAPI(title=SWAGGER_TITLE, summary=SWAGGER_SUMMARY, description=SWAGGER_DESCRIPTION, lifespan=lifespan)
 # app.middleware("http")(log_and_handle_exceptions)
 
 # CORS 설정
@@ -1,6 +1,7 @@
-from db.models import Knowledge, KnowledgeFile
+from db.models import Knowledge, KnowledgeChunk, KnowledgeFile
 from repos.base import CRUDBase
-from schemas.knowledge import KnowledgeBaseSchema, KnowledgeFileBaseSchema
+from schemas.knowledge import KnowledgeBaseSchema, KnowledgeChunkBaseSchema, KnowledgeFileBaseSchema
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
 
@@ -9,8 +10,114 @@ class KnowledgeRepository(CRUDBase[Knowledge, KnowledgeBaseSchema, KnowledgeBase
 
 
 class KnowledgeFileRepository(CRUDBase[KnowledgeFile, KnowledgeFileBaseSchema, KnowledgeFileBaseSchema]):
-    ...
+    @staticmethod
+    def update_import_state(
+        db: Session,
+        *,
+        db_obj: KnowledgeFile,
+        status: str,
+        progress: int | None = None,
+        rows: int | None = None,
+        error: str | None = None,
+    ) -> KnowledgeFile:
+        """
+        bulk import 진행 상태를 갱신하고 바로 commit하여 다른 요청에서 조회할 수 있도록 합니다.
+        """
+        db_obj.import_status = status
+        if progress is not None:
+            db_obj.import_progress = progress
+        if rows is not None:
+            db_obj.imported_rows = rows
+        db_obj.import_error = error[:500] if error else None
+        db.commit()
+        return db_obj
+
+    @staticmethod
+    def _searchable(knowledge_id: int):
+        # bulk import가 끝나지 않은 파일은 검색 대상이 아님 (insert로 적재한 파일은 import_status가 None)
+        return (
+            KnowledgeFile.knowledge_id == knowledge_id,
+            or_(KnowledgeFile.import_status.is_(None), KnowledgeFile.import_status == "completed"),
+        )
+
+    def get_routing_version(self, db: Session, knowledge_id: int) -> tuple[int, int, int]:
+        """
+        검색 가능한 파일 수, 그중 centroid가 있는 파일 수, 마지막 파일 id를 한 번의 집계로 조회합니다.
+        파일이 적재되면 값이 바뀌므로 routing 캐시의 version으로 사용합니다.
+        """
+        row = db.execute(
+            select(func.count(self.model.id), func.count(self.model.centroid), func.max(self.model.id)).where(
+                *self._searchable(knowledge_id)
+            )
+        ).one()
+        return row[0], row[1], row[2] or 0
+
+    def get_centroids(self, db: Session, knowledge_id: int) -> list[tuple[int, bytes]]:
+        """
+        검색 가능한 파일의 (파일 id, centroid) 목록을 조회합니다.
+        """
+        rows = db.execute(
+            select(self.model.id, self.model.centroid).where(
+                *self._searchable(knowledge_id), self.model.centroid.is_not(None)
+            )
+        )
+        return [(file_id, centroid) for file_id, centroid in rows]
+
+
+class KnowledgeChunkRepository(CRUDBase[KnowledgeChunk, KnowledgeChunkBaseSchema, KnowledgeChunkBaseSchema]):
+    def create_many(self, db: Session, *, objs_in: list[KnowledgeChunkBaseSchema]) -> list[int]:
+        """
+        chunk를 한 번에 추가하고 발급된 id를 입력 순서대로 반환합니다.
+        """
+        db_objs = [self.model(**obj_in.model_dump()) for obj_in in objs_in]
+        db.add_all(db_objs)
+        db.flush()
+        return [db_obj.id for db_obj in db_objs]
+
+    def get_texts(self, db: Session, ids: list[int]) -> dict[int, str]:
+        """
+        chunk id 목록의 텍스트를 한 번의 조회로 가져옵니다.
+        """
+        if not ids:
+            return {}
+        rows = db.execute(select(self.model.id, self.model.text).where(self.model.id.in_(ids)))
+        return {chunk_id: text for chunk_id, text in rows}
+
+    def set_dense_vectors(self, db: Session, vectors: dict[int, bytes]):
+        """
+        chunk id별 full-precision dense vector를 한 번에 저장합니다.
+        """
+        if vectors:
+            db.execute(
+                update(self.model), [{"id": chunk_id, "dense_vector": vector} for chunk_id, vector in vectors.items()]
+            )
+
+    def get_dense_vectors(self, db: Session, ids: list[int]) -> dict[int, bytes]:
+        """
+        chunk id 목록의 full-precision dense vector를 한 번의 조회로 가져옵니다. vector가 없는 chunk는 포함하지 않습니다.
+        """
+        if not ids:
+            return {}
+        rows = db.execute(
+            select(self.model.id, self.model.dense_vector).where(
+                self.model.id.in_(ids), self.model.dense_vector.is_not(None)
+            )
+        )
+        return {chunk_id: vector for chunk_id, vector in rows}
+
+    def get_without_dense_vector(self, db: Session, knowledge_id: int, limit: int) -> list[tuple[int, str]]:
+        """
+        지식에서 full-precision dense vector가 없는 chunk의 (id, 텍스트)를 id 순서로 최대 limit개 조회합니다.
+        """
+        rows = db.execute(
+            select(self.model.id, self.model.text)
+            .where(self.model.knowledge_id == knowledge_id, self.model.dense_vector.is_(None))
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        return [(chunk_id, text) for chunk_id, text in rows]
 
 
 knowledge_repository = KnowledgeRepository(Knowledge)
 knowledge_file_repository = KnowledgeFileRepository(KnowledgeFile)
+knowledge_chunk_repository = KnowledgeChunkRepository(KnowledgeChunk)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from .embedding import embedding_router
 from .evaluation import evaluation_router as evluation_router
+from .health import health_router
 from .knowledge import knowledge_router
 from .model import model_router
 from .prompt import prompt_router
@@ -11,5 +13,7 @@ api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(model_router)
 api_router.include_router(knowledge_router)
 api_router.include_router(evluation_router)
+api_router.include_router(embedding_router)
+api_router.include_router(health_router)
 api_router.include_router(prompt_router)
 api_router.include_router(solution_router)
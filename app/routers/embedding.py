@@ -0,0 +1,23 @@
+from config.db.connect import SessionDepends
+from fastapi import APIRouter
+from schemas.embedding import EmbeddingRequestSchema, EmbeddingResponseSchema
+from services.embedding_service import EmbeddingService
+from sqlalchemy.orm import Session
+
+embedding_router = APIRouter(prefix="/embeddings", tags=["Embeddings"])
+
+
+@embedding_router.post("", response_model=EmbeddingResponseSchema)
+def embed(request: EmbeddingRequestSchema, db: Session = SessionDepends):
+    """
+    텍스트 목록을 dense/sparse 벡터로 임베딩합니다.
+
+    동시에 들어온 요청은 embedding scheduler에서 하나의 batch로 묶여 인코딩됩니다.
+
+    Args:
+        request (EmbeddingRequestSchema): 임베딩할 텍스트 목록과 사용할 임베딩 모델 id.
+
+    Returns:
+        EmbeddingResponseSchema: 입력 순서와 동일한 순서의 dense/sparse 벡터 목록.
+    """
+    return EmbeddingService.embed(request, db)
@@ -5,7 +5,12 @@ from urllib.parse import quote
 from config.db.connect import SessionDepends
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
-from schemas.evaluation import RetrievalRequestSchema, RetrievalResponseSchema
+from schemas.evaluation import (
+    HybridTuningRequestSchema,
+    HybridTuningResponseSchema,
+    RetrievalRequestSchema,
+    RetrievalResponseSchema,
+)
 from services.evaluation_service import EvaluationService
 from sqlalchemy.orm import Session
 
@@ -15,3 +20,24 @@ evaluation_router = APIRouter(prefix="/evaluations", tags=["Evaluations"])
 @evaluation_router.post("/retrieval", response_model=list[RetrievalResponseSchema])
 def retrieve(request: RetrievalRequestSchema, db: Session = SessionDepends):
     return EvaluationService().retrieve(request, db)
+
+
+@evaluation_router.post("/hybrid-tuning", response_model=HybridTuningResponseSchema)
+def tune_hybrid_weights(request: HybridTuningRequestSchema, db: Session = SessionDepends):
+    """
+    정답이 표시된 query 집합으로 hybrid 검색의 fusion 방식과 가중치를 튜닝하는 함수.
+
+    query마다 dense/sparse 검색을 한 번만 하고, 캐시한 후보 점수로 weighted 가중치와 RRF k 값을 모두 평가합니다.
+    `apply`가 true이면 가장 좋은 설정을 지식에 저장하여 이후 검색에 사용합니다. score threshold가 있는 지식은
+    점수 범위가 달라지지 않도록 현재 fusion 방식 안에서 가장 좋은 설정만 저장합니다.
+
+    Args:
+        request (HybridTuningRequestSchema): 지식 ID, 정답이 표시된 query 목록, 평가 설정.
+        db (Session): 데이터베이스 세션. 기본적으로 SessionDepends로 주입됨.
+
+    Returns:
+        HybridTuningResponseSchema: 가장 좋은 설정과 상위 설정 목록.
+    """
+    result = EvaluationService.tune_hybrid_weights(request, db)
+    db.commit()
+    return result
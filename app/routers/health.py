@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from util.collection_residency import get_collection_residency
+from util.embedding import get_embedding_model_holder
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@health_router.get("/live")
+def live():
+    """
+    프로세스가 요청을 받을 수 있는지 확인하는 liveness probe.
+
+    Returns:
+        dict: 항상 {"status": "ok"}.
+    """
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+def ready():
+    """
+    임베딩 모델이 로드되어 요청을 처리할 준비가 되었는지 확인하는 readiness probe.
+
+    Returns:
+        JSONResponse: 모델이 준비되었으면 200, 로드 중이거나 실패했으면 503과 모델 상태를 반환.
+    """
+    holder = get_embedding_model_holder()
+    content = {
+        "status": holder.state.value,
+        "embedding_model": holder.model_id,
+        "error": holder.error,
+    }
+    return JSONResponse(status_code=200 if holder.is_ready else 503, content=content)
+
+
+@health_router.get("/collections")
+def collections():
+    """
+    Milvus 지식 컬렉션별 load 상태(memory | mmap | released), 최근 사용량, 메모리 사용량(추정)을 확인합니다.
+
+    Returns:
+        dict: residency 관리 사용 여부와 컬렉션별 상태 목록.
+    """
+    residency = get_collection_residency()
+    return {"enabled": residency.enabled, "collections": residency.snapshot()}
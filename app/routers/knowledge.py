@@ -3,13 +3,15 @@ from typing import Annotated
 from urllib.parse import quote
 
 from config.db.connect import SessionDepends
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from schemas.knowledge import (
     KnowledgeBaseSchema,
     KnowledgeFileBaseSchema,
     KnowledgeFileReadSchema,
+    KnowledgeIndexUpdateSchema,
     KnowledgeReadSchema,
+    KnowledgeReplicaUpdateSchema,
 )
 from services.knowledge_service import KnowledgeDatasetService, KnowledgeService
 from sqlalchemy.orm import Session
@@ -65,6 +67,52 @@ def update_knowledge(knowledge_id: int, knowledge_base: KnowledgeBaseSchema, db:
         raise ("Error has been Occured!")
 
 
+@knowledge_router.put("/{knowledge_id}/index", response_model=KnowledgeReadSchema)
+def update_knowledge_index(
+    knowledge_id: int, index_update: KnowledgeIndexUpdateSchema, db: Session = SessionDepends
+):
+    """
+    지식의 dense vector index 유형, build params, search params를 변경하는 함수.
+
+    index 유형이나 build params가 바뀌면 shadow 컬렉션에 새 index를 만들어 데이터를 복사한 뒤 교체하므로,
+    rebuild 중에도 기존 index로 검색할 수 있습니다. search params(ef, nprobe, search_list)만 바꾸면 rebuild하지 않습니다.
+
+    Args:
+        knowledge_id (int): 변경할 지식 정보의 ID.
+        index_update (KnowledgeIndexUpdateSchema): 새 index 설정.
+        db (Session): 데이터베이스 세션. 기본적으로 SessionDepends로 주입됨.
+
+    Returns:
+        KnowledgeReadSchema: 변경된 지식 정보의 스키마를 반환.
+    """
+    result = KnowledgeService().update_index(db, knowledge_id, index_update)
+    db.commit()
+    return result
+
+
+@knowledge_router.put("/{knowledge_id}/replicas", response_model=KnowledgeReadSchema)
+def update_knowledge_replicas(
+    knowledge_id: int, replica_update: KnowledgeReplicaUpdateSchema, db: Session = SessionDepends
+):
+    """
+    지식 컬렉션을 load할 replica 수를 변경하는 함수.
+
+    replica는 서로 다른 query node에 load되어 검색 요청을 나누어 처리하므로, 검색이 많은 지식의 처리량을 늘릴 수 있습니다.
+    load된 컬렉션은 새 replica 수로 다시 load하므로 그동안 잠시 검색할 수 없습니다.
+
+    Args:
+        knowledge_id (int): 변경할 지식 정보의 ID.
+        replica_update (KnowledgeReplicaUpdateSchema): 새 replica 수.
+        db (Session): 데이터베이스 세션. 기본적으로 SessionDepends로 주입됨.
+
+    Returns:
+        KnowledgeReadSchema: 변경된 지식 정보의 스키마를 반환.
+    """
+    result = KnowledgeService().update_replicas(db, knowledge_id, replica_update)
+    db.commit()
+    return result
+
+
 @knowledge_router.get("", response_model=list[KnowledgeReadSchema])
 def get_multi_knowledge(db: Session = SessionDepends):
     """
@@ -113,6 +161,32 @@ def create_knowledge_dataset(knowledge_id: int, file: Annotated[UploadFile, File
     return KnowledgeDatasetService().create_dataset(knowledge_id, file, db)
 
 
+@knowledge_router.post("/{knowledge_id}/datasets/bulk-import", response_model=KnowledgeFileReadSchema)
+def create_knowledge_dataset_bulk_import(
+    knowledge_id: int,
+    file: Annotated[UploadFile, File()],
+    background_tasks: BackgroundTasks,
+    *,
+    db: Session = SessionDepends,
+):
+    """
+    대용량 파일을 Milvus bulk import로 적재합니다.
+
+    임베딩한 chunk를 Parquet/NumPy 파일로 object storage에 올린 뒤 Milvus bulk import 작업을 실행합니다.
+    작업은 background에서 진행되며, 진행 상태는 데이터셋 조회 API의 import_status/import_progress로 확인합니다.
+
+    Args:
+        knowledge_id (int): 데이터셋이 연결될 지식 항목의 ID.
+        file (UploadFile): 업로드할 파일 (`multipart/form-data` 형식).
+        background_tasks (BackgroundTasks): bulk import를 실행할 background 작업.
+        db (Session): 데이터베이스 세션으로, 데이터베이스 작업에 사용됩니다.
+
+    Returns:
+        KnowledgeFileReadSchema: import_status가 pending인 지식 데이터셋 메타데이터를 반환합니다.
+    """
+    return KnowledgeDatasetService().create_dataset_bulk_import(knowledge_id, file, db, background_tasks)
+
+
 @knowledge_router.get("/{knowledge_id}/datasets/download")
 async def download_dataset(knowledge_id: int, path: str, db: Session = SessionDepends):
     """
@@ -138,3 +212,19 @@ async def download_dataset(knowledge_id: int, path: str, db: Session = SessionDe
         "Content-Disposition": f"attachment; filename*=UTF-8''{file_name}",
     }
     return StreamingResponse(file_stream, media_type="application/octet-stream", headers=headers)
+
+
+@knowledge_router.get("/{knowledge_id}/datasets/{dataset_id}", response_model=KnowledgeFileReadSchema)
+def get_knowledge_dataset(knowledge_id: int, dataset_id: int, *, db: Session = SessionDepends):
+    """
+    지식 데이터셋 메타데이터와 bulk import 진행 상태를 조회합니다.
+
+    Args:
+        knowledge_id (int): 데이터셋이 연결된 지식 항목의 ID.
+        dataset_id (int): 조회할 데이터셋(KnowledgeFile)의 ID.
+        db (Session): 데이터베이스 세션으로, 데이터베이스 작업에 사용됩니다.
+
+    Returns:
+        KnowledgeFileReadSchema: 데이터셋 메타데이터를 반환합니다.
+    """
+    return KnowledgeDatasetService().get_dataset(db, knowledge_id, dataset_id)
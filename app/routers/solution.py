@@ -75,8 +75,6 @@ def generate_text(
             search_type_id=solution_knowledge.search_type.id,
             top_k=solution_knowledge.top_k,
             threshold_score=solution_knowledge.score,
-            dense_weight=0.6,
-            sparse_weight=0.4,
         ),
         db,
     )
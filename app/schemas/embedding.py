@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class EmbeddingRequestSchema(BaseModel):
+    texts: list[str] = Field(min_length=1)
+    # model registry에 등록된 임베딩 모델 id (None이면 기본 BGE-M3 모델)
+    model_id: int | None = None
+    return_dense: bool = True
+    return_sparse: bool = True
+    return_colbert_vecs: bool = False
+
+
+class EmbeddingSchema(BaseModel):
+    dense_vector: list[float] | None = None
+    sparse_vector: dict[str, float] | None = None
+    colbert_vector: list[list[float]] | None = None
+
+
+class EmbeddingResponseSchema(BaseModel):
+    data: list[EmbeddingSchema]
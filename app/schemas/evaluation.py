@@ -1,21 +1,75 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+class RetrievalFilterSchema(BaseModel):
+    """chunk metadata 검색 조건. 지정한 조건은 모두 만족해야 하며(and), 범위는 양 끝을 포함합니다."""
+
+    knowledge_file_ids: list[int] | None = None
+    file_types: list[str] | None = None
+    page_from: int | None = Field(default=None, ge=0)
+    page_to: int | None = Field(default=None, ge=0)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
 class RetrievalRequestSchema(BaseModel):
     query: str
     knowledge_id: int
     search_type_id: int
     top_k: int
+    # 이 점수보다 큰 결과만 반환 (-inf이면 거르지 않음)
     threshold_score: float
-    dense_weight: float
-    sparse_weight: float
+    # 지정하면 threshold를 넘는 결과를 top_k 대신 최대 max_top_k개까지 반환 (결과 수가 threshold에 맞게 달라짐)
+    max_top_k: int | None = Field(default=None, gt=0)
+    # None이면 지식에 저장된 hybrid 가중치
+    dense_weight: float | None = None
+    sparse_weight: float | None = None
+    # ANN 검색 안에서 적용하는 metadata filter
+    filter: RetrievalFilterSchema | None = None
 
 
 class RetrievalResponseSchema(BaseModel):
+    id: int
     distance: float
     text: str
+
+
+class LabelledQuerySchema(BaseModel):
+    query: str
+    relevant_ids: list[int]
+
+
+class HybridTuningRequestSchema(BaseModel):
+    knowledge_id: int
+    queries: list[LabelledQuerySchema] = Field(min_length=1)
+    top_k: int = Field(default=10, gt=0)
+    # query별로 dense/sparse 검색에서 가져와 점수를 캐시할 후보 수
+    candidate_limit: int = Field(default=100, gt=0, le=16384)
+    metric: Literal["mrr", "recall"] = "mrr"
+    weight_step: float = Field(default=0.01, gt=0, le=0.5)
+    rrf_k_values: list[int] = [1, 5, 10, 20, 30, 40, 60, 80, 100, 150, 200]
+    # 가장 좋은 설정을 지식에 저장할지 여부. 지식에 score threshold가 있으면 현재 fusion 방식 안의 설정만 저장
+    apply: bool = False
+
+
+class HybridFusionResultSchema(BaseModel):
+    fusion_method: str
+    dense_weight: float | None
+    sparse_weight: float | None
+    rrf_k: int | None
+    recall: float
+    mrr: float
+
+
+class HybridTuningResponseSchema(BaseModel):
+    best: HybridFusionResultSchema
+    # metric 기준 상위 설정
+    results: list[HybridFusionResultSchema]
+    applied: bool
+    # 지식에 저장한 설정. score threshold가 있는 지식은 best와 fusion 방식이 다르면 현재 방식 안의 가장 좋은 설정
+    applied_result: HybridFusionResultSchema | None = None
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 from schemas.model import ModelReadSchema
 
 
+IndexType = Literal["AUTOINDEX", "FLAT", "HNSW", "IVF_FLAT", "IVF_PQ", "DISKANN", "SCANN", "BIN_FLAT", "BIN_IVF_FLAT"]
+
+
 class KnowledgeBaseSchema(BaseModel):
     name: str
     display_name: str
@@ -20,6 +23,39 @@ class KnowledgeBaseSchema(BaseModel):
     score: float
     chunk_length: int
     overlap: int
+    use_dense_vector: bool = True
+    use_sparse_vector: bool = True
+    sparse_ingest_top_n: int | None = Field(default=None, gt=0)
+    sparse_ingest_min_weight: float | None = Field(default=None, ge=0)
+    sparse_query_top_n: int | None = Field(default=None, gt=0)
+    sparse_query_min_weight: float | None = Field(default=None, ge=0)
+    vector_storage_mode: Literal["float32", "float16", "binary", "truncated"] = "float32"
+    truncated_dimension: int | None = Field(default=None, gt=0)
+    rescore_multiplier: int = Field(default=4, ge=1)
+    vector_engine: Literal["milvus", "local"] = "milvus"
+    collection_layout: Literal["dedicated", "shared"] = "dedicated"
+    shards_num: int = Field(default=1, ge=1, le=16)
+    replica_number: int = Field(default=1, ge=1)
+    partition_routing_top_n: int | None = Field(default=None, gt=0)
+    partition_routing_min_confidence: float = Field(default=0.5, ge=0, le=1)
+    index_type: IndexType | None = None
+    index_params: dict[str, Any] | None = None
+    search_params: dict[str, Any] | None = None
+    fusion_method: Literal["weighted", "rrf", "normalized"] = "weighted"
+    fusion_mode: Literal["server", "client"] = "server"
+    dense_weight: float = Field(default=0.6, ge=0)
+    sparse_weight: float = Field(default=0.4, ge=0)
+    rrf_k: int = Field(default=60, gt=0)
+
+
+class KnowledgeIndexUpdateSchema(BaseModel):
+    index_type: IndexType | None = None
+    index_params: dict[str, Any] | None = None
+    search_params: dict[str, Any] | None = None
+
+
+class KnowledgeReplicaUpdateSchema(BaseModel):
+    replica_number: int = Field(ge=1)
 
 
 class KnowledgeReadSchema(BaseModel):
@@ -36,6 +72,30 @@ class KnowledgeReadSchema(BaseModel):
     score: float
     chunk_length: int
     overlap: int
+    use_dense_vector: bool
+    use_sparse_vector: bool
+    sparse_ingest_top_n: int | None
+    sparse_ingest_min_weight: float | None
+    sparse_query_top_n: int | None
+    sparse_query_min_weight: float | None
+    vector_storage_mode: str
+    truncated_dimension: int | None
+    rescore_multiplier: int
+    vector_engine: str
+    collection_layout: str
+    shared_collection: str | None
+    shards_num: int
+    replica_number: int
+    partition_routing_top_n: int | None
+    partition_routing_min_confidence: float
+    index_type: str | None
+    index_params: dict[str, Any] | None
+    search_params: dict[str, Any] | None
+    fusion_method: str
+    fusion_mode: str
+    dense_weight: float
+    sparse_weight: float
+    rrf_k: int
     chunk_type: ChunkTypeReadSchema
     dataset: list[KnowledgeFileReadSchema] | None
 
@@ -76,6 +136,19 @@ class KnowledgeFileBaseSchema(BaseModel):
     knowledge_id: int
     file_type: str
     chunk_number: int
+    import_status: str | None = None
+
+
+class KnowledgeChunkBaseSchema(BaseModel):
+    knowledge_id: int
+    knowledge_file_id: int | None = None
+    chunk_index: int
+    page: int | None = None
+    start_offset: int | None = None
+    end_offset: int | None = None
+    text: str
+    content_hash: str
+    token_count: int
 
 
 class KnowledgeFileReadSchema(BaseModel):
@@ -85,6 +158,10 @@ class KnowledgeFileReadSchema(BaseModel):
     knowledge_id: int
     file_type: str
     chunk_number: int
+    import_status: str | None = None
+    import_progress: int | None = None
+    imported_rows: int | None = None
+    import_error: str | None = None
     created_by: str
     created_at: datetime | None
     updated_by: str
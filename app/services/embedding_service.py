@@ -0,0 +1,48 @@
+from core.exceptions import ItemNotFoundException, UnsupportedEmbeddingOutputException
+from repos.model import model_repository
+from schemas.embedding import (
+    EmbeddingRequestSchema,
+    EmbeddingResponseSchema,
+    EmbeddingSchema,
+)
+from sqlalchemy.orm import Session
+from util.embedder_pool import get_embedder_pool
+from util.embedding_scheduler import get_embedding_batcher
+
+
+class EmbeddingService:
+    @staticmethod
+    def embed(request: EmbeddingRequestSchema, db: Session) -> EmbeddingResponseSchema:
+        model = None
+        if request.model_id is not None:
+            model = model_repository.get(db, request.model_id)
+            if model is None:
+                raise ItemNotFoundException()
+        with get_embedder_pool().use(model) as embedder:
+            # 모델이 만들 수 없는 출력은 인코딩 전에 거절
+            if (request.return_sparse and not embedder.supports_sparse) or (
+                request.return_colbert_vecs and not embedder.supports_colbert
+            ):
+                raise UnsupportedEmbeddingOutputException()
+            embeddings = get_embedding_batcher().embed(
+                request.texts,
+                return_dense=request.return_dense,
+                return_sparse=request.return_sparse,
+                return_colbert_vecs=request.return_colbert_vecs,
+                embedder=embedder,
+            )
+        size = len(request.texts)
+        dense_vectors = embeddings.dense_vector if request.return_dense else [None] * size
+        sparse_vectors = embeddings.sparse_vector if request.return_sparse else [None] * size
+        colbert_vectors = embeddings.colbert_vector if request.return_colbert_vecs else [None] * size
+        data = [
+            EmbeddingSchema(
+                dense_vector=dense.tolist() if dense is not None else None,
+                sparse_vector=(
+                    {str(token): float(weight) for token, weight in sparse.items()} if sparse is not None else None
+                ),
+                colbert_vector=colbert.tolist() if colbert is not None else None,
+            )
+            for dense, sparse, colbert in zip(dense_vectors, sparse_vectors, colbert_vectors)
+        ]
+        return EmbeddingResponseSchema(data=data)
@@ -1,41 +1,282 @@
-from repos.knowledge import knowledge_repository
-from schemas.evaluation import RetrievalRequestSchema, RetrievalResponseSchema
+import itertools
+import math
+
+import numpy as np
+from core.exceptions import (
+    CollectionWarmingException,
+    ItemNotFoundException,
+    MissingRescoreVectorsException,
+    UnsupportedSearchFilterException,
+    UnsupportedSearchTypeException,
+)
+from db.models.knowledge import Knowledge
+from repos.knowledge import knowledge_chunk_repository, knowledge_file_repository, knowledge_repository
+from schemas.evaluation import (
+    HybridTuningRequestSchema,
+    RetrievalRequestSchema,
+    RetrievalResponseSchema,
+)
+from services.knowledge_service import KnowledgeDatasetService
 from sqlalchemy.orm import Session
 from util.chunk import file_load_and_split, get_file_extension
-from util.embedding import BGEM3Embedding
-from util.vector_database import MilvusSearchManager
+from util.collection_residency import CollectionWarmingError, get_collection_residency
+from util.embedder_pool import get_embedder_pool
+from util.embedding_scheduler import get_embedding_batcher
+from util.fusion import CandidateScores, FusionMethod, ranking_metrics
+from util.local_vector_engine import LocalSearchManager
+from util.partition_routing import get_partition_router
+from util.sparse import prune_sparse_vectors
+from util.vector_database import (
+    DENSE_VECTOR_FIELD,
+    METADATA_DEFAULTS,
+    SEARCH_TYPE_VECTOR_FIELDS,
+    SPARSE_VECTOR_FIELD,
+    TEXT_FIELD,
+    MilvusSearchManager,
+    MissingRescoreVectorsError,
+    SearchHit,
+    combine_filters,
+    get_search_executor,
+    get_vector_store,
+    knowledge_filter,
+    metadata_filter,
+)
+from util.vector_engine import CollectionLayout, VectorEngine, get_search_manager_class
 
 
 class EvaluationService:
+    @staticmethod
+    def _search_manager(
+        knowledge_model: Knowledge,
+        top_k: int,
+        db: Session,
+        filter_expr: str | None = None,
+        file_ids: list[int] | None = None,
+        min_score: float | None = None,
+    ) -> MilvusSearchManager | LocalSearchManager:
+        partition_names = None
+        if file_ids is not None and knowledge_model.collection_layout == CollectionLayout.DEDICATED:
+            # dedicated 컬렉션은 파일별 파티션에 적재하므로 routing한 파일의 파티션만 검색
+            partition_names = [KnowledgeDatasetService.partition_name(knowledge_model, file_id) for file_id in file_ids]
+        if knowledge_model.vector_engine == VectorEngine.MILVUS:
+            # 사용량을 기록하고, release된 컬렉션이면 load를 시작한 뒤 잠시 기다림
+            try:
+                get_collection_residency().ensure_loaded(
+                    knowledge_model.collection_name, knowledge_model.replica_number
+                )
+            except CollectionWarmingError:
+                raise CollectionWarmingException()
+            # metadata field를 추가하기 전에 만든 컬렉션에는 filter를 적용할 수 없음
+            fields = get_vector_store().field_names(knowledge_model.collection_name)
+            if filter_expr and not set(METADATA_DEFAULTS) <= fields:
+                raise UnsupportedSearchFilterException()
+            if file_ids is not None and partition_names is None and set(METADATA_DEFAULTS) <= fields:
+                # shared 컬렉션의 파티션은 지식 id partition key로 나뉘므로 파일 id filter로 범위를 좁힘
+                filter_expr = combine_filters(filter_expr, metadata_filter(knowledge_file_ids=file_ids))
+        elif filter_expr:
+            raise UnsupportedSearchFilterException()
+        # 압축 저장 모드는 적재할 때 chunk store에 저장한 full-precision vector로 rescoring
+        return get_search_manager_class(knowledge_model.vector_engine)(
+            knowledge_model.collection_name,
+            top_k,
+            storage_mode=knowledge_model.vector_storage_mode,
+            truncated_dimension=knowledge_model.truncated_dimension,
+            rescore_multiplier=knowledge_model.rescore_multiplier,
+            rescore_vectors=lambda ids: knowledge_chunk_repository.get_dense_vectors(db, ids),
+            index_type=knowledge_model.index_type,
+            search_params=knowledge_model.search_params,
+            # shared 컬렉션은 partition key로 지식의 엔티티만 검색
+            filter_expr=combine_filters(
+                knowledge_filter(knowledge_model.id) if knowledge_model.shared_collection else None, filter_expr
+            ),
+            partition_names=partition_names,
+            min_score=min_score,
+        )
+
+    @staticmethod
+    def _route_files(knowledge_model: Knowledge, dense_vector: np.ndarray | None, db: Session) -> list[int] | None:
+        """
+        partition routing을 사용하는 지식이면 query dense vector와 centroid가 가까운 파일 id를 반환합니다.
+        routing하지 않거나 신뢰도가 낮아 전체 검색해야 하면 None을 반환합니다.
+        """
+        if knowledge_model.partition_routing_top_n is None or dense_vector is None:
+            return None
+        num_files, num_centroids, last_file_id = knowledge_file_repository.get_routing_version(db, knowledge_model.id)
+        # centroid가 없는 파일(routing 도입 전에 적재)이 있으면 그 파일을 놓치지 않도록 전체 검색
+        if num_files != num_centroids:
+            return None
+        return get_partition_router().route(
+            knowledge_model.id,
+            (num_files, last_file_id),
+            lambda: knowledge_file_repository.get_centroids(db, knowledge_model.id),
+            dense_vector[0],
+            top_n=knowledge_model.partition_routing_top_n,
+            min_confidence=knowledge_model.partition_routing_min_confidence,
+        )
+
+    @staticmethod
+    def _hydrate(hits: list[SearchHit], db: Session) -> list[dict]:
+        """최종 검색 결과의 텍스트를 chunk store에서 한 번에 조회합니다. 텍스트가 있는 결과는 조회하지 않습니다."""
+        texts = knowledge_chunk_repository.get_texts(db, [hit.id for hit in hits if hit.get(TEXT_FIELD) is None])
+        return [
+            {"id": hit.id, "distance": hit.distance, "text": hit.get(TEXT_FIELD) or texts.get(hit.id, "")}
+            for hit in hits
+        ]
+
     @staticmethod
     def retrieve(request: RetrievalRequestSchema, db: Session):
         knowledge_model = knowledge_repository.get(db, request.knowledge_id)
-        collection_name = knowledge_model.name
         query = request.query
-        top_k = request.top_k
-        threshold_score = request.threshold_score
         search_type_id = request.search_type_id
+        # threshold는 검색 안에서 적용(dense는 range search, sparse는 검색 결과)하므로 top_k는 결과 수의 상한
+        min_score = request.threshold_score if request.threshold_score > -math.inf else None
+        top_k = max(request.top_k, request.max_top_k or 0) if min_score is not None else request.top_k
 
-        embeddings = BGEM3Embedding([query])
-        dense_vector = embeddings.dense_vector
-        sparse_vector = embeddings.sparse_vector
-
-        search_manager = MilvusSearchManager(collection_name, top_k)
-
-        # TODO: 기준 정보 별도 관리 필요
-        if search_type_id == 1:  # Semantic Search
-            search_result = search_manager.dense_search(dense_vector)
-        elif search_type_id == 2:  # Full-Text Search
-            search_result = search_manager.sparse_search(sparse_vector)
-        elif search_type_id == 3:  # Hybrid Search
-            dense_weight = request.dense_weight
-            sparse_weight = request.sparse_weight
-            search_result = search_manager.hybrid_search(dense_vector, sparse_vector, dense_weight, sparse_weight)
-        else:
-            result = []
-        result = [
-            {"distance": data.distance, "text": data.get("text")}
-            for data in search_result[0]
-            if data.distance > threshold_score
-        ]
-        return result
+        # 검색 유형에 필요한 vector만 계산
+        vector_fields = SEARCH_TYPE_VECTOR_FIELDS.get(search_type_id)
+        if vector_fields is None or not set(vector_fields) <= set(knowledge_model.vector_fields):
+            raise UnsupportedSearchTypeException()
+        # query는 지식을 만들 때 사용한 임베딩 모델로 인코딩
+        with get_embedder_pool().use(knowledge_model.model) as embedder:
+            embeddings = get_embedding_batcher().embed(
+                [query],
+                return_dense=DENSE_VECTOR_FIELD in vector_fields,
+                return_sparse=SPARSE_VECTOR_FIELD in vector_fields,
+                embedder=embedder,
+            )
+            dense_vector = embeddings.dense_vector
+            sparse_vector = embeddings.sparse_vector
+            if sparse_vector is not None:
+                sparse_vector = prune_sparse_vectors(
+                    sparse_vector,
+                    top_n=knowledge_model.sparse_query_top_n,
+                    min_weight=knowledge_model.sparse_query_min_weight,
+                )
+
+            filter_expr = metadata_filter(**request.filter.model_dump()) if request.filter is not None else None
+            file_ids = EvaluationService._route_files(knowledge_model, dense_vector, db)
+        search_manager = EvaluationService._search_manager(knowledge_model, top_k, db, filter_expr, file_ids, min_score)
+
+        try:
+            if search_type_id == 1:  # Semantic Search
+                search_result = search_manager.dense_search(dense_vector)
+            elif search_type_id == 2:  # Full-Text Search
+                search_result = search_manager.sparse_search(sparse_vector)
+            elif search_type_id == 3:  # Hybrid Search
+                # 요청에 가중치가 없으면 지식에 저장된(튜닝된) 가중치 사용
+                dense_weight, sparse_weight = request.dense_weight, request.sparse_weight
+                if dense_weight is None or sparse_weight is None:
+                    dense_weight, sparse_weight = knowledge_model.dense_weight, knowledge_model.sparse_weight
+                search_result = search_manager.hybrid_search(
+                    dense_vector,
+                    sparse_vector,
+                    dense_weight,
+                    sparse_weight,
+                    fusion_method=knowledge_model.fusion_method,
+                    rrf_k=knowledge_model.rrf_k,
+                    fusion_mode=knowledge_model.fusion_mode,
+                )
+        except MissingRescoreVectorsError:
+            raise MissingRescoreVectorsException()
+        return EvaluationService._hydrate(search_result[0], db)
+
+    @staticmethod
+    def tune_hybrid_weights(request: HybridTuningRequestSchema, db: Session) -> dict:
+        """
+        정답이 표시된 query 집합으로 hybrid 검색의 fusion 설정을 튜닝합니다.
+
+        query마다 dense/sparse 검색을 한 번씩만 하여 후보 `candidate_limit`개의 점수를 캐시한 뒤,
+        weighted 가중치(`weight_step` 간격, sparse = 1 - dense)와 RRF k 값 전체를 행렬 연산으로 평가합니다.
+        Milvus ranker와 같은 방식으로 점수를 합치므로 후보 범위 안에서는 실제 hybrid 검색과 같은 순위가 나옵니다.
+        normalized 방식은 후보 범위 안에서 min-max 정규화하므로 검색 결과 수(top_k)에 따라 순위가 조금 달라질 수 있습니다.
+
+        `apply`이면 가장 좋은 설정을 지식에 저장합니다. fusion 방식마다 점수 범위가 달라(RRF는 0.03 안팎) 지식의
+        score threshold가 그대로 맞지 않으므로, threshold가 있는 지식은 현재 fusion 방식 안에서 가장 좋은 설정만 저장합니다.
+
+        Args:
+            request (HybridTuningRequestSchema): 지식 ID, 정답이 표시된 query 목록, 평가 설정.
+            db (Session): 데이터베이스 세션.
+
+        Returns:
+            dict: 가장 좋은 설정(best), metric 기준 상위 설정(results), 지식에 저장했는지 여부(applied),
+                저장한 설정(applied_result).
+        """
+        knowledge_model = knowledge_repository.get(db, request.knowledge_id)
+        if knowledge_model is None:
+            raise ItemNotFoundException()
+        if not set(SEARCH_TYPE_VECTOR_FIELDS[3]) <= set(knowledge_model.vector_fields):
+            raise UnsupportedSearchTypeException()
+
+        with get_embedder_pool().use(knowledge_model.model) as embedder:
+            embeddings = get_embedding_batcher().embed([query.query for query in request.queries], embedder=embedder)
+            sparse_vectors = prune_sparse_vectors(
+                embeddings.sparse_vector,
+                top_n=knowledge_model.sparse_query_top_n,
+                min_weight=knowledge_model.sparse_query_min_weight,
+            )
+        search_manager = EvaluationService._search_manager(knowledge_model, request.candidate_limit, db)
+        # dense/sparse 검색을 동시에 실행
+        dense_future = get_search_executor().submit(search_manager.dense_search, embeddings.dense_vector)
+        sparse_hits = search_manager.sparse_search(sparse_vectors)
+        try:
+            candidates = CandidateScores.from_hits(dense_future.result(), sparse_hits)
+        except MissingRescoreVectorsError:
+            raise MissingRescoreVectorsException()
+        relevant, num_relevant = candidates.relevance([set(query.relevant_ids) for query in request.queries])
+
+        results = []
+        dense_weights = np.round(np.arange(0, 1 + request.weight_step / 2, request.weight_step), 6)
+        # (가중치 수, query 수, 후보 수) 행렬이 커지지 않도록 가중치를 나누어 평가
+        chunk_size = max(1, 4_000_000 // max(candidates.ids.size, 1))
+        weighted_methods = {
+            FusionMethod.WEIGHTED: candidates.weighted_scores,
+            FusionMethod.NORMALIZED: candidates.normalized_scores,
+        }
+        for (fusion_method, fused_scores_of), start in itertools.product(
+            weighted_methods.items(), range(0, len(dense_weights), chunk_size)
+        ):
+            weights = dense_weights[start : start + chunk_size]
+            fused_scores = fused_scores_of(weights, 1 - weights)
+            recall, mrr = ranking_metrics(fused_scores, relevant, num_relevant, request.top_k)
+            for dense_weight, weight_recall, weight_mrr in zip(weights, recall, mrr):
+                results.append(
+                    {
+                        "fusion_method": fusion_method.value,
+                        "dense_weight": float(dense_weight),
+                        "sparse_weight": float(round(1 - dense_weight, 6)),
+                        "rrf_k": None,
+                        "recall": float(weight_recall),
+                        "mrr": float(weight_mrr),
+                    }
+                )
+        rrf_ks = np.asarray(request.rrf_k_values)
+        recall, mrr = ranking_metrics(candidates.rrf_scores(rrf_ks), relevant, num_relevant, request.top_k)
+        for rrf_k, k_recall, k_mrr in zip(rrf_ks, recall, mrr):
+            results.append(
+                {
+                    "fusion_method": FusionMethod.RRF.value,
+                    "dense_weight": None,
+                    "sparse_weight": None,
+                    "rrf_k": int(rrf_k),
+                    "recall": float(k_recall),
+                    "mrr": float(k_mrr),
+                }
+            )
+
+        secondary = "recall" if request.metric == "mrr" else "mrr"
+        results.sort(key=lambda result: (result[request.metric], result[secondary]), reverse=True)
+        best = results[0]
+        applied = best if request.apply else None
+        if applied is not None and knowledge_model.score is not None and knowledge_model.score > -math.inf:
+            # score threshold는 현재 fusion 방식의 점수 범위에 맞춘 값이므로 방식은 바꾸지 않음
+            current_method = FusionMethod(knowledge_model.fusion_method).value
+            applied = next((result for result in results if result["fusion_method"] == current_method), None)
+        if applied is not None:
+            knowledge_model.fusion_method = applied["fusion_method"]
+            if applied["fusion_method"] != FusionMethod.RRF.value:
+                knowledge_model.dense_weight = applied["dense_weight"]
+                knowledge_model.sparse_weight = applied["sparse_weight"]
+            else:
+                knowledge_model.rrf_k = applied["rrf_k"]
+            db.flush()
+        return {"best": best, "results": results[:20], "applied": applied is not None, "applied_result": applied}
@@ -1,19 +1,58 @@
+import hashlib
 from io import BytesIO
 from pathlib import Path
 
-from fastapi import UploadFile
+import numpy as np
+from core.exceptions import (
+    InvalidIndexConfigurationException,
+    InvalidReplicaConfigurationException,
+    InvalidVectorStorageException,
+    ItemNotFoundException,
+    UnsupportedCollectionLayoutException,
+    UnsupportedSearchTypeException,
+)
+from config.db.session import SessionLocal
+from db.models import Knowledge, KnowledgeFile
+from fastapi import BackgroundTasks, UploadFile
 from langchain_core.documents import Document
-from repos.knowledge import knowledge_file_repository, knowledge_repository
+from repos.knowledge import knowledge_chunk_repository, knowledge_file_repository, knowledge_repository
+from repos.model import model_repository
 from schemas.knowledge import (
     KnowledgeBaseSchema,
+    KnowledgeChunkBaseSchema,
     KnowledgeFileBaseSchema,
+    KnowledgeIndexUpdateSchema,
     KnowledgeReadSchema,
+    KnowledgeReplicaUpdateSchema,
 )
 from sqlalchemy.orm import Session
+from util.bulk_import import BulkImportStatus, bulk_import_columns
 from util.chunk import file_load_and_split, get_file_extension
+from util.collection_residency import get_collection_residency
+from util.embedder_pool import get_embedder_pool
 from util.embedding import BGEM3Embedding
 from util.object_storage import FileManager
-from util.vector_database import MilvusManager
+from util.partition_routing import file_centroid
+from util.sparse import prune_sparse_vectors
+from util.vector_database import (
+    CHUNK_ID_FIELD,
+    CHUNK_INDEX_FIELD,
+    CREATED_AT_FIELD,
+    DENSE_VECTOR_FIELD,
+    FILE_TYPE_FIELD,
+    KNOWLEDGE_FILE_ID_FIELD,
+    KNOWLEDGE_ID_FIELD,
+    PAGE_FIELD,
+    SEARCH_TYPE_VECTOR_FIELDS,
+    SPARSE_VECTOR_FIELD,
+    TEXT_FIELD,
+    MilvusManager,
+    dense_metric_type,
+    shared_collection_name,
+)
+from util.vector_engine import CollectionLayout, VectorEngine, get_vector_manager
+from util.vector_index import resolve_index
+from util.vector_storage import VectorStorageMode, requires_rescoring, stored_dimension, to_storage_vectors
 
 
 class KnowledgeService:
@@ -22,10 +61,218 @@ class KnowledgeService:
 
     def create(self, db: Session, obj_in: KnowledgeBaseSchema):
         collection_name = obj_in.name
-        MilvusManager.create_collection(collection_name)
+        model = model_repository.get(db, obj_in.model_id)
+        with get_embedder_pool().use(model) as embedder:
+            # collection 차원은 knowledge의 임베딩 모델에서 결정
+            dimension = embedder.dimension
+            # sparse vector를 만들 수 없는 모델(sentence-transformers)은 dense vector만 저장
+            if not embedder.supports_sparse:
+                obj_in.use_sparse_vector = False
+        try:
+            stored_dimension(obj_in.vector_storage_mode, dimension, obj_in.truncated_dimension)
+        except ValueError:
+            raise InvalidVectorStorageException()
+        # local engine은 full-precision vector를 memory-map 파일로 저장하므로 압축 저장 모드를 사용하지 않음
+        if obj_in.vector_engine == VectorEngine.LOCAL and obj_in.vector_storage_mode != VectorStorageMode.FLOAT32:
+            raise InvalidVectorStorageException()
+        try:
+            resolve_index(obj_in.vector_storage_mode, obj_in.index_type, obj_in.index_params)
+        except ValueError:
+            raise InvalidIndexConfigurationException()
+        vector_fields = []
+        if obj_in.use_dense_vector:
+            vector_fields.append(DENSE_VECTOR_FIELD)
+        if obj_in.use_sparse_vector:
+            vector_fields.append(SPARSE_VECTOR_FIELD)
+        # 검색 유형에 필요한 vector field는 반드시 저장
+        required_fields = SEARCH_TYPE_VECTOR_FIELDS.get(obj_in.search_type_id)
+        if required_fields is None or not set(required_fields) <= set(vector_fields):
+            raise UnsupportedSearchTypeException()
+        shared = obj_in.collection_layout == CollectionLayout.SHARED
+        if shared:
+            # shard·replica 수는 컬렉션 단위이므로 shared 컬렉션은 지식별로 정하지 않음
+            if obj_in.vector_engine != VectorEngine.MILVUS or (obj_in.shards_num, obj_in.replica_number) != (1, 1):
+                raise UnsupportedCollectionLayoutException()
+            # schema와 index 유형이 같은 지식끼리 컬렉션을 공유 (build params는 컬렉션을 처음 만든 지식의 값)
+            collection_name = shared_collection_name(
+                dimension=dimension,
+                vector_fields=tuple(vector_fields),
+                storage_mode=obj_in.vector_storage_mode,
+                truncated_dimension=obj_in.truncated_dimension,
+                index_type=obj_in.index_type,
+            )
+        get_vector_manager(obj_in.vector_engine).create_collection(
+            collection_name,
+            dimension=dimension,
+            vector_fields=tuple(vector_fields),
+            storage_mode=obj_in.vector_storage_mode,
+            truncated_dimension=obj_in.truncated_dimension,
+            index_type=obj_in.index_type,
+            index_params=obj_in.index_params,
+            shared=shared,
+            shards_num=obj_in.shards_num,
+            replica_number=obj_in.replica_number,
+        )
         result = knowledge_repository.create(db, obj_in=obj_in)
+        if shared:
+            result.shared_collection = collection_name
+            db.flush()
         return result
 
+    def migrate_to_shared_collection(self, db: Session, knowledge_id: int) -> Knowledge:
+        """
+        dedicated 컬렉션에 저장된 지식을 shared 컬렉션으로 옮깁니다.
+
+        shared 컬렉션에 데이터를 모두 복사한 뒤 지식의 컬렉션을 바꾸어 commit하고, 그 다음에 기존 컬렉션을 삭제합니다.
+        복사하는 동안에는 기존 컬렉션으로 검색하며, 데이터셋 적재는 멈춰야 합니다. chunk id(primary key)는 그대로 유지되며,
+        텍스트를 저장하는 기존 auto_id 컬렉션만 chunk store로 옮기면서 chunk id가 새로 발급됩니다.
+        """
+        knowledge_model = knowledge_repository.get(db, knowledge_id)
+        if knowledge_model is None:
+            raise ItemNotFoundException()
+        if knowledge_model.vector_engine != VectorEngine.MILVUS:
+            raise UnsupportedCollectionLayoutException()
+        if knowledge_model.collection_layout == CollectionLayout.SHARED:
+            return knowledge_model
+
+        with get_embedder_pool().use(knowledge_model.model) as embedder:
+            dimension = embedder.dimension
+        collection_name = shared_collection_name(
+            dimension=dimension,
+            vector_fields=knowledge_model.vector_fields,
+            storage_mode=knowledge_model.vector_storage_mode,
+            truncated_dimension=knowledge_model.truncated_dimension,
+            index_type=knowledge_model.index_type,
+        )
+        MilvusManager.create_collection(
+            collection_name,
+            dimension=dimension,
+            vector_fields=knowledge_model.vector_fields,
+            storage_mode=knowledge_model.vector_storage_mode,
+            truncated_dimension=knowledge_model.truncated_dimension,
+            index_type=knowledge_model.index_type,
+            index_params=knowledge_model.index_params,
+            shared=True,
+        )
+
+        def store_chunks(knowledge_file_id: int, rows: list[dict]) -> list[int]:
+            # 텍스트를 저장하던 컬렉션의 chunk는 chunk store로 옮김 (_default 파티션의 chunk는 파일 없음)
+            chunks = [
+                Document(
+                    page_content=row[TEXT_FIELD],
+                    metadata={
+                        "page": row[PAGE_FIELD] if row.get(PAGE_FIELD, -1) >= 0 else None,
+                        "chunk_index": row.get(CHUNK_INDEX_FIELD, -1),
+                    },
+                )
+                for row in rows
+            ]
+            chunk_ids = KnowledgeDatasetService.store_chunks(db, chunks, knowledge_model, knowledge_file_id or None)
+            if requires_rescoring(knowledge_model.vector_storage_mode):
+                # 압축 저장 모드의 rescoring vector는 chunk store로 옮기는 텍스트에서 한 번만 계산
+                with get_embedder_pool().use(knowledge_model.model) as embedder:
+                    dense_vectors = BGEM3Embedding(
+                        [row[TEXT_FIELD] for row in rows], return_sparse=False, embedder=embedder
+                    ).dense_vector
+                KnowledgeDatasetService.store_dense_vectors(db, chunk_ids, dense_vectors)
+            return chunk_ids
+
+        # 복사하는 동안 residency 관리가 기존 컬렉션을 release하지 않도록 재배치에서 제외
+        with get_collection_residency().hold(knowledge_model.name):
+            MilvusManager.copy_to_shared_collection(
+                knowledge_model.name, collection_name, knowledge_id=knowledge_model.id, store_chunks=store_chunks
+            )
+        knowledge_model.collection_layout = CollectionLayout.SHARED.value
+        knowledge_model.shared_collection = collection_name
+        # shared 컬렉션은 기본 shard·replica 수를 사용
+        knowledge_model.shards_num = knowledge_model.replica_number = 1
+        db.commit()
+        MilvusManager.drop_collection(knowledge_model.name)
+        return knowledge_model
+
+    def update_index(self, db: Session, knowledge_id: int, obj_in: KnowledgeIndexUpdateSchema) -> Knowledge:
+        """
+        지식의 dense vector index 설정을 변경합니다.
+
+        index 유형이나 build params가 바뀌면 검색을 유지한 채 index를 다시 만들고(`rebuild_index`),
+        search params만 바뀌면 다음 검색부터 바로 적용됩니다.
+        """
+        knowledge_model = knowledge_repository.get(db, knowledge_id)
+        if knowledge_model is None:
+            raise ItemNotFoundException()
+        try:
+            index_type, index_params = resolve_index(
+                knowledge_model.vector_storage_mode, obj_in.index_type, obj_in.index_params
+            )
+        except ValueError:
+            raise InvalidIndexConfigurationException()
+
+        index_changed = (obj_in.index_type, obj_in.index_params) != (
+            knowledge_model.index_type,
+            knowledge_model.index_params,
+        )
+        if index_changed and DENSE_VECTOR_FIELD in knowledge_model.vector_fields:
+            # shared 컬렉션의 index는 다른 지식도 사용하므로 지식 하나의 설정으로 바꾸지 않음
+            if knowledge_model.collection_layout == CollectionLayout.SHARED:
+                raise UnsupportedCollectionLayoutException()
+            # 복사하는 동안 residency 관리가 원본 컬렉션을 release하지 않도록 재배치에서 제외
+            with get_collection_residency().hold(knowledge_model.name):
+                get_vector_manager(knowledge_model.vector_engine).rebuild_index(
+                    knowledge_model.name,
+                    field_name=DENSE_VECTOR_FIELD,
+                    index_type=index_type.value,
+                    metric_type=dense_metric_type(knowledge_model.vector_storage_mode),
+                    params=index_params,
+                    replica_number=knowledge_model.replica_number,
+                )
+        knowledge_model.index_type = obj_in.index_type
+        knowledge_model.index_params = obj_in.index_params
+        knowledge_model.search_params = obj_in.search_params
+        db.flush()
+        return knowledge_model
+
+    def update_replicas(self, db: Session, knowledge_id: int, obj_in: KnowledgeReplicaUpdateSchema) -> Knowledge:
+        """
+        지식 컬렉션의 replica 수를 변경합니다.
+
+        load된 컬렉션은 새 replica 수로 다시 load하고, release된 컬렉션은 다음 load(검색, residency 재배치)부터 적용됩니다.
+        shared 컬렉션은 다른 지식도 사용하므로 지식 하나의 설정으로 바꾸지 않습니다.
+        """
+        knowledge_model = knowledge_repository.get(db, knowledge_id)
+        if knowledge_model is None:
+            raise ItemNotFoundException()
+        if knowledge_model.collection_layout == CollectionLayout.SHARED:
+            raise UnsupportedCollectionLayoutException()
+        replica_changed = obj_in.replica_number != knowledge_model.replica_number
+        if replica_changed and knowledge_model.vector_engine == VectorEngine.MILVUS:
+            try:
+                MilvusManager.set_replica_number(knowledge_model.name, obj_in.replica_number)
+            except ValueError:
+                raise InvalidReplicaConfigurationException()
+            get_collection_residency().set_replica_numbers({knowledge_model.name: obj_in.replica_number})
+        knowledge_model.replica_number = obj_in.replica_number
+        db.flush()
+        return knowledge_model
+
+    @staticmethod
+    def get_collection_names(db: Session) -> list[str]:
+        """Milvus 지식 컬렉션 이름 목록 (앱 시작 시 residency 관리 대상으로 등록)"""
+        names = {
+            knowledge.collection_name
+            for knowledge in knowledge_repository.filter(db, {}).all()
+            if knowledge.vector_engine == VectorEngine.MILVUS
+        }
+        return sorted(names)
+
+    @staticmethod
+    def get_replica_numbers(db: Session) -> dict[str, int]:
+        """replica를 여러 개 load하는 Milvus 지식 컬렉션별 replica 수 (앱 시작 시 residency 관리에 등록)"""
+        return {
+            knowledge.collection_name: knowledge.replica_number
+            for knowledge in knowledge_repository.filter(db, {}).all()
+            if knowledge.vector_engine == VectorEngine.MILVUS and knowledge.replica_number > 1
+        }
+
     def get(self, db: Session, pk: int) -> KnowledgeReadSchema:
         return knowledge_repository.get(db, pk)
 
@@ -56,10 +303,10 @@ class KnowledgeDatasetService:
                 name=filename, path=filepath, knowledge_id=knowledge_id, file_type=ext, chunk_number=len(file_chunks)
             )
             result = knowledge_file_repository.create(db, obj_in=obj_in)
+            chunk_ids = self.store_chunks(db, file_chunks, knowledge_model, result.id)
 
             # # 4. Embedding into Vector Database
-            partition_name = f"{collection_name}_{result.id}"
-            self.embed_to_milvus(file_chunks, collection_name, partition_name)
+            self.embed_to_milvus(db, file_chunks, knowledge_model, result, chunk_ids)
         except Exception:
             # TODO Logging으로 변경
             print("Error!")
@@ -68,27 +315,223 @@ class KnowledgeDatasetService:
 
         return result
 
+    @staticmethod
+    def get_dataset(db: Session, knowledge_id: int, dataset_id: int) -> KnowledgeFile:
+        knowledge_file = knowledge_file_repository.get(db, dataset_id)
+        if knowledge_file is None or knowledge_file.knowledge_id != knowledge_id:
+            raise ItemNotFoundException()
+        return knowledge_file
+
     @staticmethod
     def get_file_object(bucket_name: str, filename: str) -> BytesIO:
         file_obj = FileManager.get_object(bucket_name, filename)
         file_stream = file_obj["Body"].read()
         return BytesIO(file_stream)
 
+    def create_dataset_bulk_import(
+        self, knowledge_id: int, file: UploadFile, db: Session, background_tasks: BackgroundTasks
+    ) -> KnowledgeFile:
+        """
+        파일을 chunking하여 KnowledgeFile을 만든 뒤, 임베딩과 Milvus bulk import는 background에서 진행합니다.
+        진행 상태는 KnowledgeFile의 import_status/import_progress로 확인합니다.
+        """
+        knowledge_model = knowledge_repository.get(db, knowledge_id)
+        collection_name = knowledge_model.name
+        file_data, filename, ext, filepath = self.save_to_storage(file, collection_name)
+        file_chunks = file_load_and_split(file_data, filename, knowledge_model.chunk_length, knowledge_model.overlap)
+        obj_in = KnowledgeFileBaseSchema(
+            name=filename,
+            path=filepath,
+            knowledge_id=knowledge_id,
+            file_type=ext,
+            chunk_number=len(file_chunks),
+            import_status=BulkImportStatus.PENDING.value,
+        )
+        result = knowledge_file_repository.create(db, obj_in=obj_in)
+        db.commit()
+        background_tasks.add_task(self.bulk_import_to_milvus, result.id, file_chunks)
+        return result
+
+    @classmethod
+    def bulk_import_to_milvus(cls, knowledge_file_id: int, chunks: list[Document]):
+        """
+        chunk를 임베딩하여 bulk import 파일로 object storage에 올리고, Milvus import가 끝날 때까지 진행 상태를 갱신합니다.
+        요청 session과 분리된 background 작업이므로 별도의 session을 사용합니다.
+        """
+        db = SessionLocal()
+        try:
+            knowledge_file = knowledge_file_repository.get(db, knowledge_file_id)
+            knowledge_model = knowledge_file.knowledge
+            collection_name = knowledge_model.collection_name
+            partition_name = cls.partition_name(knowledge_model, knowledge_file.id)
+
+            def update(status: BulkImportStatus, **kwargs):
+                knowledge_file_repository.update_import_state(db, db_obj=knowledge_file, status=status.value, **kwargs)
+
+            update(BulkImportStatus.IMPORTING, progress=0, rows=0)
+            try:
+                chunk_ids = cls.store_chunks(db, chunks, knowledge_model, knowledge_file.id)
+                columns = cls.build_columns(db, chunks, knowledge_model, knowledge_file, chunk_ids)
+                vector_manager = get_vector_manager(knowledge_model.vector_engine)
+                if partition_name is not None:
+                    vector_manager.create_partition(collection_name, partition_name)
+                if knowledge_model.vector_engine == VectorEngine.LOCAL:
+                    # local engine은 bulk import 없이 바로 적재
+                    rows = vector_manager.embed_documents(collection_name, columns, partition_name)
+                else:
+                    rows = bulk_import_columns(
+                        collection_name,
+                        partition_name,
+                        columns,
+                        on_progress=lambda progress, rows: update(
+                            BulkImportStatus.IMPORTING, progress=progress, rows=rows
+                        ),
+                    )
+            except Exception as e:
+                db.rollback()
+                update(BulkImportStatus.FAILED, error=str(e))
+                return
+            update(BulkImportStatus.COMPLETED, progress=100, rows=rows)
+        finally:
+            db.close()
+
+    @classmethod
+    def embed_to_milvus(
+        cls,
+        db: Session,
+        chunks: list[Document],
+        knowledge_model: Knowledge,
+        knowledge_file: KnowledgeFile,
+        chunk_ids: list[int],
+    ):
+        columns = cls.build_columns(db, chunks, knowledge_model, knowledge_file, chunk_ids)
+        get_vector_manager(knowledge_model.vector_engine).embed_documents(
+            knowledge_model.collection_name, columns, cls.partition_name(knowledge_model, knowledge_file.id)
+        )
+
     @staticmethod
-    def embed_to_milvus(chunks: list[Document], collection_name: str, partition_name: str):
+    def partition_name(knowledge_model: Knowledge, knowledge_file_id: int) -> str | None:
+        """파일을 적재할 파티션. shared 컬렉션은 지식 id partition key로 나뉘므로 파티션을 지정하지 않음"""
+        if knowledge_model.collection_layout == CollectionLayout.SHARED:
+            return None
+        return f"{knowledge_model.name}_{knowledge_file_id}"
+
+    @staticmethod
+    def chunk_indexes(chunks: list[Document]) -> list[int]:
+        """chunk 순번. loader가 chunk_index를 제공하면 그 값을 사용하며, chunk store와 Milvus에 같은 값을 기록합니다."""
+        return [int(chunk.metadata.get("chunk_index", index)) for index, chunk in enumerate(chunks)]
+
+    @staticmethod
+    def store_chunks(
+        db: Session, chunks: list[Document], knowledge_model: Knowledge, knowledge_file_id: int | None
+    ) -> list[int]:
+        """
+        chunk 텍스트를 chunk store(knowledge_chunk)에 저장하고 발급된 chunk id를 chunk 순서대로 반환합니다.
+        Milvus에는 텍스트 대신 chunk id를 primary key로 저장하며, content hash는 중복 제거와 재색인에 사용합니다.
+        """
         texts = [chunk.page_content for chunk in chunks]
+        with get_embedder_pool().use(knowledge_model.model) as embedder:
+            token_counts = embedder.count_tokens(texts)
+        objs_in = []
+        chunk_indexes = KnowledgeDatasetService.chunk_indexes(chunks)
+        for chunk, text, token_count, chunk_index in zip(chunks, texts, token_counts, chunk_indexes):
+            # loader가 add_start_index로 원문 위치를 제공한 경우에만 offset 기록
+            start_offset = chunk.metadata.get("start_index")
+            objs_in.append(
+                KnowledgeChunkBaseSchema(
+                    knowledge_id=knowledge_model.id,
+                    knowledge_file_id=knowledge_file_id,
+                    chunk_index=chunk_index,
+                    page=chunk.metadata.get("page"),
+                    start_offset=start_offset,
+                    end_offset=start_offset + len(text) if start_offset is not None else None,
+                    text=text,
+                    content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                    token_count=token_count,
+                )
+            )
+        return knowledge_chunk_repository.create_many(db, objs_in=objs_in)
 
-        embeddings = BGEM3Embedding(texts)
-        dense_vector = embeddings.dense_vector
-        sparse_vector = embeddings.sparse_vector
+    @staticmethod
+    def store_dense_vectors(db: Session, chunk_ids: list[int], dense_vectors: np.ndarray):
+        """압축 저장 모드의 rescoring에 사용할 full-precision dense vector를 chunk store에 float32 byte로 저장합니다."""
+        vectors = np.asarray(dense_vectors, dtype=np.float32)
+        knowledge_chunk_repository.set_dense_vectors(
+            db, {chunk_id: vector.tobytes() for chunk_id, vector in zip(chunk_ids, vectors)}
+        )
 
-        entities = [
-            {"sparse_vector": entity[0], "dense_vector": entity[1], "text": entity[2]}
-            for entity in zip(sparse_vector, dense_vector, texts)
-        ]
+    @classmethod
+    def backfill_dense_vectors(cls, db: Session, knowledge_model: Knowledge, batch_size: int = 256) -> int:
+        """
+        full-precision dense vector가 없는 chunk(vector 저장 도입 전에 적재)의 vector를 계산하여 저장합니다.
+        batch마다 commit하므로 중간에 실패해도 다시 실행하면 남은 chunk부터 이어서 채웁니다. 채운 chunk 수를 반환합니다.
+        """
+        filled = 0
+        while True:
+            rows = knowledge_chunk_repository.get_without_dense_vector(db, knowledge_model.id, batch_size)
+            if not rows:
+                return filled
+            with get_embedder_pool().use(knowledge_model.model) as embedder:
+                dense_vectors = BGEM3Embedding(
+                    [text for _, text in rows], return_sparse=False, embedder=embedder
+                ).dense_vector
+            cls.store_dense_vectors(db, [chunk_id for chunk_id, _ in rows], dense_vectors)
+            db.commit()
+            filled += len(rows)
 
-        # # TODO: Collection name 하드코딩 제거
-        MilvusManager.embed_documents(collection_name, entities, partition_name)
+    @classmethod
+    def build_columns(
+        cls,
+        db: Session,
+        chunks: list[Document],
+        knowledge_model: Knowledge,
+        knowledge_file: KnowledgeFile,
+        chunk_ids: list[int],
+    ) -> dict[str, list]:
+        """
+        chunk를 지식의 임베딩 모델·저장 설정에 맞게 임베딩하여 Milvus field별 column으로 만듭니다.
+        검색 filter에 사용하는 파일 id, 파일 유형, page(없으면 -1), chunk 순번, 적재 시각 column을 함께 만듭니다.
+        dense vector를 저장하는 지식이면 partition routing에 사용할 파일 centroid를 `knowledge_file`에 기록하고,
+        압축 저장 모드이면 rescoring에 사용할 full-precision dense vector를 chunk store에 저장합니다.
+        텍스트 column은 텍스트를 저장하는 기존 컬렉션과 local engine에서만 사용합니다.
+        """
+        vector_fields = knowledge_model.vector_fields
+        texts = [chunk.page_content for chunk in chunks]
+
+        # 지식에 저장하는 vector field만 지식의 임베딩 모델로 계산
+        with get_embedder_pool().use(knowledge_model.model) as embedder:
+            embeddings = BGEM3Embedding(
+                texts,
+                return_dense=DENSE_VECTOR_FIELD in vector_fields,
+                return_sparse=SPARSE_VECTOR_FIELD in vector_fields,
+                embedder=embedder,
+            )
+        columns = {CHUNK_ID_FIELD: chunk_ids, TEXT_FIELD: texts}
+        if DENSE_VECTOR_FIELD in vector_fields:
+            # 압축 저장 모드에 맞게 변환 (full-precision vector는 chunk store에 저장하여 rescoring에 사용)
+            columns[DENSE_VECTOR_FIELD] = to_storage_vectors(
+                embeddings.dense_vector, knowledge_model.vector_storage_mode, knowledge_model.truncated_dimension
+            )
+            if requires_rescoring(knowledge_model.vector_storage_mode):
+                cls.store_dense_vectors(db, chunk_ids, embeddings.dense_vector)
+            # partition routing에서 query와 비교하는 파일 centroid (full-precision vector 기준)
+            knowledge_file.centroid = file_centroid(embeddings.dense_vector)
+        if SPARSE_VECTOR_FIELD in vector_fields:
+            columns[SPARSE_VECTOR_FIELD] = prune_sparse_vectors(
+                embeddings.sparse_vector,
+                top_n=knowledge_model.sparse_ingest_top_n,
+                min_weight=knowledge_model.sparse_ingest_min_weight,
+            )
+        columns[KNOWLEDGE_FILE_ID_FIELD] = [knowledge_file.id] * len(texts)
+        columns[FILE_TYPE_FIELD] = [knowledge_file.file_type] * len(texts)
+        columns[PAGE_FIELD] = [
+            int(chunk.metadata["page"]) if chunk.metadata.get("page") is not None else -1 for chunk in chunks
+        ]
+        columns[CHUNK_INDEX_FIELD] = cls.chunk_indexes(chunks)
+        columns[CREATED_AT_FIELD] = [int(knowledge_file.created_at.timestamp())] * len(texts)
+        if knowledge_model.collection_layout == CollectionLayout.SHARED:
+            columns[KNOWLEDGE_ID_FIELD] = [knowledge_model.id] * len(texts)
+        return columns
 
     @staticmethod
     def save_to_storage(file: UploadFile, collection_name: str):
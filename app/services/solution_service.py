@@ -12,6 +12,7 @@ from schemas.solution import (
     SolutionReadSchema,
 )
 from sqlalchemy.orm import Session
+from util.vector_engine import VectorEngine
 
 settings = get_settings()
 
@@ -36,6 +37,16 @@ class SolutionService:
     def update(self, db: Session, db_obj, obj_in):
         return solution_repository.update(db, db_obj=db_obj, obj_in=obj_in)
 
+    @staticmethod
+    def get_knowledge_collection_names(db: Session) -> list[str]:
+        """solution이 사용하는 Milvus 지식 컬렉션 이름 목록 (앱 시작 시 preload 대상)"""
+        names = {
+            solution.knowledge.collection_name
+            for solution in solution_repository.filter(db, {}).all()
+            if solution.knowledge is not None and solution.knowledge.vector_engine == VectorEngine.MILVUS
+        }
+        return sorted(names)
+
 
 class SolutionConfigService:
     def __init__(self):
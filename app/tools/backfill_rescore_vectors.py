@@ -0,0 +1,65 @@
+"""
+Rescore vector backfill.
+
+압축 저장 모드(float16, binary, truncated) 지식은 적재할 때 chunk store(knowledge_chunk)에 저장한 full-precision
+dense vector로 rescoring하며, vector가 없는 chunk가 검색 후보에 오르면 검색이 실패합니다. vector 저장을 도입하기 전에
+적재한 chunk의 vector를 계산하여 채웁니다. batch마다 commit하므로 중간에 실패해도 다시 실행하면 이어서 채웁니다.
+텍스트를 Milvus에 저장하는 기존 컬렉션의 chunk는 chunk store에 없으므로 먼저 shared 컬렉션으로 옮겨야 합니다.
+
+    cd app
+    python -m tools.backfill_rescore_vectors --all
+    python -m tools.backfill_rescore_vectors --knowledge-ids 3,7 --batch-size 128
+"""
+import argparse
+
+from config.db.session import SessionLocal
+from repos.knowledge import knowledge_repository
+from services.knowledge_service import KnowledgeDatasetService
+from util.vector_database import DENSE_VECTOR_FIELD
+from util.vector_storage import requires_rescoring
+
+
+def _rescoring_knowledge_ids(db) -> list[int]:
+    return sorted(
+        knowledge.id
+        for knowledge in knowledge_repository.filter(db, {}).all()
+        if DENSE_VECTOR_FIELD in knowledge.vector_fields and requires_rescoring(knowledge.vector_storage_mode)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--knowledge-ids", help="vector를 채울 지식 ID 목록 (쉼표로 구분)")
+    target.add_argument("--all", action="store_true", help="압축 저장 모드인 지식 모두")
+    parser.add_argument("--batch-size", type=int, default=256, help="한 번에 임베딩하여 commit할 chunk 수")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            knowledge_ids = _rescoring_knowledge_ids(db)
+        else:
+            knowledge_ids = [int(item) for item in args.knowledge_ids.split(",")]
+        failed = []
+        for knowledge_id in knowledge_ids:
+            knowledge_model = knowledge_repository.get(db, knowledge_id)
+            if knowledge_model is None or not requires_rescoring(knowledge_model.vector_storage_mode):
+                print(f"knowledge {knowledge_id}: skipped (no rescoring)")
+                continue
+            try:
+                filled = KnowledgeDatasetService.backfill_dense_vectors(db, knowledge_model, args.batch_size)
+            except Exception as e:
+                db.rollback()
+                failed.append(knowledge_id)
+                print(f"knowledge {knowledge_id}: failed ({e})")
+                continue
+            print(f"knowledge {knowledge_id}: {filled} chunks")
+        if failed:
+            raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
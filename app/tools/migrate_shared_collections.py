@@ -0,0 +1,66 @@
+"""
+Shared collection migration.
+
+dedicated 구성(지식마다 Milvus 컬렉션, 파일마다 파티션)으로 저장된 지식을 지식 id를 partition key로 쓰는
+shared 컬렉션으로 옮깁니다. 지식마다 데이터를 shared 컬렉션에 복사한 뒤 지식의 컬렉션을 바꾸어 commit하고
+기존 컬렉션을 삭제하므로, 중간에 실패해도 이미 옮긴 지식은 shared 컬렉션으로 검색되고 나머지는 다시 실행하면 됩니다.
+옮기는 동안에는 대상 지식의 데이터셋 적재를 멈춰야 합니다. chunk id는 그대로 유지되며, 텍스트를 저장하는
+기존 auto_id 컬렉션만 chunk store로 옮기면서 chunk id가 새로 발급됩니다.
+
+    cd app
+    python -m tools.migrate_shared_collections --all
+    python -m tools.migrate_shared_collections --knowledge-ids 3,7 --dry-run
+"""
+import argparse
+
+from config.db.session import SessionLocal
+from repos.knowledge import knowledge_repository
+from services.knowledge_service import KnowledgeService
+from util.vector_engine import CollectionLayout, VectorEngine
+
+
+def _dedicated_knowledge_ids(db) -> list[int]:
+    return sorted(
+        knowledge.id
+        for knowledge in knowledge_repository.filter(db, {}).all()
+        if knowledge.vector_engine == VectorEngine.MILVUS and knowledge.collection_layout == CollectionLayout.DEDICATED
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--knowledge-ids", help="옮길 지식 ID 목록 (쉼표로 구분)")
+    target.add_argument("--all", action="store_true", help="dedicated 구성인 milvus 지식 모두")
+    parser.add_argument("--dry-run", action="store_true", help="옮길 지식만 출력")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            knowledge_ids = _dedicated_knowledge_ids(db)
+        else:
+            knowledge_ids = [int(item) for item in args.knowledge_ids.split(",")]
+        service = KnowledgeService()
+        failed = []
+        for knowledge_id in knowledge_ids:
+            if args.dry_run:
+                print(f"knowledge {knowledge_id}: would migrate")
+                continue
+            try:
+                knowledge_model = service.migrate_to_shared_collection(db, knowledge_id)
+            except Exception as e:
+                db.rollback()
+                failed.append(knowledge_id)
+                print(f"knowledge {knowledge_id}: failed ({e})")
+                continue
+            print(f"knowledge {knowledge_id}: {knowledge_model.collection_name}")
+        print(f"migrated {len(knowledge_ids) - len(failed)} / {len(knowledge_ids)} knowledge")
+        if failed:
+            raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from typing import Any
+
+import numpy as np
+
+
+def plan_batches(
+    lengths: list[int], *, max_length: int, token_budget: int, max_batch_size: int
+) -> list[tuple[list[int], int]]:
+    """
+    입력을 토큰 길이 순으로 정렬한 뒤, padding을 포함한 토큰 수가 `token_budget`을 넘지 않도록 batch를 나눕니다.
+
+    Args:
+        lengths (list[int]): 입력별 토큰 길이.
+        max_length (int): 모델의 최대 토큰 길이. 이보다 긴 입력은 잘린다고 가정합니다.
+        token_budget (int): batch당 허용하는 토큰 수 (가장 긴 입력 길이 x batch 크기).
+        max_batch_size (int): batch당 최대 입력 수.
+
+    Returns:
+        list[tuple[list[int], int]]: (원본 인덱스 목록, 해당 batch의 max_length) 목록.
+    """
+    order = sorted(range(len(lengths)), key=lambda index: lengths[index])
+    batches = []
+    current: list[int] = []
+    current_length = 0
+    for index in order:
+        length = max(1, min(lengths[index], max_length))
+        if current and (len(current) >= max_batch_size or length * (len(current) + 1) > token_budget):
+            batches.append((current, current_length))
+            current = []
+        current.append(index)
+        current_length = length
+    if current:
+        batches.append((current, current_length))
+    return batches
+
+
+def encode_bucketed(
+    model,
+    texts: list[str],
+    *,
+    max_length: int,
+    token_budget: int,
+    max_batch_size: int,
+    **encode_kwargs,
+) -> dict[str, Any]:
+    """
+    BGEM3FlagModel.encode를 길이 기준 bucket 단위로 호출하고 결과를 원래 순서로 복원합니다.
+
+    각 bucket은 실제 토큰 길이에서 구한 max_length로 인코딩되므로, 짧은 query가 긴 chunk 기준의
+    padding 비용을 치르지 않습니다.
+
+    Args:
+        model: `tokenizer`와 `encode`를 제공하는 BGE-M3 모델.
+        texts (list[str]): 인코딩할 텍스트 목록.
+        max_length (int): 최대 토큰 길이.
+        token_budget (int): batch당 토큰 예산.
+        max_batch_size (int): batch당 최대 입력 수.
+        **encode_kwargs: `return_dense`, `return_sparse`, `return_colbert_vecs` 등 encode 옵션.
+
+    Returns:
+        dict[str, Any]: encode와 동일한 형식의 결과 (dense_vecs, lexical_weights, colbert_vecs).
+            encode처럼 요청하지 않은 출력도 None으로 포함합니다.
+    """
+    if not texts:
+        # 빈 입력도 encode와 같은 key 구성으로 반환 (기본값은 BGEM3FlagModel.encode와 동일)
+        return {
+            "dense_vecs": np.empty((0, 0), dtype=np.float32) if encode_kwargs.get("return_dense", True) else None,
+            "lexical_weights": [] if encode_kwargs.get("return_sparse", False) else None,
+            "colbert_vecs": [] if encode_kwargs.get("return_colbert_vecs", False) else None,
+        }
+    lengths = [len(ids) for ids in model.tokenizer(texts, add_special_tokens=True, truncation=False)["input_ids"]]
+    batches = plan_batches(lengths, max_length=max_length, token_budget=token_budget, max_batch_size=max_batch_size)
+
+    outputs: dict[str, list | None] = {}
+    for indices, batch_max_length in batches:
+        encoded = model.encode(
+            [texts[index] for index in indices],
+            batch_size=len(indices),
+            max_length=batch_max_length,
+            **encode_kwargs,
+        )
+        for name, values in encoded.items():
+            if values is None:
+                # 요청하지 않은 출력은 encode처럼 None으로 유지
+                outputs.setdefault(name, None)
+                continue
+            slots = outputs.get(name)
+            if slots is None:
+                slots = outputs[name] = [None] * len(texts)
+            for index, value in zip(indices, values):
+                slots[index] = value
+
+    result: dict[str, Any] = dict(outputs)
+    if result.get("dense_vecs") is not None:
+        result["dense_vecs"] = np.stack(result["dense_vecs"])
+    return result
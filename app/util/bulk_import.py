@@ -0,0 +1,207 @@
+import io
+import json
+import time
+import uuid
+from enum import Enum
+from typing import Callable
+
+import numpy as np
+from config.settings import get_settings
+from pymilvus import BulkInsertState, utility
+from util.object_storage import FileManager
+from util.vector_database import get_vector_store
+
+settings = get_settings()
+
+
+class BulkImportFormat(str, Enum):
+    PARQUET = "parquet"  # 파일 1개 = 행 묶음 1개 (dense/sparse/text 모두 지원)
+    NUMPY = "numpy"  # field별 .npy 파일 묶음 (sparse vector 미지원)
+
+
+class BulkImportStatus(str, Enum):
+    PENDING = "pending"
+    IMPORTING = "importing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BulkImportError(Exception):
+    ...
+
+
+FAILED_STATES = (BulkInsertState.ImportFailed, BulkInsertState.ImportFailedAndCleaned)
+
+
+def _dense_matrix(values: list) -> np.ndarray:
+    """dense vector column을 Milvus bulk import 형식의 2차원 배열로 변환합니다. float16/binary는 raw byte(uint8)."""
+    first = values[0]
+    if isinstance(first, bytes):
+        return np.frombuffer(b"".join(values), dtype=np.uint8).reshape(len(values), -1)
+    matrix = np.stack(values)
+    if matrix.dtype == np.float16:
+        return matrix.view(np.uint8)
+    return matrix.astype(np.float32, copy=False)
+
+
+def _sparse_json(weights: dict) -> str:
+    return json.dumps({"indices": [int(token) for token in weights], "values": [float(v) for v in weights.values()]})
+
+
+def _parquet_file(columns: dict[str, list]) -> bytes:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("parquet bulk import requires `pyarrow` to be installed") from e
+
+    arrays = {}
+    for name, values in columns.items():
+        first = values[0]
+        if isinstance(first, (np.ndarray, bytes)):
+            matrix = _dense_matrix(values)
+            offsets = np.arange(0, matrix.size + 1, matrix.shape[1], dtype=np.int32)
+            arrays[name] = pa.ListArray.from_arrays(pa.array(offsets), pa.array(matrix.reshape(-1)))
+        elif isinstance(first, dict):
+            arrays[name] = pa.array([_sparse_json(weights) for weights in values], type=pa.string())
+        else:
+            arrays[name] = pa.array(values)
+    buffer = io.BytesIO()
+    pq.write_table(pa.table(arrays), buffer)
+    return buffer.getvalue()
+
+
+def _numpy_files(columns: dict[str, list]) -> dict[str, bytes]:
+    files = {}
+    for name, values in columns.items():
+        first = values[0]
+        if isinstance(first, dict):
+            raise ValueError("numpy bulk import does not support sparse vectors; use parquet")
+        array = _dense_matrix(values) if isinstance(first, (np.ndarray, bytes)) else np.asarray(values)
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        files[f"{name}.npy"] = buffer.getvalue()
+    return files
+
+
+def write_import_files(
+    columns: dict[str, list], *, file_format: BulkImportFormat | str, rows_per_file: int
+) -> list[dict[str, bytes]]:
+    """
+    column 데이터를 Milvus bulk import 파일로 직렬화합니다.
+
+    Args:
+        columns (dict[str, list]): field 이름 → 값 목록 (auto_id primary key 제외).
+        file_format (BulkImportFormat | str): parquet 또는 numpy.
+        rows_per_file (int): import 작업 하나에 들어갈 최대 행 수.
+
+    Returns:
+        list[dict[str, bytes]]: import 작업별 파일 이름 → 내용. parquet은 작업마다 파일 1개, numpy는 field별 파일.
+    """
+    file_format = BulkImportFormat(file_format)
+    num_rows = len(next(iter(columns.values())))
+    jobs = []
+    for start in range(0, num_rows, rows_per_file):
+        batch = {name: values[start : start + rows_per_file] for name, values in columns.items()}
+        if file_format == BulkImportFormat.PARQUET:
+            jobs.append({"data.parquet": _parquet_file(batch)})
+        else:
+            jobs.append(_numpy_files(batch))
+    return jobs
+
+
+def upload_import_files(jobs: list[dict[str, bytes]], prefix: str) -> list[list[str]]:
+    """
+    bulk import 파일을 Milvus가 읽는 object storage bucket에 업로드합니다.
+
+    Returns:
+        list[list[str]]: import 작업별 object key 목록.
+    """
+    keys = []
+    for index, files in enumerate(jobs):
+        job_keys = []
+        for file_name, content in files.items():
+            key = f"{prefix}/{index:05d}/{file_name}"
+            result = FileManager.upload(io.BytesIO(content), settings.MILVUS_BULK_IMPORT_BUCKET, key)
+            # FileManager는 업로드 실패 시 예외 대신 오류 메시지를 반환
+            if isinstance(result, str):
+                raise BulkImportError(result)
+            job_keys.append(key)
+        keys.append(job_keys)
+    return keys
+
+
+def start_bulk_import(collection_name: str, partition_name: str | None, files: list[list[str]]) -> list[int]:
+    """import 작업별로 Milvus bulk import를 시작하고 task id 목록을 반환합니다."""
+    alias = get_vector_store().alias
+    return [
+        utility.do_bulk_insert(collection_name, files=job_files, partition_name=partition_name, using=alias)
+        for job_files in files
+    ]
+
+
+def wait_for_bulk_import(
+    task_ids: list[int],
+    *,
+    on_progress: Callable[[int, int], None] | None = None,
+    poll_interval: float = settings.MILVUS_BULK_IMPORT_POLL_INTERVAL,
+    timeout: float = settings.MILVUS_BULK_IMPORT_TIMEOUT,
+) -> int:
+    """
+    bulk import 작업이 모두 끝날 때까지 polling합니다.
+
+    Args:
+        task_ids (list[int]): `start_bulk_import`가 반환한 task id 목록.
+        on_progress (Callable[[int, int], None] | None): polling마다 (전체 진행률 %, import된 행 수)로 호출됩니다.
+        poll_interval (float): polling 간격(초).
+        timeout (float): 최대 대기 시간(초).
+
+    Returns:
+        int: import된 전체 행 수.
+
+    Raises:
+        BulkImportError: 작업이 실패했거나 timeout이 지난 경우.
+    """
+    alias = get_vector_store().alias
+    deadline = time.monotonic() + timeout
+    while True:
+        states = [utility.get_bulk_insert_state(task_id, using=alias) for task_id in task_ids]
+        failed = [state for state in states if state.state in FAILED_STATES]
+        if failed:
+            raise BulkImportError(f"Bulk import task {failed[0].task_id} failed: {failed[0].failed_reason}")
+        row_count = sum(state.row_count for state in states)
+        progress = sum(state.progress for state in states) // len(states)
+        if on_progress is not None:
+            on_progress(progress, row_count)
+        if all(state.state == BulkInsertState.ImportCompleted for state in states):
+            return row_count
+        if time.monotonic() > deadline:
+            raise BulkImportError(f"Bulk import did not finish within {timeout} seconds")
+        time.sleep(poll_interval)
+
+
+def bulk_import_columns(
+    collection_name: str,
+    partition_name: str | None,
+    columns: dict[str, list],
+    *,
+    file_format: BulkImportFormat | str = settings.MILVUS_BULK_IMPORT_FORMAT,
+    rows_per_file: int = settings.MILVUS_BULK_IMPORT_ROWS_PER_FILE,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    column 데이터를 파일로 써서 object storage에 올리고, Milvus bulk import가 끝날 때까지 기다립니다.
+
+    Returns:
+        int: import된 전체 행 수.
+    """
+    # 컬렉션 schema에 없는 column과 auto_id primary key는 제외 (chunk store, metadata field를 쓰기 전에 만든 컬렉션)
+    field_names = {
+        field["name"] for field in get_vector_store().describe(collection_name)["fields"] if not field.get("auto_id")
+    }
+    columns = {name: values for name, values in columns.items() if name in field_names}
+    jobs = write_import_files(columns, file_format=file_format, rows_per_file=rows_per_file)
+    prefix = f"bulk_import/{collection_name}/{partition_name or '_default'}/{uuid.uuid4().hex}"
+    files = upload_import_files(jobs, prefix)
+    task_ids = start_bulk_import(collection_name, partition_name, files)
+    return wait_for_bulk_import(task_ids, on_progress=on_progress)
@@ -0,0 +1,368 @@
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from functools import lru_cache
+
+from config.settings import get_settings
+from core.logger import get_logger
+from pymilvus import DataType, utility
+from pymilvus.client.types import LoadState
+from util.vector_database import get_vector_store
+
+settings = get_settings()
+logger = get_logger()
+
+# load 전 메모리 추정에 사용하는 행당 크기 (sparse: 평균 100 term x 12 byte, varchar: max_length와 이 값 중 작은 값)
+ESTIMATED_SPARSE_ROW_BYTES = 1200
+ESTIMATED_VARCHAR_ROW_BYTES = 1024
+# rebuild_index가 만드는 임시 컬렉션은 관리하지 않음
+UNMANAGED_SUFFIXES = ("__rebuild", "__retired")
+
+
+class Residency(str, Enum):
+    MEMORY = "memory"  # query node 메모리에 load
+    MMAP = "mmap"  # mmap.enabled로 load (raw data와 index를 디스크에 두고 page cache로 읽음)
+    RELEASED = "released"
+
+
+class CollectionUsage:
+    """컬렉션별 최근 검색 사용량. heat는 반감기마다 절반으로 줄어드는 누적 검색 수입니다."""
+
+    def __init__(self, name: str, now: float):
+        self.name = name
+        self.last_access = now
+        self.heat = 0.0
+        self._heat_updated = now
+        self.pinned = False
+        # 컬렉션을 읽는 중인 작업(index rebuild, shared 컬렉션 복사) 수. 0보다 크면 재배치하지 않음
+        self.holds = 0
+        self.memory_bytes: int | None = None
+        self.residency = Residency.RELEASED
+        # load할 replica 수. 메모리 사용량은 replica 하나 기준이며 예산에는 replica 수만큼 반영
+        self.replica_number = 1
+
+    @property
+    def total_memory_bytes(self) -> int:
+        return self.memory_bytes * self.replica_number
+
+    def decayed_heat(self, now: float, half_life: float) -> float:
+        return self.heat * 0.5 ** ((now - self._heat_updated) / half_life)
+
+    def touch(self, now: float, half_life: float):
+        self.heat = self.decayed_heat(now, half_life) + 1
+        self._heat_updated = now
+        self.last_access = now
+
+
+class CollectionWarmingError(Exception):
+    """컬렉션을 load하는 중이라 아직 검색할 수 없는 경우"""
+
+
+class CollectionResidencyManager:
+    """
+    검색 사용량에 따라 Milvus 컬렉션의 load 상태를 관리합니다.
+
+    관리 대상은 지식 테이블에 등록된 컬렉션(`start`의 `managed`)과 검색한 컬렉션뿐이며, 같은 Milvus를 사용하는
+    다른 애플리케이션의 컬렉션은 load 상태를 바꾸지 않습니다.
+
+    사용량(heat)이 높은 컬렉션부터 메모리 예산 안에서 메모리에 load하고, 예산을 넘는 컬렉션은 mmap으로 load하거나
+    release합니다. `idle_timeout` 동안 검색하지 않은 컬렉션은 release하며, pin한 컬렉션(활성 solution의 지식)은
+    예산 안에서 가장 먼저 load합니다. `hold`한 컬렉션은 작업이 끝날 때까지, load된 컬렉션은 재배치 주기 동안 검색이
+    없을 때까지 현재 상태를 유지합니다 (상태를 바꾸려면 release해야 하므로 검색 중인 컬렉션은 내리지 않음).
+    재배치는 background thread에서 `interval`마다 실행합니다.
+
+    release된 컬렉션을 검색하면 바로 load를 시작하고 `warm_wait`초까지 기다린 뒤에도 끝나지 않으면
+    `CollectionWarmingError`를 발생시켜 잠시 후 다시 요청하도록 합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        memory_budget: int,
+        interval: float,
+        idle_timeout: float,
+        half_life: float,
+        mmap_enabled: bool,
+        mmap_memory_ratio: float,
+        warm_wait: float,
+    ):
+        self._enabled = enabled
+        self._memory_budget = memory_budget
+        self._interval = interval
+        self._idle_timeout = idle_timeout
+        self._half_life = half_life
+        self._mmap_enabled = mmap_enabled
+        self._mmap_memory_ratio = mmap_memory_ratio
+        self._warm_wait = warm_wait
+        self._usages: dict[str, CollectionUsage] = {}
+        self._managed: set[str] = set()
+        self._lock = threading.Lock()
+        self._rebalance_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _usage(self, name: str) -> CollectionUsage:
+        usage = self._usages.get(name)
+        if usage is None:
+            usage = self._usages[name] = CollectionUsage(name, time.monotonic())
+        return usage
+
+    def ensure_loaded(self, collection_name: str, replica_number: int = 1):
+        """
+        검색 전에 호출하여 사용량을 기록하고, 컬렉션이 load되어 있지 않으면 `replica_number`개의 replica로 load를 시작합니다.
+
+        Raises:
+            CollectionWarmingError: `warm_wait`초 안에 load가 끝나지 않은 경우.
+        """
+        if not self._enabled:
+            return
+        with self._lock:
+            self._managed.add(collection_name)
+            usage = self._usage(collection_name)
+            usage.touch(time.monotonic(), self._half_life)
+            usage.replica_number = replica_number
+        client = get_vector_store().client
+        state = client.get_load_state(collection_name)["state"]
+        if state in (LoadState.Loaded, LoadState.NotExist):
+            return
+        if state == LoadState.NotLoad:
+            # 현재 mmap 설정 그대로 load하고, 메모리 예산은 바로 이어지는 재배치에서 다른 컬렉션을 내려 맞춤
+            client.load_collection(collection_name, replica_number=replica_number, _async=True)
+            self._wakeup.set()
+        deadline = time.monotonic() + self._warm_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            if client.get_load_state(collection_name)["state"] == LoadState.Loaded:
+                return
+        raise CollectionWarmingError(collection_name)
+
+    def pin(self, collection_names: list[str]):
+        """예산 안에서 항상 먼저 load하고 idle timeout으로 release하지 않을 컬렉션을 지정합니다."""
+        with self._lock:
+            for name in collection_names:
+                self._usage(name).pinned = True
+
+    @contextmanager
+    def hold(self, collection_name: str):
+        """컬렉션을 읽는 작업(index rebuild, shared 컬렉션 복사)이 끝날 때까지 재배치에서 제외하여 release하지 않습니다."""
+        with self._lock:
+            self._usage(collection_name).holds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                usage = self._usages.get(collection_name)
+                if usage is not None:
+                    usage.holds = max(usage.holds - 1, 0)
+
+    def set_replica_numbers(self, replica_numbers: dict[str, int]):
+        """컬렉션별 load할 replica 수를 지정합니다. 지정하지 않은 컬렉션은 replica 1개로 load합니다."""
+        with self._lock:
+            for name, replica_number in replica_numbers.items():
+                self._usage(name).replica_number = replica_number
+
+    def manage(self, collection_names: list[str]):
+        """load 상태를 관리할 컬렉션(지식 컬렉션)을 등록합니다. 등록하지 않은 컬렉션은 재배치하지 않습니다."""
+        with self._lock:
+            self._managed.update(collection_names)
+
+    def start(
+        self,
+        managed: list[str] | None = None,
+        preload: list[str] | None = None,
+        replica_numbers: dict[str, int] | None = None,
+    ):
+        """
+        관리할 컬렉션을 등록하고 preload할 컬렉션을 pin한 뒤 background 재배치를 시작합니다.
+        첫 재배치에서 preload 컬렉션을 load합니다.
+        """
+        if not self._enabled or self._thread is not None:
+            return
+        self.manage([*(managed or []), *(preload or [])])
+        self.set_replica_numbers(replica_numbers or {})
+        self.pin(preload or [])
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="collection-residency", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.rebalance()
+            except Exception:
+                logger.exception("Collection residency rebalance failed")
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "collection_name": usage.name,
+                    "residency": usage.residency.value,
+                    "pinned": usage.pinned,
+                    "heat": round(usage.decayed_heat(now, self._half_life), 3),
+                    "idle_seconds": round(now - usage.last_access, 1),
+                    "memory_bytes": usage.memory_bytes,
+                    "replica_number": usage.replica_number,
+                }
+                for usage in self._usages.values()
+            ]
+
+    def rebalance(self):
+        """관리하는 컬렉션의 load 상태를 읽어 사용량 순으로 메모리 예산에 맞게 load/mmap/release합니다."""
+        with self._rebalance_lock:
+            plan = self._plan(self._discover())
+            # 메모리를 먼저 확보한 뒤 load
+            order = {Residency.RELEASED: 0, Residency.MMAP: 1, Residency.MEMORY: 2}
+            for name, residency in sorted(plan.items(), key=lambda item: order[item[1]]):
+                if self._usages[name].residency != residency:
+                    self._apply(name, residency)
+
+    def _discover(self) -> list[CollectionUsage]:
+        client = get_vector_store().client
+        with self._lock:
+            managed = set(self._managed)
+        # 지식 테이블에 없는 컬렉션(다른 애플리케이션, rebuild 임시 컬렉션)은 관리하지 않음
+        names = [
+            name for name in client.list_collections() if name in managed and not name.endswith(UNMANAGED_SUFFIXES)
+        ]
+        with self._lock:
+            for name in set(self._usages) - set(names):
+                # rebuild의 이름 교체 중에는 잠시 목록에 없으므로 hold한 컬렉션은 남겨 둠
+                if not self._usages[name].holds:
+                    del self._usages[name]
+            usages = [self._usage(name) for name in names]
+        for usage in usages:
+            usage.residency = self._current_residency(usage.name)
+            if usage.residency == Residency.MEMORY:
+                usage.memory_bytes = self._measure_memory(usage.name) or usage.memory_bytes
+            if usage.memory_bytes is None:
+                usage.memory_bytes = self._estimate_memory(usage.name)
+        return usages
+
+    def _plan(self, usages: list[CollectionUsage]) -> dict[str, Residency]:
+        now = time.monotonic()
+        plan = {}
+        used = 0
+        kept = {usage.name for usage in usages if usage.holds or self._serving(usage, now)}
+        for usage in usages:
+            if usage.name in kept:
+                # hold했거나 검색 중인 컬렉션은 현재 상태를 유지하고 메모리 사용량만 예산에 반영
+                plan[usage.name] = usage.residency
+                if usage.residency == Residency.MEMORY:
+                    used += usage.total_memory_bytes
+                elif usage.residency == Residency.MMAP:
+                    used += usage.total_memory_bytes * self._mmap_memory_ratio
+        ranked = sorted(
+            (usage for usage in usages if usage.name not in kept),
+            key=lambda usage: (usage.pinned, usage.decayed_heat(now, self._half_life)),
+            reverse=True,
+        )
+        for usage in ranked:
+            if not usage.pinned and now - usage.last_access > self._idle_timeout:
+                plan[usage.name] = Residency.RELEASED
+            elif used + usage.total_memory_bytes <= self._memory_budget:
+                plan[usage.name] = Residency.MEMORY
+                used += usage.total_memory_bytes
+            elif (
+                self._mmap_enabled
+                and used + usage.total_memory_bytes * self._mmap_memory_ratio <= self._memory_budget
+            ):
+                plan[usage.name] = Residency.MMAP
+                used += usage.total_memory_bytes * self._mmap_memory_ratio
+            else:
+                plan[usage.name] = Residency.RELEASED
+        return plan
+
+    def _serving(self, usage: CollectionUsage, now: float) -> bool:
+        """
+        load되어 있고 최근 재배치 주기 안에 검색한 컬렉션인지 여부.
+        mmap 설정을 바꾸거나 예산 때문에 내리려면 release해야 하므로, 검색 중인 컬렉션은 조용해진 뒤에 재배치합니다.
+        """
+        return usage.residency != Residency.RELEASED and now - usage.last_access < self._interval
+
+    @staticmethod
+    def _mmap_property(collection_name: str) -> bool:
+        properties = get_vector_store().describe(collection_name).get("properties", {})
+        return str(properties.get("mmap.enabled", "false")).lower() == "true"
+
+    def _current_residency(self, collection_name: str) -> Residency:
+        state = get_vector_store().client.get_load_state(collection_name)["state"]
+        if state not in (LoadState.Loaded, LoadState.Loading):
+            return Residency.RELEASED
+        return Residency.MMAP if self._mmap_property(collection_name) else Residency.MEMORY
+
+    def _apply(self, collection_name: str, residency: Residency):
+        """
+        컬렉션을 목표 상태로 바꿉니다. mmap 설정은 release된 컬렉션에서만 바꿀 수 있으므로 release → 설정 → load 순서입니다.
+        """
+        vector_store = get_vector_store()
+        client = vector_store.client
+        if client.get_load_state(collection_name)["state"] != LoadState.NotLoad:
+            client.release_collection(collection_name)
+        if residency != Residency.RELEASED:
+            use_mmap = residency == Residency.MMAP
+            if self._mmap_property(collection_name) != use_mmap:
+                vector_store.collection(collection_name).set_properties({"mmap.enabled": use_mmap})
+                vector_store.invalidate(collection_name)
+            client.load_collection(collection_name, replica_number=self._usages[collection_name].replica_number)
+        with self._lock:
+            self._usage(collection_name).residency = residency
+
+    @staticmethod
+    def _measure_memory(collection_name: str) -> int | None:
+        """load된 컬렉션의 segment별 메모리 사용량 합계 (replica 하나 기준)"""
+        segments = utility.get_query_segment_info(collection_name, using=get_vector_store().alias)
+        return sum(segment.mem_size for segment in segments) or None
+
+    @staticmethod
+    def _estimate_memory(collection_name: str) -> int:
+        """release된 컬렉션의 메모리 사용량을 행 수와 schema로 추정합니다."""
+        vector_store = get_vector_store()
+        row_count = int(vector_store.client.get_collection_stats(collection_name)["row_count"])
+        row_bytes = 0
+        for field in vector_store.describe(collection_name)["fields"]:
+            dim = int(field.get("params", {}).get("dim", 0))
+            if field["type"] == DataType.INT64:
+                row_bytes += 8
+            elif field["type"] == DataType.VARCHAR:
+                row_bytes += min(int(field.get("params", {}).get("max_length", 0)), ESTIMATED_VARCHAR_ROW_BYTES)
+            elif field["type"] == DataType.FLOAT_VECTOR:
+                row_bytes += dim * 4
+            elif field["type"] == DataType.FLOAT16_VECTOR:
+                row_bytes += dim * 2
+            elif field["type"] == DataType.BINARY_VECTOR:
+                row_bytes += dim // 8
+            elif field["type"] == DataType.SPARSE_FLOAT_VECTOR:
+                row_bytes += ESTIMATED_SPARSE_ROW_BYTES
+        return row_count * row_bytes
+
+
+@lru_cache
+def get_collection_residency() -> CollectionResidencyManager:
+    return CollectionResidencyManager(
+        enabled=settings.MILVUS_RESIDENCY_ENABLED,
+        memory_budget=settings.MILVUS_RESIDENCY_MEMORY_BUDGET,
+        interval=settings.MILVUS_RESIDENCY_INTERVAL,
+        idle_timeout=settings.MILVUS_RESIDENCY_IDLE_TIMEOUT,
+        half_life=settings.MILVUS_RESIDENCY_HALF_LIFE,
+        mmap_enabled=settings.MILVUS_RESIDENCY_MMAP_ENABLED,
+        mmap_memory_ratio=settings.MILVUS_RESIDENCY_MMAP_MEMORY_RATIO,
+        warm_wait=settings.MILVUS_RESIDENCY_WARM_WAIT,
+    )
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from config.settings import get_settings
+from db.models import Model
+from util.embedding import EmbeddingModelHolder, get_embedding_model_holder
+from util.embedding_backend import SentenceTransformerModel
+
+# model_format id (routers/model.py 참고)
+SENTENCE_TRANSFORMERS_FORMAT_ID = 2
+BGE_M3_FORMAT_ID = 4
+EMBEDDING_FORMAT_IDS = (SENTENCE_TRANSFORMERS_FORMAT_ID, BGE_M3_FORMAT_ID)
+
+
+def _load_sentence_transformers(model_uri: str):
+    from util.model_registry import ModelLoader
+
+    return SentenceTransformerModel(ModelLoader.load_sentence_transformers(model_uri))
+
+
+def _load_bge_m3(model_uri: str):
+    from util.model_registry import ModelLoader
+
+    # BGEEmbeddingWrapper로 등록된 pyfunc 모델에서 BGEM3FlagModel을 꺼내 사용
+    return ModelLoader.load_pyfunc(model_uri).unwrap_python_model().model
+
+
+def is_embedding_model(model: Model | None) -> bool:
+    """model registry에 등록된 임베딩 모델(sentence-transformers, bge-m3)인지 확인합니다."""
+    return model is not None and model.model_format_id in EMBEDDING_FORMAT_IDS and model.model_registry is not None
+
+
+class EmbedderPool:
+    """
+    knowledge별 임베딩 모델을 model registry에서 로드하여 공유하는 pool.
+
+    같은 모델을 사용하는 요청은 하나의 holder를 공유하며, `use`로 사용 중인 동안 reference count를 올립니다.
+    로드된 모델 수가 `max_models`를 넘으면 사용 중이 아닌 모델부터 오래된 순으로 해제합니다.
+    """
+
+    def __init__(self, max_models: int):
+        self._max_models = max_models
+        self._holders: OrderedDict[str, EmbeddingModelHolder] = OrderedDict()
+        self._ref_counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_holder(model: Model) -> EmbeddingModelHolder:
+        model_uri = model.model_registry.model_uri
+        model_id = f"registry:{model.id}:{model_uri}"
+        if model.model_format_id == SENTENCE_TRANSFORMERS_FORMAT_ID:
+            return EmbeddingModelHolder(
+                model_id,
+                lambda: _load_sentence_transformers(model_uri),
+                supports_sparse=False,
+                supports_colbert=False,
+            )
+        return EmbeddingModelHolder(model_id, lambda: _load_bge_m3(model_uri))
+
+    def acquire(self, model: Model | None) -> EmbeddingModelHolder:
+        """
+        모델에 해당하는 holder를 가져오고 reference count를 올립니다.
+
+        Args:
+            model (Model | None): knowledge에 연결된 모델. 임베딩 모델이 아니면 기본 BGE-M3 모델을 사용합니다.
+
+        Returns:
+            EmbeddingModelHolder: 모델 holder. 사용이 끝나면 `release`를 호출해야 합니다.
+        """
+        if not is_embedding_model(model):
+            return get_embedding_model_holder()
+        holder = self._create_holder(model)
+        with self._lock:
+            holder = self._holders.setdefault(holder.model_id, holder)
+            self._holders.move_to_end(holder.model_id)
+            self._ref_counts[holder.model_id] = self._ref_counts.get(holder.model_id, 0) + 1
+            self._evict()
+        return holder
+
+    def release(self, holder: EmbeddingModelHolder):
+        with self._lock:
+            if holder.model_id not in self._ref_counts:
+                return
+            self._ref_counts[holder.model_id] -= 1
+            self._evict()
+
+    @contextmanager
+    def use(self, model: Model | None):
+        holder = self.acquire(model)
+        try:
+            yield holder
+        finally:
+            self.release(holder)
+
+    def _evict(self):
+        idle = [model_id for model_id in self._holders if self._ref_counts[model_id] <= 0]
+        while len(self._holders) > self._max_models and idle:
+            model_id = idle.pop(0)
+            self._holders.pop(model_id).unload()
+            del self._ref_counts[model_id]
+
+
+@lru_cache
+def get_embedder_pool() -> EmbedderPool:
+    return EmbedderPool(get_settings().EMBEDDER_POOL_MAX_MODELS)
@@ -1,31 +1,278 @@
-from FlagEmbedding import BGEM3FlagModel
+import threading
+from enum import Enum
+from functools import lru_cache, partial
+from typing import Any, Callable
+
+import numpy as np
+from config.settings import get_settings
+from util.batching import encode_bucketed
+from util.embedding_backend import EmbeddingBackend, load_bgem3_model
+from util.embedding_cache import get_embedding_cache, make_cache_key
+from util.embedding_pool import get_embedding_pool
+
+settings = get_settings()
+
+
+class ModelState(str, Enum):
+    IDLE = "idle"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class EmbeddingModelHolder:
+    """
+    임베딩 모델을 import 시점이 아닌 처음 사용하는 시점에 로드하는 holder.
+
+    `warmup`으로 앱 시작 시 미리 로드할 수 있고, `state`로 모델이 사용 가능한지 확인할 수 있습니다.
+    기본 BGE-M3 모델과 model registry에 등록된 임베딩 모델 모두 `loader`만 달리하여 같은 holder를 사용합니다.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        loader: Callable[[], Any],
+        *,
+        supports_sparse: bool = True,
+        supports_colbert: bool = True,
+    ):
+        """
+        Args:
+            model_id (str): 캐시 key 등에 사용하는 모델 식별자.
+            loader (Callable[[], Any]): `tokenizer`와 BGEM3FlagModel 형식의 `encode`를 제공하는 모델을 반환하는 함수.
+            supports_sparse (bool): sparse(lexical weight) vector 지원 여부.
+            supports_colbert (bool): colbert(multi-vector) vector 지원 여부.
+        """
+        self._model_id = model_id
+        self._loader = loader
+        self._supports_sparse = supports_sparse
+        self._supports_colbert = supports_colbert
+        self._model = None
+        self._dimension: int | None = None
+        self._state = ModelState.IDLE
+        self._error: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    @property
+    def supports_sparse(self) -> bool:
+        return self._supports_sparse
+
+    @property
+    def supports_colbert(self) -> bool:
+        return self._supports_colbert
+
+    @property
+    def state(self) -> ModelState:
+        return self._state
+
+    @property
+    def error(self) -> str | None:
+        return self._error
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state == ModelState.READY
+
+    @property
+    def dimension(self) -> int:
+        """dense vector 차원. 짧은 입력을 한 번 인코딩하여 확인합니다."""
+        if self._dimension is None:
+            encoded = self.get().encode(["dimension"], batch_size=1, max_length=16, return_dense=True)
+            self._dimension = int(np.asarray(encoded["dense_vecs"]).shape[-1])
+        return self._dimension
+
+    def count_tokens(self, texts: list[str]) -> list[int]:
+        """텍스트별 token 수 (special token 제외)"""
+        if not texts:
+            return []
+        encoded = self.get().tokenizer(texts, add_special_tokens=False, truncation=False)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def get(self):
+        """로드된 모델을 반환합니다. 아직 로드되지 않았다면 현재 스레드에서 로드합니다."""
+        if self._model is not None:
+            return self._model
+        with self._lock:
+            if self._model is None:
+                self._state = ModelState.LOADING
+                try:
+                    self._model = self._loader()
+                except Exception as e:
+                    self._state = ModelState.FAILED
+                    self._error = str(e)
+                    raise
+                self._state = ModelState.READY
+                self._error = None
+        return self._model
+
+    def unload(self):
+        """로드된 모델을 해제합니다. 다음 `get` 호출 시 다시 로드합니다."""
+        with self._lock:
+            self._model = None
+            self._state = ModelState.IDLE
+
+    def warmup(self):
+        """모델을 로드하고 짧은 입력으로 한 번 인코딩하여 첫 요청의 지연을 없앱니다."""
+        model = self.get()
+        model.encode(["warmup"], batch_size=1, max_length=16, return_dense=True, return_sparse=self._supports_sparse)
+
+    def warmup_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self._safe_warmup, name="embedding-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _safe_warmup(self):
+        try:
+            self.warmup()
+        except Exception as e:
+            self._state = ModelState.FAILED
+            self._error = str(e)
+
+
+@lru_cache
+def get_embedding_model_holder() -> EmbeddingModelHolder:
+    """설정(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND)에 지정된 기본 BGE-M3 모델 holder"""
+    backend = EmbeddingBackend(settings.EMBEDDING_BACKEND)
+    return EmbeddingModelHolder(
+        f"{settings.EMBEDDING_MODEL_NAME}:{backend.value}",
+        partial(
+            load_bgem3_model,
+            settings.EMBEDDING_MODEL_NAME,
+            backend,
+            use_fp16=settings.EMBEDDING_USE_FP16,
+            onnx_path=settings.EMBEDDING_ONNX_PATH,
+        ),
+        # onnx graph는 colbert vector를 출력하지 않음
+        supports_colbert=backend != EmbeddingBackend.ONNX,
+    )
+
+
+# encode 옵션 이름 → encode 결과 key
+OUTPUT_FIELDS = {
+    "return_dense": "dense_vecs",
+    "return_sparse": "lexical_weights",
+    "return_colbert_vecs": "colbert_vecs",
+}
+# colbert vector는 길이가 가변인 multi-vector라 캐시하지 않음
+UNCACHED_FIELDS = ("colbert_vecs",)
+
+
+def encode_texts(
+    text: list[str],
+    *,
+    return_dense: bool = True,
+    return_sparse: bool = True,
+    return_colbert_vecs: bool = False,
+    embedder: EmbeddingModelHolder | None = None,
+) -> dict:
+    """
+    캐시를 거치지 않고 현재 프로세스의 임베딩 모델로 요청한 출력만 인코딩합니다.
+    `embedder`를 지정하지 않으면 기본 BGE-M3 모델을 사용합니다.
+    """
+    embedder = embedder or get_embedding_model_holder()
+    return encode_bucketed(
+        embedder.get(),
+        text,
+        max_length=settings.EMBEDDING_MAX_LENGTH,
+        token_budget=settings.EMBEDDING_TOKEN_BUDGET,
+        max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+        return_dense=return_dense,
+        return_sparse=return_sparse,
+        return_colbert_vecs=return_colbert_vecs,
+    )
 
 
 class BGEM3Embedding:
-    _model = BGEM3FlagModel("BAAI/bge-m3", use_fp16=False)
+    def __init__(
+        self,
+        text: list[str],
+        *,
+        return_dense: bool = True,
+        return_sparse: bool = True,
+        return_colbert_vecs: bool = False,
+        embedder: EmbeddingModelHolder | None = None,
+    ):
+        """
+        Args:
+            text (list[str]): 임베딩할 텍스트 목록.
+            return_dense (bool): dense vector 계산 여부.
+            return_sparse (bool): sparse(lexical weight) vector 계산 여부.
+            return_colbert_vecs (bool): colbert multi-vector 계산 여부.
+            embedder (EmbeddingModelHolder | None): 사용할 임베딩 모델. None이면 기본 BGE-M3 모델.
+        """
+        self._embedder = embedder or get_embedding_model_holder()
+        fields = tuple(
+            field
+            for field, requested in zip(OUTPUT_FIELDS.values(), (return_dense, return_sparse, return_colbert_vecs))
+            if requested
+        )
+        self._embeddings = self.get_embeddings(text, fields)
 
-    def __init__(self, text: list[str]):
-        self._embeddings = self.get_embeddings(text)
+    @classmethod
+    def from_embeddings(cls, embeddings: dict) -> "BGEM3Embedding":
+        """이미 인코딩된 결과(dense_vecs, lexical_weights)로 인스턴스를 생성합니다."""
+        instance = cls.__new__(cls)
+        instance._embeddings = embeddings
+        return instance
 
-    def get_embeddings(self, text: list[str]):
+    def get_embeddings(self, text: list[str], fields: tuple[str, ...] = ("dense_vecs", "lexical_weights")):
         """
         참고 : https://huggingface.co/BAAI/bge-m3
+
+        (model id, max_length, text) 기준으로 캐시를 조회하고, 캐시에 없는 텍스트·출력만 모델로 인코딩한 뒤
+        입력 순서대로 결과를 합쳐 반환합니다. 요청하지 않은 출력은 None으로 반환합니다.
         """
+        cache = get_embedding_cache()
+        keys = [make_cache_key(self._embedder.model_id, settings.EMBEDDING_MAX_LENGTH, item) for item in text]
+        entries = {key: entry or {} for key, entry in zip(keys, cache.get_many(keys, fields))}
 
-        # TODO: 고도화시 속성값 받아올 수 있도록 변경
-        return self._model.encode(
-            text,
-            batch_size=12,
-            max_length=8192,
-            return_dense=True,
-            return_sparse=True,
-            return_colbert_vecs=False,
-        )
+        # 비어 있는 출력 조합별로 묶어서 인코딩 (같은 요청 안에서 반복되는 텍스트도 한 번만 인코딩)
+        groups: dict[tuple[str, ...], dict[str, str]] = {}
+        for key, item in zip(keys, text):
+            missing_fields = tuple(field for field in fields if field not in entries[key])
+            if missing_fields:
+                groups.setdefault(missing_fields, {})[key] = item
+
+        for missing_fields, missing in groups.items():
+            flags = {name: field in missing_fields for name, field in OUTPUT_FIELDS.items()}
+            encoded = self._encode(list(missing.values()), **flags)
+            for index, key in enumerate(missing.keys()):
+                entries[key] = {**entries[key], **{field: encoded[field][index] for field in missing_fields}}
+            cache.put_many(
+                {
+                    key: {field: value for field, value in entries[key].items() if field not in UNCACHED_FIELDS}
+                    for key in missing.keys()
+                }
+            )
+
+        ordered = [entries[key] for key in keys]
+        result = {field: None for field in OUTPUT_FIELDS.values()}
+        for field in fields:
+            result[field] = [entry[field] for entry in ordered]
+        if result["dense_vecs"] is not None:
+            result["dense_vecs"] = np.stack(result["dense_vecs"]) if ordered else np.empty((0, 0))
+        return result
+
+    def _encode(self, text: list[str], **flags):
+        # 대용량 입력(파일 ingestion)은 process pool로 나누어 인코딩 (pool worker는 기본 모델만 로드)
+        pool = get_embedding_pool()
+        is_default = self._embedder is get_embedding_model_holder()
+        if pool is not None and is_default and len(text) > settings.EMBEDDING_POOL_SHARD_SIZE:
+            return pool.encode(text, **flags)
+        return encode_texts(text, embedder=self._embedder, **flags)
 
     @property
     def dense_vector(self):
-        return self._embeddings["dense_vecs"]
+        return self._embeddings.get("dense_vecs")
 
     @property
     def sparse_vector(self):
-        return self._embeddings["lexical_weights"]
+        return self._embeddings.get("lexical_weights")
+
+    @property
+    def colbert_vector(self):
+        return self._embeddings.get("colbert_vecs")
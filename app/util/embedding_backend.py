@@ -0,0 +1,233 @@
+import argparse
+from enum import Enum
+from typing import Any
+
+import numpy as np
+
+
+class EmbeddingBackend(str, Enum):
+    TORCH = "torch"  # FlagEmbedding BGEM3FlagModel (fp32/fp16 PyTorch)
+    TORCH_INT8 = "torch-int8"  # PyTorch dynamic int8 quantization (CPU)
+    ONNX = "onnx"  # export된 ONNX graph를 onnxruntime으로 실행 (CPU)
+
+
+def load_bgem3_model(
+    model_name: str,
+    backend: EmbeddingBackend | str = EmbeddingBackend.TORCH,
+    *,
+    use_fp16: bool = False,
+    onnx_path: str | None = None,
+):
+    """
+    backend 설정에 맞는 BGE-M3 모델을 로드합니다.
+
+    반환되는 모델은 모두 `tokenizer` 속성과 BGEM3FlagModel.encode와 같은 형식의 `encode` 메서드를 제공합니다.
+
+    Args:
+        model_name (str): HuggingFace repo id 또는 로컬 경로.
+        backend (EmbeddingBackend | str): 사용할 backend.
+        use_fp16 (bool): torch backend에서 fp16 사용 여부.
+        onnx_path (str | None): onnx backend에서 사용할 ONNX 파일 경로.
+
+    Returns:
+        BGEM3FlagModel | OnnxBGEM3Model: 로드된 모델.
+    """
+    backend = EmbeddingBackend(backend)
+    if backend == EmbeddingBackend.ONNX:
+        if not onnx_path:
+            raise ValueError("onnx backend requires EMBEDDING_ONNX_PATH")
+        return OnnxBGEM3Model(model_name, onnx_path)
+
+    from FlagEmbedding import BGEM3FlagModel
+
+    if backend == EmbeddingBackend.TORCH_INT8:
+        import torch
+
+        model = BGEM3FlagModel(model_name, use_fp16=False, device="cpu")
+        model.model = torch.quantization.quantize_dynamic(model.model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+    return BGEM3FlagModel(model_name, use_fp16=use_fp16)
+
+
+class OnnxBGEM3Model:
+    """
+    `export_bgem3_onnx`로 export한 graph를 onnxruntime으로 실행하는 BGE-M3 모델.
+
+    graph는 (input_ids, attention_mask)를 입력으로 받아 정규화된 CLS dense vector와
+    token별 sparse weight를 출력하며, lexical weight 후처리는 FlagEmbedding과 동일하게 수행합니다.
+    colbert vector는 지원하지 않습니다.
+    """
+
+    def __init__(self, model_name: str, onnx_path: str, *, intra_op_num_threads: int = 0):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError("onnx backend requires `onnxruntime` to be installed") from e
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_num_threads
+        self._session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self._unused_tokens = {
+            token_id
+            for token_id in (
+                self.tokenizer.cls_token_id,
+                self.tokenizer.eos_token_id,
+                self.tokenizer.pad_token_id,
+                self.tokenizer.unk_token_id,
+            )
+            if token_id is not None
+        }
+
+    def encode(
+        self,
+        sentences: list[str] | str,
+        batch_size: int = 12,
+        max_length: int = 8192,
+        return_dense: bool = True,
+        return_sparse: bool = False,
+        return_colbert_vecs: bool = False,
+    ) -> dict[str, Any]:
+        if return_colbert_vecs:
+            raise ValueError("onnx backend does not support colbert vectors")
+        input_was_string = isinstance(sentences, str)
+        if input_was_string:
+            sentences = [sentences]
+
+        dense_vecs, lexical_weights = [], []
+        for start in range(0, len(sentences), batch_size):
+            inputs = self.tokenizer(
+                sentences[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=max_length,
+                return_tensors="np",
+            )
+            input_ids = inputs["input_ids"].astype(np.int64)
+            attention_mask = inputs["attention_mask"].astype(np.int64)
+            dense, sparse = self._session.run(None, {"input_ids": input_ids, "attention_mask": attention_mask})
+            if return_dense:
+                dense_vecs.append(dense)
+            if return_sparse:
+                lexical_weights.extend(self._process_token_weights(sparse, input_ids, attention_mask))
+
+        result = {
+            "dense_vecs": np.concatenate(dense_vecs, axis=0) if return_dense else None,
+            "lexical_weights": lexical_weights if return_sparse else None,
+            "colbert_vecs": None,
+        }
+        if input_was_string:
+            result = {key: value[0] if value is not None else None for key, value in result.items()}
+        return result
+
+    def _process_token_weights(
+        self, token_weights: np.ndarray, input_ids: np.ndarray, attention_mask: np.ndarray
+    ) -> list[dict[str, np.float32]]:
+        results = []
+        for weights, ids, mask in zip(token_weights, input_ids, attention_mask):
+            result: dict[str, np.float32] = {}
+            for weight, token_id in zip(weights[mask > 0], ids[mask > 0].tolist()):
+                if token_id in self._unused_tokens or weight <= 0:
+                    continue
+                key = str(token_id)
+                if weight > result.get(key, 0):
+                    result[key] = weight
+            results.append(result)
+        return results
+
+
+class SentenceTransformerModel:
+    """
+    sentence-transformers 모델을 BGEM3FlagModel.encode와 같은 형식으로 감싸는 adapter.
+
+    dense vector만 제공하며, dense vector는 BGE-M3와 마찬가지로 L2 정규화하여 반환합니다.
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self.tokenizer = model.tokenizer
+
+    def encode(
+        self,
+        sentences: list[str] | str,
+        batch_size: int = 12,
+        max_length: int = 512,
+        return_dense: bool = True,
+        return_sparse: bool = False,
+        return_colbert_vecs: bool = False,
+    ) -> dict[str, Any]:
+        if return_sparse or return_colbert_vecs:
+            raise ValueError("sentence-transformers models only support dense vectors")
+        # 최대 길이는 모델의 max_seq_length를 따르며 max_length는 batch 구성에만 사용됨
+        dense_vecs = self._model.encode(
+            sentences, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return {"dense_vecs": dense_vecs, "lexical_weights": None, "colbert_vecs": None}
+
+
+def export_bgem3_onnx(model_name: str, output_path: str, *, opset: int = 17, quantize: bool = False) -> str:
+    """
+    BGE-M3 모델을 dense/sparse 출력을 갖는 ONNX graph로 export합니다.
+
+    Args:
+        model_name (str): HuggingFace repo id 또는 로컬 경로.
+        output_path (str): 저장할 ONNX 파일 경로.
+        opset (int): ONNX opset 버전.
+        quantize (bool): True이면 onnxruntime dynamic int8 quantization을 추가로 적용합니다.
+
+    Returns:
+        str: 최종 ONNX 파일 경로.
+    """
+    import torch
+    from FlagEmbedding import BGEM3FlagModel
+
+    flag_model = BGEM3FlagModel(model_name, use_fp16=False, device="cpu")
+
+    class _BGEM3OnnxModule(torch.nn.Module):
+        def __init__(self, inference_model):
+            super().__init__()
+            self.encoder = inference_model.model
+            self.sparse_linear = inference_model.sparse_linear
+
+        def forward(self, input_ids, attention_mask):
+            hidden_state = self.encoder(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+            dense = torch.nn.functional.normalize(hidden_state[:, 0], dim=-1)
+            sparse = torch.relu(self.sparse_linear(hidden_state)).squeeze(-1)
+            return dense, sparse
+
+    module = _BGEM3OnnxModule(flag_model.model).eval()
+    sample = flag_model.tokenizer(["BGE-M3 onnx export"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            (sample["input_ids"], sample["attention_mask"]),
+            output_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["dense", "sparse"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "dense": {0: "batch"},
+                "sparse": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = output_path.replace(".onnx", ".int8.onnx")
+        quantize_dynamic(output_path, quantized_path, weight_type=QuantType.QInt8)
+        return quantized_path
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export BGE-M3 to ONNX for the onnx embedding backend")
+    parser.add_argument("--model-name", default="BAAI/bge-m3")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--quantize", action="store_true")
+    args = parser.parse_args()
+    print(export_bgem3_onnx(args.model_name, args.output, opset=args.opset, quantize=args.quantize))
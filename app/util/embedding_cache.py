@@ -0,0 +1,201 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from config.settings import get_settings
+
+EmbeddingEntry = dict[str, Any]
+
+
+def make_cache_key(model_id: str, max_length: int, text: str) -> str:
+    """
+    (model id, max_length, text) 조합으로 content-addressed cache key를 생성합니다.
+
+    Args:
+        model_id (str): 임베딩 모델 식별자.
+        max_length (int): 인코딩 시 사용한 최대 토큰 길이.
+        text (str): 임베딩 대상 텍스트.
+
+    Returns:
+        str: sha256 hex digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"{model_id}\x00{max_length}\x00".encode("utf-8"))
+    hasher.update(text.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+class LRUEmbeddingCache:
+    """프로세스 메모리에 최근 사용한 임베딩을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, EmbeddingEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> EmbeddingEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: EmbeddingEntry):
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskEmbeddingCache:
+    """
+    디스크 기반 임베딩 캐시.
+
+    dense vector는 차원별 float32 파일(`dense_{dim}.f32`)에 행 단위로 기록하고 memory-map으로 읽습니다.
+    key → 행 번호와 sparse vector(token id int32 + weight float32를 이어붙인 blob)는 sqlite에 저장합니다.
+    여러 worker 프로세스가 같은 디렉터리를 공유할 수 있도록 행 번호는 sqlite 트랜잭션에서 할당하고,
+    dense 파일은 `os.pwrite`로만 기록하여 파일이 줄어드는 일이 없도록 합니다.
+    """
+
+    def __init__(self, directory: str | Path):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self._directory / "index.sqlite3", check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, dim INTEGER, row INTEGER, sparse BLOB)"
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS counters (dim INTEGER PRIMARY KEY, next_row INTEGER)")
+        self._dense_maps: dict[int, np.memmap] = {}
+
+    def _dense_path(self, dim: int) -> Path:
+        return self._directory / f"dense_{dim}.f32"
+
+    def _read_dense(self, dim: int, row: int) -> np.ndarray | None:
+        dense_map = self._dense_maps.get(dim)
+        if dense_map is None or dense_map.shape[0] <= row:
+            path = self._dense_path(dim)
+            rows = path.stat().st_size // (dim * 4) if path.exists() else 0
+            if rows <= row:
+                return None
+            dense_map = np.memmap(path, dtype=np.float32, mode="r", shape=(rows, dim))
+            self._dense_maps[dim] = dense_map
+        return np.array(dense_map[row])
+
+    @staticmethod
+    def _pack_sparse(weights: dict) -> bytes:
+        token_ids = np.fromiter((int(token) for token in weights.keys()), dtype="<i4", count=len(weights))
+        values = np.fromiter((float(value) for value in weights.values()), dtype="<f4", count=len(weights))
+        return token_ids.tobytes() + values.tobytes()
+
+    @staticmethod
+    def _unpack_sparse(blob: bytes) -> dict:
+        size = len(blob) // 8
+        token_ids = np.frombuffer(blob, dtype="<i4", count=size)
+        values = np.frombuffer(blob, dtype="<f4", count=size, offset=size * 4)
+        return {str(token): value for token, value in zip(token_ids.tolist(), values)}
+
+    def get(self, key: str) -> EmbeddingEntry | None:
+        with self._lock:
+            row = self._connection.execute("SELECT dim, row, sparse FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            dim, dense_row, sparse_blob = row
+            entry: EmbeddingEntry = {}
+            if dense_row is not None:
+                dense = self._read_dense(dim, dense_row)
+                if dense is not None:
+                    entry["dense_vecs"] = dense
+            if sparse_blob is not None:
+                entry["lexical_weights"] = self._unpack_sparse(sparse_blob)
+            return entry or None
+
+    def put(self, key: str, entry: EmbeddingEntry):
+        """
+        entry를 저장합니다. 이미 저장된 key라면 비어 있는 출력(dense/sparse)만 채웁니다.
+        """
+        dense = entry.get("dense_vecs")
+        sparse_blob = self._pack_sparse(entry["lexical_weights"]) if entry.get("lexical_weights") is not None else None
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                existing = cursor.execute("SELECT dim, row, sparse FROM entries WHERE key = ?", (key,)).fetchone()
+                dim, dense_row, stored_sparse = existing if existing else (None, None, None)
+                if dense is not None and dense_row is None:
+                    dense = np.ascontiguousarray(dense, dtype=np.float32)
+                    dim = dense.shape[-1]
+                    dense_row = self._write_dense(cursor, dense)
+                if stored_sparse is None:
+                    stored_sparse = sparse_blob
+                cursor.execute(
+                    "INSERT OR REPLACE INTO entries (key, dim, row, sparse) VALUES (?, ?, ?, ?)",
+                    (key, dim, dense_row, stored_sparse),
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def _write_dense(self, cursor: sqlite3.Cursor, dense: np.ndarray) -> int:
+        dim = dense.shape[-1]
+        counter = cursor.execute("SELECT next_row FROM counters WHERE dim = ?", (dim,)).fetchone()
+        dense_row = counter[0] if counter else 0
+        cursor.execute("INSERT OR REPLACE INTO counters (dim, next_row) VALUES (?, ?)", (dim, dense_row + 1))
+        fd = os.open(self._dense_path(dim), os.O_RDWR | os.O_CREAT)
+        try:
+            os.pwrite(fd, dense.tobytes(), dense_row * dim * 4)
+        finally:
+            os.close(fd)
+        return dense_row
+
+
+class EmbeddingCache:
+    """메모리 LRU 캐시와 선택적인 디스크 캐시를 묶은 2단 캐시"""
+
+    def __init__(self, max_size: int, directory: str | Path | None = None):
+        self._memory = LRUEmbeddingCache(max_size)
+        self._disk = DiskEmbeddingCache(directory) if directory else None
+
+    def get_many(self, keys: list[str], fields: tuple[str, ...]) -> list[EmbeddingEntry | None]:
+        """
+        key별 캐시 entry를 조회합니다. 메모리 entry에 `fields` 중 없는 출력이 있으면 디스크 캐시와 합칩니다.
+        반환되는 entry는 일부 출력만 가지고 있을 수 있습니다.
+        """
+        entries = []
+        for key in keys:
+            entry = self._memory.get(key)
+            if self._disk is not None and (entry is None or any(field not in entry for field in fields)):
+                disk_entry = self._disk.get(key)
+                if disk_entry is not None:
+                    entry = {**disk_entry, **(entry or {})}
+                    self._memory.put(key, entry)
+            entries.append(entry)
+        return entries
+
+    def put_many(self, items: dict[str, EmbeddingEntry]):
+        for key, entry in items.items():
+            self._memory.put(key, entry)
+            if self._disk is not None:
+                self._disk.put(key, entry)
+
+
+@lru_cache
+def get_embedding_cache() -> EmbeddingCache:
+    settings = get_settings()
+    return EmbeddingCache(settings.EMBEDDING_CACHE_SIZE, settings.EMBEDDING_CACHE_DIR)
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+def _initialize_worker(num_threads: int):
+    """
+    worker 프로세스 초기화: torch thread 수를 고정하고 worker 전용 임베딩 모델을 로드합니다.
+
+    thread 수 환경변수는 torch import 전에 설정해야 OpenMP/MKL에도 반영됩니다.
+    """
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = str(num_threads)
+
+    import torch
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    from util.embedding import get_embedding_model_holder
+
+    get_embedding_model_holder().get()
+
+
+def _encode_shard(texts: list[str], flags: dict[str, bool]) -> dict:
+    from util.embedding import encode_texts
+
+    return encode_texts(texts, **flags)
+
+
+class EmbeddingProcessPool:
+    """
+    여러 프로세스에 임베딩 모델을 하나씩 띄워 대용량 텍스트를 shard 단위로 나누어 인코딩하는 pool.
+
+    각 worker는 자체 모델 복사본과 고정된 torch thread 수를 가지며, 결과는 입력 순서대로 합쳐집니다.
+    """
+
+    def __init__(self, num_workers: int, *, threads_per_worker: int = 1, shard_size: int = 64):
+        self._num_workers = num_workers
+        self._threads_per_worker = threads_per_worker
+        self._shard_size = shard_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._num_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize_worker,
+                    initargs=(self._threads_per_worker,),
+                )
+            return self._executor
+
+    def encode(self, texts: list[str], **flags) -> dict:
+        """
+        텍스트를 shard로 나누어 worker들에서 인코딩한 뒤 입력 순서대로 합칩니다.
+
+        Args:
+            texts (list[str]): 인코딩할 텍스트 목록.
+            **flags: `return_dense`, `return_sparse`, `return_colbert_vecs` encode 옵션.
+
+        Returns:
+            dict: dense_vecs(np.ndarray), lexical_weights(list[dict]), colbert_vecs(list) 중 요청한 출력.
+        """
+        shards = [texts[start : start + self._shard_size] for start in range(0, len(texts), self._shard_size)]
+        results = list(self._get_executor().map(_encode_shard, shards, [flags] * len(shards)))
+        merged = {}
+        for field in ("dense_vecs", "lexical_weights", "colbert_vecs"):
+            if results[0].get(field) is None:
+                continue
+            merged[field] = [value for result in results for value in result[field]]
+        if "dense_vecs" in merged:
+            merged["dense_vecs"] = np.stack(merged["dense_vecs"])
+        return merged
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_pool: EmbeddingProcessPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_embedding_pool() -> EmbeddingProcessPool | None:
+    """EMBEDDING_POOL_WORKERS가 1 이상이면 공유 process pool을, 아니면 None을 반환합니다."""
+    global _pool
+    if settings.EMBEDDING_POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = EmbeddingProcessPool(
+                settings.EMBEDDING_POOL_WORKERS,
+                threads_per_worker=settings.EMBEDDING_POOL_THREADS_PER_WORKER,
+                shard_size=settings.EMBEDDING_POOL_SHARD_SIZE,
+            )
+        return _pool
+
+
+def shutdown_embedding_pool():
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
@@ -0,0 +1,145 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+
+import numpy as np
+from config.settings import get_settings
+from util.embedding import OUTPUT_FIELDS, BGEM3Embedding, EmbeddingModelHolder
+
+
+class EmbeddingBatcher:
+    """
+    동시에 들어오는 임베딩 요청을 짧은 시간 동안 모아 한 번의 batch encode로 처리하는 scheduler.
+
+    각 요청은 `embed`를 호출한 스레드에서 결과를 기다리고, 단일 worker 스레드가 큐에서 요청을 꺼내
+    `max_wait_ms` 동안 또는 텍스트 수가 `max_batch_size`에 도달할 때까지 모은 뒤 인코딩합니다.
+    인코딩 결과(dense/sparse)는 요청 순서대로 잘라 각 호출자에게 돌려줍니다.
+    텍스트가 `max_batch_size`보다 많은 요청은 `max_batch_size`개씩 나누어 하나씩 차례로 큐에 넣으므로,
+    큰 요청(bulk 임베딩, 튜닝 query 집합)을 인코딩하는 동안 들어온 검색 query는 다음 조각보다 먼저 처리됩니다.
+    batch 안에서는 같은 임베딩 모델을 사용하는 요청끼리 묶어, 요청들이 필요로 하는 출력의 합집합만 계산합니다.
+    """
+
+    def __init__(self, max_wait_ms: float, max_batch_size: int):
+        self._max_wait = max_wait_ms / 1000
+        self._max_batch_size = max_batch_size
+        self._queue: queue.Queue[tuple[list[str], EmbeddingModelHolder | None, dict[str, bool], Future]] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def embed(
+        self,
+        texts: list[str],
+        *,
+        return_dense: bool = True,
+        return_sparse: bool = True,
+        return_colbert_vecs: bool = False,
+        embedder: EmbeddingModelHolder | None = None,
+    ) -> BGEM3Embedding:
+        """
+        텍스트 목록을 batch 큐에 넣고 인코딩 결과를 기다립니다.
+
+        Args:
+            texts (list[str]): 임베딩할 텍스트 목록.
+            return_dense (bool): dense vector 계산 여부.
+            return_sparse (bool): sparse vector 계산 여부.
+            return_colbert_vecs (bool): colbert multi-vector 계산 여부.
+            embedder (EmbeddingModelHolder | None): 사용할 임베딩 모델. None이면 기본 BGE-M3 모델.
+
+        Returns:
+            BGEM3Embedding: 입력 텍스트에 해당하는 임베딩 결과. 요청하지 않은 출력은 None.
+        """
+        flags = dict(zip(OUTPUT_FIELDS, (return_dense, return_sparse, return_colbert_vecs)))
+        if not texts:
+            return BGEM3Embedding(texts, embedder=embedder, **flags)
+        self._ensure_worker()
+        if len(texts) <= self._max_batch_size:
+            return BGEM3Embedding.from_embeddings(self._submit(texts, embedder, flags))
+        # 다음 조각은 앞 조각이 끝난 뒤에 넣어, 그 사이에 큐에 들어온 요청이 먼저 인코딩되도록 함
+        parts = [
+            self._submit(texts[start : start + self._max_batch_size], embedder, flags)
+            for start in range(0, len(texts), self._max_batch_size)
+        ]
+        return BGEM3Embedding.from_embeddings(
+            {
+                field: None if parts[0][field] is None else self._concat([part[field] for part in parts])
+                for field in OUTPUT_FIELDS.values()
+            }
+        )
+
+    def _submit(self, texts: list[str], embedder: EmbeddingModelHolder | None, flags: dict[str, bool]) -> dict:
+        future: Future = Future()
+        self._queue.put((texts, embedder, flags, future))
+        return future.result()
+
+    @staticmethod
+    def _concat(values: list):
+        if isinstance(values[0], np.ndarray):
+            return np.concatenate(values)
+        return [item for value in values for item in value]
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list[tuple[list[str], EmbeddingModelHolder | None, dict[str, bool], Future]]:
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self._max_wait
+        while size < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            groups: dict[str | None, list] = {}
+            for item in batch:
+                embedder = item[1]
+                groups.setdefault(embedder.model_id if embedder is not None else None, []).append(item)
+            for group in groups.values():
+                self._encode_group(group)
+
+    @staticmethod
+    def _encode_group(group: list[tuple[list[str], EmbeddingModelHolder | None, dict[str, bool], Future]]):
+        texts = [text for request_texts, _, _, _ in group for text in request_texts]
+        flags = {name: any(request_flags[name] for _, _, request_flags, _ in group) for name in OUTPUT_FIELDS}
+        try:
+            embeddings = BGEM3Embedding(texts, embedder=group[0][1], **flags)
+        except Exception as e:
+            for _, _, _, future in group:
+                future.set_exception(e)
+            return
+
+        outputs = {
+            "dense_vecs": embeddings.dense_vector,
+            "lexical_weights": embeddings.sparse_vector,
+            "colbert_vecs": embeddings.colbert_vector,
+        }
+        offset = 0
+        for request_texts, _, request_flags, future in group:
+            end = offset + len(request_texts)
+            future.set_result(
+                {
+                    field: outputs[field][offset:end] if request_flags[name] else None
+                    for name, field in OUTPUT_FIELDS.items()
+                }
+            )
+            offset = end
+
+
+@lru_cache
+def get_embedding_batcher() -> EmbeddingBatcher:
+    settings = get_settings()
+    return EmbeddingBatcher(settings.EMBEDDING_BATCH_MAX_WAIT_MS, settings.EMBEDDING_BATCH_MAX_SIZE)
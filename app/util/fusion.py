@@ -0,0 +1,296 @@
+from enum import Enum
+
+import numpy as np
+
+
+class FusionMethod(str, Enum):
+    WEIGHTED = "weighted"  # Milvus WeightedRanker와 같은 정규화 점수의 가중합
+    RRF = "rrf"  # Milvus RRFRanker와 같은 reciprocal rank fusion: sum(1 / (k + rank))
+    NORMALIZED = "normalized"  # query별 검색 결과 안에서 min-max 정규화한 점수의 가중합 (client fusion 전용)
+
+
+class FusionMode(str, Enum):
+    SERVER = "server"  # Milvus hybrid_search ranker로 합침
+    CLIENT = "client"  # dense/sparse 검색을 동시에 실행하고 프로세스에서 합침
+
+
+def normalize_dense_scores(scores: np.ndarray) -> np.ndarray:
+    """COSINE 점수를 WeightedRanker와 같은 방식((1 + score) / 2)으로 [0, 1]로 정규화합니다."""
+    return (1 + scores) / 2
+
+
+def normalize_sparse_scores(scores: np.ndarray) -> np.ndarray:
+    """IP 점수를 WeightedRanker와 같은 방식(0.5 + arctan(score) / pi)으로 [0, 1]로 정규화합니다."""
+    return 0.5 + np.arctan(scores) / np.pi
+
+
+def weighted_leg_bounds(
+    threshold: float, dense_weight: float, sparse_weight: float
+) -> tuple[float | None, float | None]:
+    """
+    weighted fusion 점수가 `threshold`보다 큰 후보가 dense/sparse 검색에서 가져야 하는 최소 점수를 계산합니다.
+
+    한쪽 정규화 점수는 최대 1이므로(한쪽 검색에만 나온 후보의 다른 쪽 점수는 0) dense 정규화 점수는
+    `(threshold - sparse_weight) / dense_weight`보다 커야 합니다. 이 값을 원래 점수로 되돌려 dense 검색은 range search의
+    radius로, sparse 검색은 결과를 거르는 하한으로 사용하면 fusion 후 threshold를 넘을 수 없는 후보를 제외합니다.
+    `threshold`는 가중치 합(fusion 점수의 최댓값)보다 작아야 합니다.
+
+    Args:
+        threshold (float): fusion 점수 하한 (제외).
+        dense_weight (float): dense 가중치.
+        sparse_weight (float): sparse 가중치.
+
+    Returns:
+        tuple[float | None, float | None]: dense(cosine), sparse(inner product) 최소 점수. 제한이 없으면 None.
+    """
+    dense_min = sparse_min = None
+    if dense_weight > 0:
+        bound = (threshold - sparse_weight) / dense_weight
+        if bound > 0:
+            # normalize_dense_scores의 역함수
+            dense_min = float(2 * bound - 1)
+    if sparse_weight > 0:
+        bound = (threshold - dense_weight) / sparse_weight
+        # normalize_sparse_scores의 역함수. 0.5 이하는 음수 inner product로 sparse 검색 결과에 나오지 않음
+        if bound > 0.5:
+            sparse_min = float(np.tan((bound - 0.5) * np.pi))
+    return dense_min, sparse_min
+
+
+class CandidateScores:
+    """
+    query별 dense/sparse 검색 후보와 원래 점수·순위를 (query 수, 후보 수) 행렬로 보관합니다.
+
+    후보 수가 query마다 다르므로 빈 칸의 id는 -1이며, 한쪽 검색에만 나온 후보의 다른 쪽 점수는 NaN, 순위는 0입니다.
+    검색을 한 번만 하고 여러 fusion 설정을 행렬 연산으로 비교할 때 사용합니다.
+    """
+
+    def __init__(self, ids: np.ndarray, dense_scores: np.ndarray, sparse_scores: np.ndarray):
+        self.ids = ids
+        self.dense_scores = dense_scores
+        self.sparse_scores = sparse_scores
+        self.dense_ranks = self._ranks(dense_scores)
+        self.sparse_ranks = self._ranks(sparse_scores)
+
+    @staticmethod
+    def _ranks(scores: np.ndarray) -> np.ndarray:
+        """점수 내림차순 1부터의 순위. 점수가 없는 후보는 0."""
+        filled = np.where(np.isnan(scores), -np.inf, scores)
+        order = np.argsort(-filled, axis=-1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, scores.shape[-1] + 1)[None, :], axis=-1)
+        return np.where(np.isnan(scores), 0, ranks)
+
+    @classmethod
+    def from_hits(cls, dense_hits: list[list], sparse_hits: list[list]) -> "CandidateScores":
+        """
+        query별 dense/sparse 검색 결과(`SearchHit` 목록)로 후보 행렬을 만듭니다.
+
+        Args:
+            dense_hits (list[list]): query별 dense 검색 결과. distance는 cosine similarity.
+            sparse_hits (list[list]): query별 sparse 검색 결과. distance는 inner product.
+
+        Returns:
+            CandidateScores: 후보 id와 점수 행렬.
+        """
+        candidates = []
+        for query_dense_hits, query_sparse_hits in zip(dense_hits, sparse_hits):
+            scores: dict[int, list[float]] = {}
+            for hit in query_dense_hits:
+                scores.setdefault(hit.id, [np.nan, np.nan])[0] = hit.distance
+            for hit in query_sparse_hits:
+                scores.setdefault(hit.id, [np.nan, np.nan])[1] = hit.distance
+            candidates.append(scores)
+
+        width = max((len(scores) for scores in candidates), default=0)
+        ids = np.full((len(candidates), width), -1, dtype=np.int64)
+        values = np.full((len(candidates), width, 2), np.nan, dtype=np.float64)
+        for row, scores in enumerate(candidates):
+            ids[row, : len(scores)] = list(scores.keys())
+            values[row, : len(scores)] = list(scores.values())
+        return cls(ids, values[..., 0], values[..., 1])
+
+    def relevance(self, relevant_ids: list[set]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        후보별 정답 여부 행렬과 query별 정답 수를 반환합니다.
+
+        Args:
+            relevant_ids (list[set]): query별 정답 id 집합.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (query 수, 후보 수) 정답 여부, (query 수,) 정답 수.
+        """
+        relevant = np.zeros(self.ids.shape, dtype=bool)
+        for row, expected in enumerate(relevant_ids):
+            relevant[row] = np.isin(self.ids[row], list(expected))
+        return relevant, np.asarray([len(expected) for expected in relevant_ids], dtype=np.float64)
+
+    def weighted_scores(self, dense_weights: np.ndarray, sparse_weights: np.ndarray) -> np.ndarray:
+        """
+        가중치 쌍마다 WeightedRanker 방식의 fusion 점수를 계산합니다. 한쪽 검색에만 나온 후보의 다른 쪽 점수는 0입니다.
+
+        Args:
+            dense_weights (np.ndarray): (가중치 쌍 수,) dense 가중치.
+            sparse_weights (np.ndarray): (가중치 쌍 수,) sparse 가중치.
+
+        Returns:
+            np.ndarray: (가중치 쌍 수, query 수, 후보 수) fusion 점수. 빈 칸은 -inf.
+        """
+        dense = np.nan_to_num(normalize_dense_scores(self.dense_scores), nan=0.0)
+        sparse = np.nan_to_num(normalize_sparse_scores(self.sparse_scores), nan=0.0)
+        fused = dense_weights[:, None, None] * dense + sparse_weights[:, None, None] * sparse
+        return np.where(self.ids >= 0, fused, -np.inf)
+
+    @staticmethod
+    def _min_max(scores: np.ndarray) -> np.ndarray:
+        """query별로 점수를 [0, 1]로 min-max 정규화합니다. 점수가 모두 같으면 1, 점수가 없는 후보는 0."""
+        missing = np.isnan(scores)
+        low = np.where(missing, np.inf, scores).min(axis=-1, keepdims=True)
+        high = np.where(missing, -np.inf, scores).max(axis=-1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normalized = np.where(high > low, (scores - low) / (high - low), 1.0)
+        return np.where(missing, 0.0, normalized)
+
+    def normalized_scores(self, dense_weights: np.ndarray, sparse_weights: np.ndarray) -> np.ndarray:
+        """
+        가중치 쌍마다 query별 min-max 정규화 점수의 가중합을 계산합니다. 한쪽 검색에만 나온 후보의 다른 쪽 점수는 0입니다.
+
+        Args:
+            dense_weights (np.ndarray): (가중치 쌍 수,) dense 가중치.
+            sparse_weights (np.ndarray): (가중치 쌍 수,) sparse 가중치.
+
+        Returns:
+            np.ndarray: (가중치 쌍 수, query 수, 후보 수) fusion 점수. 빈 칸은 -inf.
+        """
+        dense = self._min_max(self.dense_scores)
+        sparse = self._min_max(self.sparse_scores)
+        fused = dense_weights[:, None, None] * dense + sparse_weights[:, None, None] * sparse
+        return np.where(self.ids >= 0, fused, -np.inf)
+
+    def rrf_scores(self, ks: np.ndarray) -> np.ndarray:
+        """
+        k마다 RRFRanker 방식의 fusion 점수를 계산합니다.
+
+        Args:
+            ks (np.ndarray): (k 값 수,) RRF smoothing 상수.
+
+        Returns:
+            np.ndarray: (k 값 수, query 수, 후보 수) fusion 점수. 빈 칸은 -inf.
+        """
+        ks = ks[:, None, None].astype(np.float64)
+        fused = np.where(self.dense_ranks > 0, 1 / (ks + self.dense_ranks), 0.0)
+        fused = fused + np.where(self.sparse_ranks > 0, 1 / (ks + self.sparse_ranks), 0.0)
+        return np.where(self.ids >= 0, fused, -np.inf)
+
+
+def fuse_hits(
+    dense_hits: list,
+    sparse_hits: list,
+    *,
+    method: FusionMethod | str = FusionMethod.WEIGHTED,
+    dense_weight: float = 0.6,
+    sparse_weight: float = 0.4,
+    rrf_k: int = 60,
+) -> list[tuple[int, float]]:
+    """
+    query 1개의 dense/sparse 검색 결과를 Milvus ranker와 같은 방식으로 합칩니다.
+
+    Args:
+        dense_hits (list): dense 검색 결과(`SearchHit`). distance는 cosine similarity.
+        sparse_hits (list): sparse 검색 결과(`SearchHit`). distance는 inner product.
+        method (FusionMethod | str): fusion 방식.
+        dense_weight (float): weighted 방식의 dense 가중치.
+        sparse_weight (float): weighted 방식의 sparse 가중치.
+        rrf_k (int): rrf 방식의 smoothing 상수.
+
+    Returns:
+        list[tuple[int, float]]: (후보 id, fusion 점수) 점수 내림차순 목록.
+    """
+    return fuse_hit_lists(
+        [dense_hits],
+        [sparse_hits],
+        method=method,
+        dense_weight=dense_weight,
+        sparse_weight=sparse_weight,
+        rrf_k=rrf_k,
+    )[0]
+
+
+def fuse_hit_lists(
+    dense_hits: list[list],
+    sparse_hits: list[list],
+    *,
+    method: FusionMethod | str = FusionMethod.WEIGHTED,
+    dense_weight: float = 0.6,
+    sparse_weight: float = 0.4,
+    rrf_k: int = 60,
+    limit: int | None = None,
+    min_score: float | None = None,
+) -> list[list[tuple[int, float]]]:
+    """
+    여러 query의 dense/sparse 검색 결과를 한 번의 행렬 연산으로 합칩니다.
+
+    Args:
+        dense_hits (list[list]): query별 dense 검색 결과(`SearchHit`). distance는 cosine similarity.
+        sparse_hits (list[list]): query별 sparse 검색 결과(`SearchHit`). distance는 inner product.
+        method (FusionMethod | str): fusion 방식.
+        dense_weight (float): weighted, normalized 방식의 dense 가중치.
+        sparse_weight (float): weighted, normalized 방식의 sparse 가중치.
+        rrf_k (int): rrf 방식의 smoothing 상수.
+        limit (int | None): query별로 반환할 최대 결과 수. None이면 모든 후보.
+        min_score (float | None): fusion 점수 하한 (제외). None이면 거르지 않음.
+
+    Returns:
+        list[list[tuple[int, float]]]: query별 (후보 id, fusion 점수) 점수 내림차순 목록.
+    """
+    candidates = CandidateScores.from_hits(dense_hits, sparse_hits)
+    method = FusionMethod(method)
+    if method == FusionMethod.RRF:
+        scores = candidates.rrf_scores(np.asarray([rrf_k]))[0]
+    elif method == FusionMethod.NORMALIZED:
+        scores = candidates.normalized_scores(np.asarray([dense_weight]), np.asarray([sparse_weight]))[0]
+    else:
+        scores = candidates.weighted_scores(np.asarray([dense_weight]), np.asarray([sparse_weight]))[0]
+    if min_score is not None:
+        scores = np.where(scores > min_score, scores, -np.inf)
+    order = np.argsort(-scores, axis=-1, kind="stable")[:, :limit]
+    ids = np.take_along_axis(candidates.ids, order, axis=-1)
+    scores = np.take_along_axis(scores, order, axis=-1)
+    # 빈 칸과 min_score 이하 후보는 -inf
+    keep = np.isfinite(scores)
+    return [
+        list(zip(row_ids[row_keep].tolist(), row_scores[row_keep].tolist()))
+        for row_ids, row_scores, row_keep in zip(ids, scores, keep)
+    ]
+
+
+def ranking_metrics(
+    fused_scores: np.ndarray, relevant: np.ndarray, num_relevant: np.ndarray, top_k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    fusion 설정별 recall@k와 MRR을 한 번에 계산합니다.
+
+    Args:
+        fused_scores (np.ndarray): (설정 수, query 수, 후보 수) fusion 점수.
+        relevant (np.ndarray): (query 수, 후보 수) 후보가 정답인지 여부 (`CandidateScores.relevance`).
+        num_relevant (np.ndarray): (query 수,) query별 정답 수.
+        top_k (int): 평가할 결과 수.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 설정별 recall@k, MRR.
+    """
+    top_k = min(top_k, relevant.shape[-1])
+    if top_k == 0:
+        zeros = np.zeros(fused_scores.shape[0])
+        return zeros, zeros
+    top = np.argpartition(-fused_scores, top_k - 1, axis=-1)[..., :top_k]
+    top_scores = np.take_along_axis(fused_scores, top, axis=-1)
+    order = np.argsort(-top_scores, axis=-1, kind="stable")
+    top, top_scores = np.take_along_axis(top, order, axis=-1), np.take_along_axis(top_scores, order, axis=-1)
+    # 빈 칸(-inf)이 top_k에 들어간 경우 정답이 아님
+    hits = np.take_along_axis(np.broadcast_to(relevant, fused_scores.shape), top, axis=-1) & np.isfinite(top_scores)
+
+    recall = (hits.sum(axis=-1) / np.maximum(num_relevant, 1)).mean(axis=-1)
+    first = np.argmax(hits, axis=-1)
+    reciprocal_rank = np.where(hits.any(axis=-1), 1 / (first + 1), 0.0)
+    return recall, reciprocal_rank.mean(axis=-1)
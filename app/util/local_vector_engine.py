@@ -0,0 +1,550 @@
+import fcntl
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from config.settings import get_settings
+from util.fusion import FusionMethod, FusionMode, fuse_hit_lists
+from util.vector_database import (
+    CHUNK_ID_FIELD,
+    DENSE_VECTOR_FIELD,
+    SPARSE_VECTOR_FIELD,
+    TEXT_FIELD,
+    SearchHit,
+    get_search_executor,
+)
+from util.vector_index import DenseIndexType, resolve_search_params
+from util.vector_storage import VectorStorageMode
+
+settings = get_settings()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """(query 수, 후보 수) 점수 행렬에서 query별 점수 내림차순 top-k 위치와 점수"""
+    k = min(k, scores.shape[-1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    top = np.argpartition(-scores, k - 1, axis=-1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=-1)
+    order = np.argsort(-top_scores, axis=-1, kind="stable")
+    return np.take_along_axis(top, order, axis=-1), np.take_along_axis(top_scores, order, axis=-1)
+
+
+def _load_hnswlib():
+    try:
+        import hnswlib
+    except ImportError as e:
+        raise ImportError("HNSW index on the local vector engine requires `hnswlib` to be installed") from e
+    return hnswlib
+
+
+class LocalSegment:
+    """
+    insert 한 번으로 만들어지는 변경되지 않는 데이터 묶음.
+
+    배열은 segment 디렉터리의 .npy 파일을 memory-map으로 읽습니다. 텍스트는 UTF-8로 이어 붙인 `text.bin`과
+    행별 byte offset(`text_offsets.npy`)으로 저장하여 결과로 반환하는 행의 텍스트만 읽습니다.
+    sparse vector는 term별 posting list (정렬된 token id, token별 offset, 행 번호, weight)로 저장하여
+    query term의 posting만 읽습니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        self.partition_name: str | None = meta["partition_name"]
+        self.ids = np.load(path / "ids.npy", mmap_mode="r")
+        self._texts: list[str] | None = None
+        if (path / "text_offsets.npy").exists():
+            self._text_offsets = np.load(path / "text_offsets.npy", mmap_mode="r")
+            # 빈 파일은 memory-map할 수 없음 (모든 텍스트가 빈 문자열)
+            self._text_data = (
+                np.memmap(path / "text.bin", dtype=np.uint8, mode="r")
+                if self._text_offsets[-1] > 0
+                else np.empty(0, dtype=np.uint8)
+            )
+        else:
+            # 텍스트를 text.json으로 저장하던 이전 segment
+            with open(path / "text.json", encoding="utf-8") as f:
+                self._texts = json.load(f)
+        self.dense = np.load(path / "dense.npy", mmap_mode="r") if (path / "dense.npy").exists() else None
+        self.terms = np.load(path / "terms.npy", mmap_mode="r") if (path / "terms.npy").exists() else None
+        if self.terms is not None:
+            self.term_offsets = np.load(path / "term_offsets.npy", mmap_mode="r")
+            self.posting_rows = np.load(path / "posting_rows.npy", mmap_mode="r")
+            self.posting_values = np.load(path / "posting_values.npy", mmap_mode="r")
+        self.hnsw = None
+        self._hnsw_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def text(self, row: int) -> str:
+        if self._texts is not None:
+            return self._texts[row]
+        start, end = self._text_offsets[row], self._text_offsets[row + 1]
+        return self._text_data[start:end].tobytes().decode("utf-8")
+
+    @classmethod
+    def write(
+        cls,
+        path: Path,
+        ids: np.ndarray,
+        columns: dict[str, list],
+        partition_name: str | None,
+        hnsw_params: dict[str, Any] | None = None,
+    ) -> "LocalSegment":
+        """
+        column 데이터를 임시 디렉터리에 기록한 뒤 이름을 바꿔 segment를 원자적으로 추가합니다.
+        `hnsw_params`를 지정하면 HNSW index도 이름을 바꾸기 전에 만들어, 다른 process가 index 없는 segment를 읽지 않게 합니다.
+        """
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        np.save(tmp_path / "ids.npy", ids)
+        encoded = [text.encode("utf-8") for text in columns[TEXT_FIELD]]
+        (tmp_path / "text.bin").write_bytes(b"".join(encoded))
+        np.save(tmp_path / "text_offsets.npy", np.cumsum([0] + [len(text) for text in encoded], dtype=np.int64))
+        if DENSE_VECTOR_FIELD in columns:
+            # cosine similarity를 내적으로 계산하도록 정규화하여 저장
+            np.save(tmp_path / "dense.npy", _normalize(np.stack(columns[DENSE_VECTOR_FIELD])))
+        if SPARSE_VECTOR_FIELD in columns:
+            cls._write_postings(tmp_path, columns[SPARSE_VECTOR_FIELD])
+        (tmp_path / "meta.json").write_text(json.dumps({"partition_name": partition_name}), encoding="utf-8")
+        if hnsw_params is not None and DENSE_VECTOR_FIELD in columns:
+            cls(tmp_path).build_hnsw(hnsw_params)
+        os.replace(tmp_path, path)
+        segment = cls(path)
+        segment.load_hnsw()
+        return segment
+
+    @staticmethod
+    def _write_postings(path: Path, vectors: list[dict]):
+        lengths = [len(weights) for weights in vectors]
+        rows = np.repeat(np.arange(len(vectors), dtype=np.int64), lengths)
+        tokens = np.fromiter((int(token) for weights in vectors for token in weights), dtype=np.int64, count=len(rows))
+        values = np.fromiter(
+            (float(value) for weights in vectors for value in weights.values()), dtype=np.float32, count=len(rows)
+        )
+        order = np.argsort(tokens, kind="stable")
+        tokens, rows, values = tokens[order], rows[order], values[order]
+        terms, starts = np.unique(tokens, return_index=True)
+        np.save(path / "terms.npy", terms)
+        np.save(path / "term_offsets.npy", np.append(starts, len(tokens)).astype(np.int64))
+        np.save(path / "posting_rows.npy", rows)
+        np.save(path / "posting_values.npy", values)
+
+    def build_hnsw(self, params: dict[str, Any]):
+        """dense vector로 HNSW index를 만들어 segment 디렉터리에 저장합니다."""
+        hnswlib = _load_hnswlib()
+        index = hnswlib.Index(space="cosine", dim=self.dense.shape[-1])
+        index.init_index(
+            max_elements=len(self), M=params.get("M", 16), ef_construction=params.get("efConstruction", 200)
+        )
+        index.add_items(np.asarray(self.dense), np.arange(len(self)))
+        index.save_index(str(self.path / "hnsw.bin"))
+        self.hnsw = index
+
+    def load_hnsw(self):
+        if self.hnsw is None and (self.path / "hnsw.bin").exists():
+            hnswlib = _load_hnswlib()
+            index = hnswlib.Index(space="cosine", dim=self.dense.shape[-1])
+            index.load_index(str(self.path / "hnsw.bin"), max_elements=len(self))
+            self.hnsw = index
+
+    def drop_hnsw(self):
+        self.hnsw = None
+        (self.path / "hnsw.bin").unlink(missing_ok=True)
+
+    def dense_top_k(self, queries: np.ndarray, limit: int, ef: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """segment 안에서 query별 cosine similarity top-k 행 번호와 점수"""
+        # 다른 process의 index 변경을 반영하는 동안 바뀔 수 있으므로 한 번만 읽음
+        hnsw = self.hnsw
+        if hnsw is not None and ef is not None:
+            k = min(limit, len(self))
+            with self._hnsw_lock:
+                hnsw.set_ef(max(ef, k))
+                rows, distances = hnsw.knn_query(queries, k=k)
+            # hnswlib cosine distance = 1 - cosine similarity
+            return rows.astype(np.int64), 1 - distances
+        return _top_k(queries @ np.asarray(self.dense).T, limit)
+
+    def sparse_scores(self, query: dict) -> np.ndarray:
+        """query 1개와 segment 모든 행의 sparse inner product. posting list가 있는 term만 읽습니다."""
+        if not query:
+            return np.zeros(len(self), dtype=np.float32)
+        tokens = np.fromiter((int(token) for token in query), dtype=np.int64, count=len(query))
+        weights = np.fromiter((float(value) for value in query.values()), dtype=np.float32, count=len(query))
+        positions = np.searchsorted(self.terms, tokens)
+        found = positions < len(self.terms)
+        found[found] &= self.terms[positions[found]] == tokens[found]
+        rows, values = [], []
+        for position, weight in zip(positions[found], weights[found]):
+            start, end = self.term_offsets[position], self.term_offsets[position + 1]
+            rows.append(self.posting_rows[start:end])
+            values.append(self.posting_values[start:end] * weight)
+        if not rows:
+            return np.zeros(len(self), dtype=np.float32)
+        return np.bincount(np.concatenate(rows), weights=np.concatenate(values), minlength=len(self))
+
+
+class LocalCollection:
+    """
+    디스크의 collection 디렉터리(`collection.json` + segment 디렉터리)를 메모리에 올린 상태.
+
+    insert마다 segment를 하나 추가하며, 검색은 segment별 top-k를 구한 뒤 합칩니다.
+    여러 worker process가 같은 디렉터리를 사용할 수 있도록 segment 번호와 config는 lock file을 잡고 디스크 기준으로
+    정하며, 검색 전에 다른 process가 추가한 segment와 바꾼 index 설정을 다시 읽습니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.config: dict = {}
+        self._config_mtime: int | None = None
+        self.segments: list[LocalSegment] = []
+        self.refresh()
+
+    def _segment_names(self) -> list[str]:
+        return sorted(path.name for path in (self.path / "segments").iterdir() if not path.name.startswith("."))
+
+    def refresh(self):
+        """디스크의 segment 목록과 `collection.json`이 바뀌었으면 메모리 상태에 반영합니다."""
+        config_mtime = (self.path / "collection.json").stat().st_mtime_ns
+        names = self._segment_names()
+        if config_mtime == self._config_mtime and names == [segment.path.name for segment in self.segments]:
+            return
+        with self._lock:
+            config_changed = config_mtime != self._config_mtime
+            if config_changed:
+                self.config = json.loads((self.path / "collection.json").read_text(encoding="utf-8"))
+                self._config_mtime = config_mtime
+            use_hnsw = self.config["index_type"] == DenseIndexType.HNSW.value
+            loaded = {segment.path.name: segment for segment in self.segments}
+            segments = []
+            for name in names:
+                segment = loaded.get(name)
+                if segment is None:
+                    segment = LocalSegment(self.path / "segments" / name)
+                elif config_changed:
+                    # 다른 process가 index를 다시 만들었을 수 있으므로 디스크에서 다시 읽음
+                    segment.hnsw = None
+                if use_hnsw:
+                    segment.load_hnsw()
+                segments.append(segment)
+            # 검색 중인 thread는 기존 목록을 그대로 사용
+            self.segments = segments
+
+    @contextmanager
+    def _file_lock(self):
+        """다른 worker process와 segment 번호, config(next_id, index 설정)를 동시에 쓰지 않도록 lock file을 잡습니다."""
+        with open(self.path / ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @classmethod
+    def create(cls, path: Path, config: dict) -> "LocalCollection":
+        (path / "segments").mkdir(parents=True, exist_ok=True)
+        (path / "collection.json").write_text(json.dumps({**config, "next_id": 1}), encoding="utf-8")
+        return cls(path)
+
+    def _save_config(self):
+        tmp_path = self.path / ".collection.json.tmp"
+        tmp_path.write_text(json.dumps(self.config), encoding="utf-8")
+        os.replace(tmp_path, self.path / "collection.json")
+        self._config_mtime = (self.path / "collection.json").stat().st_mtime_ns
+
+    def insert(self, columns: dict[str, list], partition_name: str | None) -> int:
+        num_rows = len(columns[TEXT_FIELD])
+        if num_rows == 0:
+            return 0
+        with self._file_lock():
+            # 다른 process가 추가한 segment와 next_id를 반영한 뒤 번호를 정함
+            self.refresh()
+            first_id = self.config["next_id"]
+            if CHUNK_ID_FIELD in columns:
+                # chunk store에서 발급한 chunk id를 그대로 사용 (텍스트는 local segment에도 저장)
+                ids = np.asarray(columns[CHUNK_ID_FIELD], dtype=np.int64)
+            else:
+                ids = np.arange(first_id, first_id + num_rows, dtype=np.int64)
+            numbers = [int(name) for name in self._segment_names() if name.isdigit()]
+            segment_path = self.path / "segments" / f"{max(numbers, default=-1) + 1:06d}"
+            use_hnsw = self.config["index_type"] == DenseIndexType.HNSW.value
+            hnsw_params = self.config["index_params"] if use_hnsw else None
+            segment = LocalSegment.write(segment_path, ids, columns, partition_name, hnsw_params)
+            with self._lock:
+                self.config["next_id"] = max(first_id, int(ids.max()) + 1)
+                self._save_config()
+                # 검색 중인 thread는 기존 목록을 그대로 사용
+                self.segments = [*self.segments, segment]
+        return num_rows
+
+    def set_index(self, index_type: str, index_params: dict[str, Any]):
+        with self._file_lock():
+            self.refresh()
+            for segment in self.segments:
+                if index_type == DenseIndexType.HNSW.value and segment.dense is not None:
+                    segment.build_hnsw(index_params)
+                else:
+                    segment.drop_hnsw()
+            with self._lock:
+                self.config["index_type"] = index_type
+                self.config["index_params"] = index_params
+                self._save_config()
+
+    def _searchable_segments(self, partition_names: list[str] | None) -> list[LocalSegment]:
+        """검색할 segment. partition_names가 있으면 해당 파티션에 적재한 segment만 검색합니다."""
+        self.refresh()
+        if partition_names is None:
+            return [segment for segment in self.segments if len(segment)]
+        partitions = set(partition_names)
+        return [segment for segment in self.segments if len(segment) and segment.partition_name in partitions]
+
+    def dense_search(
+        self, queries: np.ndarray, limit: int, ef: int | None, partition_names: list[str] | None = None
+    ) -> list[list[SearchHit]]:
+        queries = _normalize(np.atleast_2d(queries))
+        segments = [segment for segment in self._searchable_segments(partition_names) if segment.dense is not None]
+        if not segments:
+            return [[] for _ in queries]
+        per_segment = [segment.dense_top_k(queries, limit, ef) for segment in segments]
+        rows = np.concatenate([rows for rows, _ in per_segment], axis=-1)
+        scores = np.concatenate([scores for _, scores in per_segment], axis=-1)
+        owners = np.concatenate([np.full(segment_rows.shape[-1], i) for i, (segment_rows, _) in enumerate(per_segment)])
+        top, top_scores = _top_k(scores, limit)
+        return [
+            [self._hit(segments[owners[j]], rows[q, j], score) for j, score in zip(top[q], top_scores[q])]
+            for q in range(len(queries))
+        ]
+
+    def sparse_search(
+        self, queries: list[dict], limit: int, partition_names: list[str] | None = None
+    ) -> list[list[SearchHit]]:
+        segments = [segment for segment in self._searchable_segments(partition_names) if segment.terms is not None]
+        if not segments:
+            return [[] for _ in queries]
+        offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        results = []
+        for query in queries:
+            scores = np.concatenate([segment.sparse_scores(query) for segment in segments])[None, :]
+            top, top_scores = _top_k(scores, limit)
+            hits = []
+            for position, score in zip(top[0], top_scores[0]):
+                # Milvus처럼 query term과 겹치지 않는 행은 결과에 포함하지 않음
+                if score <= 0:
+                    continue
+                owner = int(np.searchsorted(offsets, position, side="right") - 1)
+                hits.append(self._hit(segments[owner], position - offsets[owner], score))
+            results.append(hits)
+        return results
+
+    @staticmethod
+    def _hit(segment: LocalSegment, row: int, score: float) -> SearchHit:
+        return SearchHit(int(segment.ids[row]), float(score), {TEXT_FIELD: segment.text(row)})
+
+
+_collections: dict[str, LocalCollection] = {}
+_collections_lock = threading.Lock()
+
+
+def _collection_path(name: str) -> Path:
+    return Path(settings.LOCAL_VECTOR_ENGINE_DIR) / name
+
+
+def get_local_collection(name: str) -> LocalCollection:
+    """memory에 올린 collection을 반환합니다. 처음 사용할 때 디스크에서 읽습니다."""
+    collection = _collections.get(name)
+    if collection is None:
+        with _collections_lock:
+            collection = _collections.get(name)
+            if collection is None:
+                collection = _collections[name] = LocalCollection(_collection_path(name))
+    return collection
+
+
+class LocalVectorManager:
+    """
+    Milvus 서버 없이 프로세스 안에서 동작하는 vector engine의 collection 관리. `MilvusManager`와 같은 method를 제공합니다.
+
+    dense vector는 float32로 정규화하여 memory-map 파일에 저장하고, index 유형이 HNSW이면 segment별 hnswlib index를,
+    그 밖의 유형은 brute-force(FLAT)로 검색합니다. 압축 저장 모드는 지원하지 않습니다.
+    """
+
+    @classmethod
+    def create_collection(
+        cls,
+        name: str,
+        *,
+        dimension: int = 1024,
+        vector_fields: tuple[str, ...] = (DENSE_VECTOR_FIELD, SPARSE_VECTOR_FIELD),
+        storage_mode: VectorStorageMode | str = VectorStorageMode.FLOAT32,
+        truncated_dimension: int | None = None,
+        index_type: str | None = None,
+        index_params: dict[str, Any] | None = None,
+        shared: bool = False,
+        shards_num: int = 1,
+        replica_number: int = 1,
+    ) -> str:
+        # shards_num, replica_number는 Milvus query node에 나누어 처리하기 위한 설정으로 local engine에서는 사용하지 않음
+        if VectorStorageMode(storage_mode) != VectorStorageMode.FLOAT32:
+            raise ValueError("local vector engine only supports float32 storage")
+        if shared:
+            raise ValueError("local vector engine does not support shared collections")
+        path = _collection_path(name)
+        if not (path / "collection.json").exists():
+            config = {
+                "dimension": dimension,
+                "vector_fields": list(vector_fields),
+                "index_type": index_type or DenseIndexType.FLAT.value,
+                "index_params": index_params or {},
+            }
+            LocalCollection.create(path, config)
+        return name
+
+    @classmethod
+    def create_partition(cls, collection_name: str, partition_name: str) -> str:
+        # 파티션은 segment의 속성으로만 기록
+        return partition_name
+
+    @classmethod
+    def embed_documents(
+        cls, collection_name: str, columns: dict[str, list], partition_name: str = None, *, flush: bool = True
+    ) -> int:
+        return get_local_collection(collection_name).insert(columns, partition_name)
+
+    @classmethod
+    def rebuild_index(
+        cls,
+        collection_name: str,
+        *,
+        field_name: str,
+        index_type: str,
+        metric_type: str,
+        params: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        replica_number: int = 1,
+    ):
+        """segment별 HNSW index를 다시 만들거나 삭제합니다. 데이터는 복사하지 않습니다."""
+        if field_name == DENSE_VECTOR_FIELD:
+            get_local_collection(collection_name).set_index(index_type, params or {})
+
+    @classmethod
+    def drop_collection(cls, collection_name: str) -> bool:
+        with _collections_lock:
+            _collections.pop(collection_name, None)
+        path = _collection_path(collection_name)
+        if not path.exists():
+            return False
+        shutil.rmtree(path)
+        return True
+
+    @classmethod
+    def load_collection(cls, collection_name: str, replica_number: int = 1) -> bool:
+        get_local_collection(collection_name)
+        return True
+
+    @classmethod
+    def release_collection(cls, collection_name: str) -> bool:
+        with _collections_lock:
+            return _collections.pop(collection_name, None) is not None
+
+
+class LocalSearchManager:
+    def __init__(
+        self,
+        collection_name: str,
+        top_k: int,
+        *,
+        storage_mode: VectorStorageMode | str = VectorStorageMode.FLOAT32,
+        truncated_dimension: int | None = None,
+        rescore_multiplier: int = 4,
+        rescore_vectors: Callable[[list[int]], dict[int, bytes]] | None = None,
+        index_type: str | None = None,
+        search_params: dict[str, Any] | None = None,
+        filter_expr: str | None = None,
+        partition_names: list[str] | None = None,
+        min_score: float | None = None,
+    ):
+        """
+        local vector engine의 검색. `MilvusSearchManager`와 같은 생성자와 검색 method를 제공합니다.
+        full-precision vector와 텍스트를 저장하므로 rescoring 관련 인자는 사용하지 않습니다.
+
+        Args:
+            collection_name (str): 사용할 컬렉션의 이름.
+            top_k (int): 검색 시 반환할 상위 k개의 결과 수.
+            index_type (str | None): 컬렉션의 dense vector index 유형. HNSW가 아니면 brute-force 검색.
+            search_params (dict[str, Any] | None): HNSW search params (ef).
+            filter_expr (str | None): scalar filter. local engine은 지원하지 않으므로 None이어야 합니다.
+            partition_names (list[str] | None): 검색할 파티션 (partition routing). None이면 모든 파티션.
+            min_score (float | None): 반환할 결과의 점수 하한 (제외). None이면 점수로 거르지 않음.
+        """
+        if filter_expr is not None:
+            raise ValueError("Local vector engine does not support filter expressions")
+        self._collection = get_local_collection(collection_name)
+        self._partition_names = partition_names
+        self._min_score = min_score
+        self._top_k = top_k
+        self._ef = None
+        if self._collection.config["index_type"] == DenseIndexType.HNSW.value:
+            self._ef = resolve_search_params(DenseIndexType.HNSW, search_params, top_k)["ef"]
+
+    def dense_search(self, embeded_query: np.ndarray) -> list[list[SearchHit]]:
+        hits = self._collection.dense_search(embeded_query, self._top_k, self._ef, self._partition_names)
+        return [self._above_min_score(query_hits) for query_hits in hits]
+
+    def sparse_search(self, embeded_query: list[dict], limit: int | None = None) -> list[list[SearchHit]]:
+        hits = self._collection.sparse_search(embeded_query, limit or self._top_k, self._partition_names)
+        return [self._above_min_score(query_hits) for query_hits in hits]
+
+    def _above_min_score(self, hits: list[SearchHit]) -> list[SearchHit]:
+        if self._min_score is None:
+            return hits
+        return [hit for hit in hits if hit.distance > self._min_score]
+
+    def hybrid_search(
+        self,
+        dense_embeded_query: np.ndarray,
+        sparse_embeded_query: list[dict],
+        dense_weight=0.6,
+        sparse_weight=0.4,
+        fusion_method: FusionMethod | str = FusionMethod.WEIGHTED,
+        rrf_k: int = 60,
+        fusion_mode: FusionMode | str = FusionMode.CLIENT,
+    ) -> list[list[SearchHit]]:
+        """
+        dense/sparse 검색을 동시에 각각 top_k개씩 한 뒤 Milvus ranker와 같은 방식으로 합칩니다.
+        local engine은 항상 프로세스에서 합치므로 `fusion_mode`는 사용하지 않으며, min_score는 합친 점수에 적용합니다.
+        """
+        dense_future = get_search_executor().submit(
+            self._collection.dense_search, dense_embeded_query, self._top_k, self._ef, self._partition_names
+        )
+        sparse_hits = self._collection.sparse_search(sparse_embeded_query, self._top_k, self._partition_names)
+        dense_hits = dense_future.result()
+        fused = fuse_hit_lists(
+            dense_hits,
+            sparse_hits,
+            method=fusion_method,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            rrf_k=rrf_k,
+            limit=self._top_k,
+            min_score=self._min_score,
+        )
+        results = []
+        for query_fused, query_dense_hits, query_sparse_hits in zip(fused, dense_hits, sparse_hits):
+            fields = {hit.id: hit.fields for hit in [*query_dense_hits, *query_sparse_hits]}
+            results.append([SearchHit(hit_id, score, fields[hit_id]) for hit_id, score in query_fused])
+        return results
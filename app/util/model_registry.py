@@ -7,8 +7,12 @@ from mlflow import MlflowClient
 from mlflow.models import ModelSignature, infer_signature
 from mlflow.pyfunc import PythonModel
 from FlagEmbedding import BGEM3FlagModel
+from util.batching import encode_bucketed
 
 settings = get_settings()
+# pickle된 BGEEmbeddingWrapper가 serving 환경에서 import하는 패키지 (util.model_registry, util.batching, config.settings)
+APP_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WRAPPER_CODE_PATHS = [os.path.join(APP_DIRECTORY, "util"), os.path.join(APP_DIRECTORY, "config")]
 
 # 환경 변수를 통한 타임아웃 설정
 os.environ["MLFLOW_HTTP_REQUEST_TIMEOUT"] = "300"  # 5분으로 설정
@@ -126,7 +130,9 @@ class ModelRegistry:
             mlflow.pyfunc.log_model(
                 artifact_path=model_name,
                 python_model=BGEEmbeddingWrapper(repo_id),
-                registered_model_name=model_name
+                registered_model_name=model_name,
+                # predict가 사용하는 util.batching 등을 모델과 함께 저장하여 serving 환경에서도 import할 수 있도록 함
+                code_paths=WRAPPER_CODE_PATHS,
             )
             run_id = run.info.run_id
             artifact_uri = mlflow.get_artifact_uri()
@@ -170,10 +176,12 @@ class BGEEmbeddingWrapper(PythonModel):
                 "The model has not been loaded. "
                 "Ensure that 'load_context' is properly executed."
             )
-        return self.model.encode(
+        return encode_bucketed(
+            self.model,
             model_input,
-            batch_size=12,
-            max_length=8192,
+            max_length=settings.EMBEDDING_MAX_LENGTH,
+            token_budget=settings.EMBEDDING_TOKEN_BUDGET,
+            max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
             return_dense=True,
             return_sparse=True,
             return_colbert_vecs=False,
@@ -0,0 +1,96 @@
+import threading
+from functools import lru_cache
+from typing import Callable, Hashable
+
+import numpy as np
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+def file_centroid(dense_vectors: np.ndarray) -> bytes:
+    """파일 chunk들의 full-precision dense vector를 정규화하여 평균한 centroid (float32 byte)"""
+    vectors = np.asarray(dense_vectors, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+    centroid = vectors.mean(axis=0)
+    return (centroid / max(float(np.linalg.norm(centroid)), 1e-12)).astype(np.float32).tobytes()
+
+
+class RoutingTable:
+    """지식 하나의 파일 id와 centroid 행렬"""
+
+    def __init__(self, version: Hashable, file_ids: np.ndarray, centroids: np.ndarray):
+        self.version = version
+        self.file_ids = file_ids
+        self.centroids = centroids
+
+
+class PartitionRouter:
+    """
+    파일별 centroid와 query의 cosine similarity로 검색할 파일(파티션)을 고릅니다.
+
+    similarity에 temperature softmax를 적용하여 고른 `top_n`개 파일의 확률 합을 routing 신뢰도로 보고,
+    `min_confidence`보다 낮으면 관련 chunk가 여러 파일에 흩어져 있을 수 있으므로 전체 검색(None)을 반환합니다.
+    지식별 centroid 행렬은 프로세스 메모리에 캐시하고, 파일 목록의 version이 바뀌면(파일 적재) 다시 읽습니다.
+    """
+
+    def __init__(self, temperature: float):
+        self._temperature = temperature
+        self._tables: dict[int, RoutingTable] = {}
+        self._lock = threading.Lock()
+
+    def _table(
+        self, knowledge_id: int, version: Hashable, load: Callable[[], list[tuple[int, bytes]]]
+    ) -> RoutingTable | None:
+        table = self._tables.get(knowledge_id)
+        if table is None or table.version != version:
+            rows = load()
+            if not rows:
+                return None
+            file_ids = np.asarray([file_id for file_id, _ in rows], dtype=np.int64)
+            centroids = np.stack([np.frombuffer(centroid, dtype=np.float32) for _, centroid in rows])
+            table = RoutingTable(version, file_ids, centroids)
+            with self._lock:
+                self._tables[knowledge_id] = table
+        return table
+
+    def route(
+        self,
+        knowledge_id: int,
+        version: Hashable,
+        load: Callable[[], list[tuple[int, bytes]]],
+        query: np.ndarray,
+        *,
+        top_n: int,
+        min_confidence: float,
+    ) -> list[int] | None:
+        """
+        query와 가까운 파일 id를 고릅니다.
+
+        Args:
+            knowledge_id (int): 지식 ID.
+            version (Hashable): 지식의 파일 목록 version. 캐시된 값과 다르면 `load`로 다시 읽습니다.
+            load (Callable[[], list[tuple[int, bytes]]]): (파일 id, centroid) 목록을 읽는 함수.
+            query (np.ndarray): full-precision query dense vector.
+            top_n (int): 검색할 파일 수.
+            min_confidence (float): 고른 파일의 softmax 확률 합의 최솟값.
+
+        Returns:
+            list[int] | None: 검색할 파일 id. 파일이 top_n개 이하이거나 신뢰도가 낮으면 전체 검색을 뜻하는 None.
+        """
+        table = self._table(knowledge_id, version, load)
+        if table is None or len(table.file_ids) <= top_n:
+            return None
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        scores = table.centroids @ (query / max(float(np.linalg.norm(query)), 1e-12))
+        selected = np.argpartition(-scores, top_n - 1)[:top_n]
+        weights = np.exp((scores - scores.max()) / self._temperature)
+        confidence = weights[selected].sum() / weights.sum()
+        if confidence < min_confidence:
+            return None
+        return sorted(table.file_ids[selected].tolist())
+
+
+@lru_cache
+def get_partition_router() -> PartitionRouter:
+    return PartitionRouter(settings.PARTITION_ROUTING_TEMPERATURE)
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def prune_sparse_vector(
+    weights: dict, *, top_n: int | None = None, min_weight: float | None = None
+) -> dict[int, float]:
+    """
+    sparse vector(lexical weights)를 pruning하고 Milvus에 바로 넣을 수 있는 int key 형태로 변환합니다.
+
+    Args:
+        weights (dict): token id(str 또는 int) → weight.
+        top_n (int | None): weight가 큰 순으로 남길 최대 term 수. None이면 제한하지 않음.
+        min_weight (float | None): 남길 최소 weight. None이면 0보다 큰 term을 모두 남김.
+            모든 term이 min_weight보다 작아도 빈 vector가 되지 않도록 weight가 가장 큰 term 하나는 남김.
+
+    Returns:
+        dict[int, float]: pruning된 token id → weight.
+    """
+    if not weights:
+        return {}
+    token_ids = np.fromiter((int(token) for token in weights.keys()), dtype=np.int64, count=len(weights))
+    values = np.fromiter((float(value) for value in weights.values()), dtype=np.float32, count=len(weights))
+
+    positive = values > 0
+    mask = positive
+    if min_weight is not None:
+        mask = positive & (values >= min_weight)
+        if not mask.any() and positive.any():
+            # 빈 sparse vector는 Milvus에 넣거나 검색할 수 없으므로 가장 큰 term은 남김
+            mask[np.argmax(values)] = True
+    token_ids, values = token_ids[mask], values[mask]
+
+    if top_n is not None and len(values) > top_n:
+        keep = np.argpartition(-values, top_n - 1)[:top_n]
+        token_ids, values = token_ids[keep], values[keep]
+    return dict(zip(token_ids.tolist(), values.tolist()))
+
+
+def prune_sparse_vectors(
+    vectors: list[dict], *, top_n: int | None = None, min_weight: float | None = None
+) -> list[dict[int, float]]:
+    return [prune_sparse_vector(weights, top_n=top_n, min_weight=min_weight) for weights in vectors]
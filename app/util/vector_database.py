@@ -1,4 +1,10 @@
-from typing import Any
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable
 
 import numpy as np
 from config.settings import get_settings
@@ -7,104 +13,689 @@ from pymilvus import (
     Collection,
     DataType,
     MilvusClient,
+    RRFRanker,
     WeightedRanker,
-    connections,
+)
+from pymilvus.client.types import LoadState
+from util.fusion import FusionMethod, FusionMode, fuse_hit_lists, weighted_leg_bounds
+from util.vector_index import resolve_index, resolve_search_params
+from util.vector_storage import (
+    VectorStorageMode,
+    cosine_scores,
+    requires_rescoring,
+    stored_dimension,
+    to_storage_vectors,
 )
 
 settings = get_settings()
 
+DENSE_VECTOR_FIELD = "dense_vector"
+SPARSE_VECTOR_FIELD = "sparse_vector"
+# shared 컬렉션에서 지식을 나누는 partition key field
+KNOWLEDGE_ID_FIELD = "knowledge_id"
+# 적재 시 chunk마다 기록하는 metadata scalar field (검색 filter에 사용)
+KNOWLEDGE_FILE_ID_FIELD = "knowledge_file_id"
+FILE_TYPE_FIELD = "file_type"
+PAGE_FIELD = "page"
+CHUNK_INDEX_FIELD = "chunk_index"
+CREATED_AT_FIELD = "created_at"  # 파일 적재 시각 (epoch 초)
 
-class Client:
-    _instance = None
+# metadata field별 scalar index 유형
+METADATA_INDEX_TYPES = {
+    KNOWLEDGE_FILE_ID_FIELD: "STL_SORT",
+    FILE_TYPE_FIELD: "INVERTED",
+    PAGE_FIELD: "STL_SORT",
+    CHUNK_INDEX_FIELD: "STL_SORT",
+    CREATED_AT_FIELD: "STL_SORT",
+}
+# metadata field가 없는 컬렉션에서 옮겨온 엔티티의 값 (page가 없는 문서의 page도 -1)
+METADATA_DEFAULTS = {
+    KNOWLEDGE_FILE_ID_FIELD: 0,
+    FILE_TYPE_FIELD: "",
+    PAGE_FIELD: -1,
+    CHUNK_INDEX_FIELD: -1,
+    CREATED_AT_FIELD: 0,
+}
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(Client, cls).__new__(cls)
-            cls._instance.client = MilvusClient(
-                uri=f"http://{settings.MILVUS_DB_HOST}:{settings.MILVUS_DB_PORT}",
-                token=f"{settings.MILVUS_DB_USERNAME}:{settings.MILVUS_DB_PASSWORD}",
-                db_name=settings.MILVUS_DB_NAME,
-            )
-        return cls._instance
+# TODO: 기준 정보 별도 관리 필요
+# search_type_id별로 필요한 vector field
+SEARCH_TYPE_VECTOR_FIELDS = {
+    1: (DENSE_VECTOR_FIELD,),  # Semantic Search
+    2: (SPARSE_VECTOR_FIELD,),  # Full-Text Search
+    3: (DENSE_VECTOR_FIELD, SPARSE_VECTOR_FIELD),  # Hybrid Search
+}
+
+# chunk id를 저장하는 primary key field와 chunk store를 쓰기 전에 만든 컬렉션의 텍스트 field
+CHUNK_ID_FIELD = "id"
+TEXT_FIELD = "text"
+# 검색 결과에 포함할 scalar field (텍스트를 저장하는 기존 컬렉션에만 존재)
+SEARCH_OUTPUT_FIELDS = (TEXT_FIELD,)
+
+# 저장 모드별 dense vector field 타입
+DENSE_VECTOR_DATATYPES = {
+    VectorStorageMode.FLOAT32: DataType.FLOAT_VECTOR,
+    VectorStorageMode.FLOAT16: DataType.FLOAT16_VECTOR,
+    VectorStorageMode.BINARY: DataType.BINARY_VECTOR,
+    VectorStorageMode.TRUNCATED: DataType.FLOAT_VECTOR,
+}
+
+
+def dense_metric_type(storage_mode: VectorStorageMode | str) -> str:
+    return "HAMMING" if VectorStorageMode(storage_mode) == VectorStorageMode.BINARY else "COSINE"
+
+
+def shared_collection_name(
+    *,
+    dimension: int,
+    vector_fields: tuple[str, ...],
+    storage_mode: VectorStorageMode | str,
+    truncated_dimension: int | None,
+    index_type: str | None,
+) -> str:
+    """
+    schema와 index 설정이 같은 지식이 함께 사용하는 shared 컬렉션의 이름을 만듭니다.
+
+    Args:
+        dimension (int): 임베딩 모델의 dense vector 차원 수.
+        vector_fields (tuple[str, ...]): 저장할 vector field.
+        storage_mode (VectorStorageMode | str): dense vector 저장 모드.
+        truncated_dimension (int | None): truncated 모드에서 저장할 앞쪽 차원 수.
+        index_type (str | None): dense vector index 유형. None이면 저장 모드의 기본값.
+
+    Returns:
+        str: `shared__{저장 모드}_{저장 차원}_{vector field}_{index 유형}` 형식의 컬렉션 이름.
+    """
+    storage_mode = VectorStorageMode(storage_mode)
+    dense_index_type, _ = resolve_index(storage_mode, index_type)
+    fields = "_".join(field.removesuffix("_vector") for field in vector_fields)
+    stored = stored_dimension(storage_mode, dimension, truncated_dimension)
+    return f"shared__{storage_mode.value}_{stored}_{fields}_{dense_index_type.value.lower()}"
+
+
+def knowledge_filter(knowledge_id: int) -> str:
+    """shared 컬렉션에서 지식 하나의 엔티티만 검색하는 partition key filter"""
+    return f"{KNOWLEDGE_ID_FIELD} == {int(knowledge_id)}"
+
+
+def metadata_filter(
+    *,
+    knowledge_file_ids: list[int] | None = None,
+    file_types: list[str] | None = None,
+    page_from: int | None = None,
+    page_to: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> str | None:
+    """
+    chunk metadata 조건으로 Milvus filter expression을 만듭니다. 값은 모두 literal로 변환하므로 사용자 입력을 그대로
+    expression에 넣지 않습니다.
+
+    Args:
+        knowledge_file_ids (list[int] | None): 검색할 파일 id.
+        file_types (list[str] | None): 검색할 파일 유형(확장자).
+        page_from (int | None): 검색할 첫 page (포함).
+        page_to (int | None): 검색할 마지막 page (포함).
+        created_from (datetime | None): 이 시각 이후에 적재한 파일만 검색 (포함).
+        created_to (datetime | None): 이 시각 이전에 적재한 파일만 검색 (포함).
+
+    Returns:
+        str | None: 조건을 and로 묶은 expression. 조건이 없으면 None.
+    """
+    conditions = []
+    if knowledge_file_ids is not None:
+        conditions.append(f"{KNOWLEDGE_FILE_ID_FIELD} in {[int(file_id) for file_id in knowledge_file_ids]}")
+    if file_types is not None:
+        conditions.append(f"{FILE_TYPE_FIELD} in [{', '.join(json.dumps(str(value)) for value in file_types)}]")
+    if page_from is not None:
+        conditions.append(f"{PAGE_FIELD} >= {int(page_from)}")
+    if page_to is not None:
+        conditions.append(f"{PAGE_FIELD} <= {int(page_to)}")
+    if created_from is not None:
+        conditions.append(f"{CREATED_AT_FIELD} >= {int(created_from.timestamp())}")
+    if created_to is not None:
+        conditions.append(f"{CREATED_AT_FIELD} <= {int(created_to.timestamp())}")
+    return combine_filters(*conditions)
+
+
+def combine_filters(*exprs: str | None) -> str | None:
+    """filter expression을 and로 묶습니다. None은 제외합니다."""
+    exprs = [expr for expr in exprs if expr]
+    if len(exprs) <= 1:
+        return exprs[0] if exprs else None
+    return " and ".join(f"({expr})" for expr in exprs)
+
+
+class MissingRescoreVectorsError(Exception):
+    """rescoring할 후보의 full-precision dense vector가 저장되어 있지 않은 경우"""
+
+    def __init__(self, chunk_ids: list[int]):
+        super().__init__(f"Full-precision dense vectors are missing for chunks: {chunk_ids[:10]}")
+        self.chunk_ids = chunk_ids
+
+
+class SearchHit:
+    """검색 결과 1건. pymilvus Hit과 같은 방식(`distance`, `get`)으로 사용할 수 있습니다."""
+
+    def __init__(self, id: int, distance: float, fields: dict[str, Any]):
+        self.id = id
+        self.distance = distance
+        self.fields = fields
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return self.fields.get(field, default)
+
+    @classmethod
+    def from_results(cls, search_results, output_fields: list[str]) -> list[list["SearchHit"]]:
+        return [
+            [cls(hit.id, hit.distance, {field: hit.get(field) for field in output_fields}) for hit in hits]
+            for hits in search_results
+        ]
+
+
+class VectorStore:
+    """
+    MilvusManager와 MilvusSearchManager가 공유하는 Milvus client.
+
+    MilvusClient는 import 시점이 아닌 처음 사용할 때 한 번만 생성하며, ORM `Collection`도 MilvusClient가 등록한
+    connection alias를 사용하여 하나의 gRPC channel을 공유합니다.
+    collection handle과 schema 정보(describe_collection)는 캐시하고, collection을 삭제·변경할 때 `invalidate`로 비웁니다.
+    """
+
+    def __init__(self):
+        self._client: MilvusClient | None = None
+        self._collections: dict[str, Collection] = {}
+        self._schemas: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> MilvusClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None and settings.MILVUS_URI:
+                    # Milvus Lite(로컬 파일)는 인증과 database를 사용하지 않음
+                    self._client = MilvusClient(uri=settings.MILVUS_URI)
+                elif self._client is None:
+                    self._client = MilvusClient(
+                        uri=f"http://{settings.MILVUS_DB_HOST}:{settings.MILVUS_DB_PORT}",
+                        token=f"{settings.MILVUS_DB_USERNAME}:{settings.MILVUS_DB_PASSWORD}",
+                        db_name=settings.MILVUS_DB_NAME,
+                    )
+        return self._client
+
+    @property
+    def is_lite(self) -> bool:
+        """Milvus Lite(로컬 파일 URI)인지 여부. Milvus Lite는 scalar index를 지원하지 않습니다."""
+        return bool(settings.MILVUS_URI) and "://" not in settings.MILVUS_URI
+
+    @property
+    def alias(self) -> str:
+        # MilvusClient가 생성 시 connections에 등록한 alias
+        return self.client._using
+
+    def collection(self, name: str) -> Collection:
+        """캐시된 ORM Collection handle을 반환합니다. 처음 한 번만 describe 요청을 보냅니다."""
+        handle = self._collections.get(name)
+        if handle is None:
+            handle = Collection(name, using=self.alias)
+            with self._lock:
+                handle = self._collections.setdefault(name, handle)
+        return handle
+
+    def describe(self, name: str) -> dict:
+        """캐시된 collection schema 정보(describe_collection 결과)를 반환합니다."""
+        schema = self._schemas.get(name)
+        if schema is None:
+            schema = self.client.describe_collection(name)
+            with self._lock:
+                schema = self._schemas.setdefault(name, schema)
+        return schema
+
+    def field_names(self, name: str) -> set[str]:
+        return {field["name"] for field in self.describe(name)["fields"]}
+
+    def invalidate(self, name: str):
+        """collection 삭제·변경 후 캐시된 handle과 schema 정보를 제거합니다."""
+        with self._lock:
+            self._collections.pop(name, None)
+            self._schemas.pop(name, None)
 
-    def get(self) -> MilvusClient:
-        return self.client
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            self._collections.clear()
+            self._schemas.clear()
+
+
+_vector_store = VectorStore()
+
+
+def get_vector_store() -> VectorStore:
+    return _vector_store
+
+
+@lru_cache
+def get_search_executor() -> ThreadPoolExecutor:
+    """client fusion hybrid 검색에서 dense 검색을 sparse 검색과 동시에 실행하는 thread pool"""
+    return ThreadPoolExecutor(max_workers=settings.HYBRID_SEARCH_WORKERS, thread_name_prefix="hybrid-search")
+
+
+class _SharedClient:
+    """클래스 속성으로 접근할 때 공유 VectorStore의 MilvusClient를 반환하는 descriptor"""
+
+    def __get__(self, instance, owner) -> MilvusClient:
+        return get_vector_store().client
+
+
+def _estimate_nbytes(value: Any) -> int:
+    """insert 요청에서 값 하나가 차지하는 대략적인 크기(byte)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        # sparse vector: int64 index + float32 weight
+        return len(value) * 12
+    if isinstance(value, (list, tuple)):
+        return len(value) * 4
+    return 8
+
+
+class ColumnarInsertWriter:
+    """
+    column 단위 데이터를 크기 제한에 맞는 batch로 나누어 비동기 insert로 보내는 writer.
+
+    batch는 행 dict 대신 schema field 순서의 column 목록으로 보내며, 최대 `max_in_flight`개의 insert를 동시에
+    진행합니다. 가장 오래된 insert가 끝나야 다음 batch를 보내므로 메모리 사용량과 gRPC 메시지 크기가 제한됩니다.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        partition_name: str | None = None,
+        *,
+        max_batch_bytes: int = settings.MILVUS_INSERT_MAX_BATCH_BYTES,
+        max_batch_rows: int = settings.MILVUS_INSERT_MAX_BATCH_ROWS,
+        max_in_flight: int = settings.MILVUS_INSERT_MAX_IN_FLIGHT,
+    ):
+        self._collection = get_vector_store().collection(collection_name)
+        self._partition_name = partition_name
+        self._max_batch_bytes = max_batch_bytes
+        self._max_batch_rows = max_batch_rows
+        self._max_in_flight = max(max_in_flight, 1)
+        # auto_id primary key를 제외한 schema field 순서
+        self._field_names = [field.name for field in self._collection.schema.fields if not field.auto_id]
+        self._in_flight: deque = deque()
+        self.inserted_count = 0
+
+    def write(self, columns: dict[str, list]):
+        """
+        column 데이터를 batch로 나누어 insert합니다.
+
+        Args:
+            columns (dict[str, list]): field 이름 → 값 목록. schema의 모든 field(auto_id 제외)를 포함해야 합니다.
+        """
+        missing = [name for name in self._field_names if name not in columns]
+        if missing:
+            raise ValueError(f"Missing columns for insert: {missing}")
+        values = [columns[name] for name in self._field_names]
+        for start, end in self._plan_batches(values):
+            self._submit([column[start:end] for column in values])
+
+    def _plan_batches(self, values: list[list]) -> list[tuple[int, int]]:
+        num_rows = len(values[0]) if values else 0
+        row_bytes = [sum(_estimate_nbytes(column[row]) for column in values) for row in range(num_rows)]
+        batches = []
+        start, batch_bytes = 0, 0
+        for row, size in enumerate(row_bytes):
+            rows = row - start
+            if rows and (rows >= self._max_batch_rows or batch_bytes + size > self._max_batch_bytes):
+                batches.append((start, row))
+                start, batch_bytes = row, 0
+            batch_bytes += size
+        if start < num_rows:
+            batches.append((start, num_rows))
+        return batches
+
+    def _submit(self, batch: list[list]):
+        while len(self._in_flight) >= self._max_in_flight:
+            self._wait_oldest()
+        future = self._collection.insert(batch, partition_name=self._partition_name, _async=True)
+        self._in_flight.append(future)
+
+    def _wait_oldest(self):
+        result = self._in_flight.popleft().result()
+        self.inserted_count += result.insert_count
+
+    def wait(self) -> int:
+        """진행 중인 insert가 모두 끝날 때까지 기다리고 지금까지 삽입한 엔티티 수를 반환합니다."""
+        while self._in_flight:
+            self._wait_oldest()
+        return self.inserted_count
+
+    def flush(self):
+        """삽입한 데이터를 seal하여 영속화합니다. 파일 단위 적재가 끝난 뒤 한 번만 호출합니다."""
+        self.wait()
+        self._collection.flush()
+
+    def __enter__(self) -> "ColumnarInsertWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wait()
 
 
 class MilvusManager:
-    _client = Client().get()
+    _client = _SharedClient()
 
     @classmethod
-    def create_collection(cls, name: str, *, dimension: int = 1024) -> str:
+    def create_collection(
+        cls,
+        name: str,
+        *,
+        dimension: int = 1024,
+        vector_fields: tuple[str, ...] = (DENSE_VECTOR_FIELD, SPARSE_VECTOR_FIELD),
+        storage_mode: VectorStorageMode | str = VectorStorageMode.FLOAT32,
+        truncated_dimension: int | None = None,
+        index_type: str | None = None,
+        index_params: dict[str, Any] | None = None,
+        shared: bool = False,
+        shards_num: int = 1,
+        replica_number: int = 1,
+    ) -> str:
         """
         Milvus에 컬렉션이 존재하지 않을 경우 컬렉션을 생성합니다.
 
+        chunk metadata(파일 id, 파일 유형, page, chunk 순번, 적재 시각)는 scalar index를 둔 scalar field로 저장하여
+        검색 filter를 ANN 검색 안에서 적용합니다.
+
+        `shared`이면 여러 지식이 함께 사용하는 컬렉션으로 만듭니다. 지식 id를 partition key field로 두어 Milvus가
+        `MILVUS_SHARED_NUM_PARTITIONS`개의 파티션에 hash로 나누어 저장합니다.
+        지식·파일마다 컬렉션과 파티션을 만들지 않으므로 Milvus의 컬렉션·파티션 수 제한 없이 지식 수를 늘릴 수 있습니다.
+
         매개변수:
             name (str): 생성할 컬렉션의 이름.
             dimension (int, 선택적): 벡터 필드의 차원 수. 기본값은 1024.
+            vector_fields (tuple[str, ...], 선택적): 저장할 vector field. 기본값은 dense, sparse 모두.
+            storage_mode (VectorStorageMode | str, 선택적): dense vector 저장 모드. 기본값은 float32.
+            truncated_dimension (int | None, 선택적): truncated 모드에서 저장할 앞쪽 차원 수.
+            index_type (str | None, 선택적): dense vector index 유형. None이면 저장 모드의 기본값.
+            index_params (dict[str, Any] | None, 선택적): dense vector index build params.
+            shared (bool, 선택적): 지식 id를 partition key로 쓰는 shared 컬렉션 여부. 기본값은 False.
+            shards_num (int, 선택적): 적재를 나누어 처리할 shard 수. 생성 후에는 바꿀 수 없습니다. 기본값은 1.
+            replica_number (int, 선택적): load할 replica 수. 기본값은 1.
 
         반환:
             str: 생성된 컬렉션의 이름.
         """
         if not cls._client.has_collection(name):
-            schemas = cls._create_collection_schemas(dimension=dimension)
+            dense_index_type, dense_index_params = resolve_index(storage_mode, index_type, index_params)
+            schemas = cls._create_collection_schemas(
+                dimension=stored_dimension(storage_mode, dimension, truncated_dimension),
+                vector_fields=vector_fields,
+                storage_mode=storage_mode,
+                shared=shared,
+            )
+            # partition key를 쓰는 컬렉션은 파티션을 직접 만들 수 없고 생성 시 파티션 수를 정함
+            partition_options = {"num_partitions": settings.MILVUS_SHARED_NUM_PARTITIONS} if shared else {}
             cls._client.create_collection(
                 collection_name=name,
                 schema=schemas,
+                consistency_level=settings.MILVUS_CONSISTENCY_LEVEL,
+                shards_num=shards_num,
+                **partition_options,
             )
 
-            dense_vector_index_params = cls._client.prepare_index_params()
-            dense_vector_index_params.add_index(field_name="dense_vector", index_type="AUTOINDEX", metric_type="COSINE")
-            sparse_vector_index_params = cls._client.prepare_index_params()
-            sparse_vector_index_params.add_index(
-                field_name="sparse_vector", index_type="SPARSE_WAND", metric_type="IP", params={"drop_ratio_build": 0.5}
-            )
-            cls._client.create_index(collection_name=name, index_params=dense_vector_index_params)
-            cls._client.create_index(collection_name=name, index_params=sparse_vector_index_params)
-            cls._client.load_collection(collection_name=name)
+            if DENSE_VECTOR_FIELD in vector_fields:
+                cls.create_index(
+                    name,
+                    field_name=DENSE_VECTOR_FIELD,
+                    index_type=dense_index_type.value,
+                    metric_type=dense_metric_type(storage_mode),
+                    params=dense_index_params,
+                )
+            if SPARSE_VECTOR_FIELD in vector_fields:
+                sparse_vector_index_params = cls._client.prepare_index_params()
+                sparse_vector_index_params.add_index(
+                    field_name=SPARSE_VECTOR_FIELD,
+                    index_type="SPARSE_WAND",
+                    metric_type="IP",
+                    params={"drop_ratio_build": 0.5},
+                )
+                cls._client.create_index(collection_name=name, index_params=sparse_vector_index_params)
+            if not get_vector_store().is_lite:
+                metadata_index_params = cls._client.prepare_index_params()
+                for field_name, scalar_index_type in METADATA_INDEX_TYPES.items():
+                    metadata_index_params.add_index(field_name=field_name, index_type=scalar_index_type)
+                cls._client.create_index(collection_name=name, index_params=metadata_index_params)
+            cls._client.load_collection(collection_name=name, replica_number=replica_number)
+            get_vector_store().invalidate(name)
         return name
 
-    # TODO: 필요시 별도 API로 Index 생성하도록 수정 <- 전체 collection, schema 목록 확인 및 선택 후 추가 가능하도록 선행되어야 함
     @classmethod
     def create_index(
-        cls, collection_name: str, *, field_name: str = "vector", index_type: str = "HNSW", metric_type: str = "L2"
+        cls,
+        collection_name: str,
+        *,
+        field_name: str = DENSE_VECTOR_FIELD,
+        index_type: str = "HNSW",
+        metric_type: str = "COSINE",
+        params: dict[str, Any] | None = None,
     ):
         """
         Milvus 컬렉션의 지정된 필드에 인덱스를 생성합니다.
 
         매개변수:
             collection_name (str): 컬렉션의 이름.
-            field_name (str, 선택적): 인덱스를 생성할 필드의 이름. 기본값은 "vector".
+            field_name (str, 선택적): 인덱스를 생성할 필드의 이름. 기본값은 "dense_vector".
             index_type (str, 선택적): 인덱스의 유형. 기본값은 "HNSW".
-            metric_type (str, 선택적): 인덱스의 메트릭 유형. 기본값은 "L2".
+            metric_type (str, 선택적): 인덱스의 메트릭 유형. 기본값은 "COSINE".
+            params (dict[str, Any] | None, 선택적): 인덱스 build params.
         """
         index_params = cls._client.prepare_index_params()
-        # TODO: 관리자 페이지에서 직접 설정하도록
         index_params.add_index(
-            field_name=field_name, index_type=index_type, metric_type=metric_type, params={"M": 8, "efConstruction": 64}
+            field_name=field_name, index_type=index_type, metric_type=metric_type, params=params or {}
         )
         cls._client.create_index(collection_name=collection_name, index_params=index_params)
+        get_vector_store().invalidate(collection_name)
+
+    @classmethod
+    def rebuild_index(
+        cls,
+        collection_name: str,
+        *,
+        field_name: str,
+        index_type: str,
+        metric_type: str,
+        params: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        replica_number: int = 1,
+    ):
+        """
+        검색을 멈추지 않고 컬렉션의 인덱스를 다시 만듭니다.
+
+        Milvus는 load된 컬렉션의 인덱스를 바꿀 수 없으므로, 같은 schema의 shadow 컬렉션에 새 인덱스를 만들고
+        파티션별로 데이터를 복사한 뒤 load가 끝나면 이름을 교체합니다. 복사하는 동안에는 기존 컬렉션으로 검색하며,
+        이름을 교체하는 짧은 순간에만 컬렉션을 찾을 수 없습니다. 복사 중에 적재한 데이터는 반영되지 않으므로
+        rebuild 동안에는 데이터셋 적재를 멈춰야 합니다. chunk id를 primary key로 쓰는 컬렉션은 chunk id를 그대로 복사하며,
+        텍스트를 저장하는 기존 auto_id 컬렉션만 primary key가 새로 발급됩니다.
+        원본은 release되어 있으면 먼저 load하며, residency 관리가 복사 중에 release하지 않도록 호출하는 쪽에서
+        `CollectionResidencyManager.hold`로 감싸야 합니다. 파티션을 직접 만들 수 없는 partition key 컬렉션(shared)은
+        지원하지 않습니다.
+
+        매개변수:
+            collection_name (str): 컬렉션의 이름.
+            field_name (str): 인덱스를 다시 만들 필드의 이름.
+            index_type (str): 새 인덱스의 유형.
+            metric_type (str): 새 인덱스의 메트릭 유형.
+            params (dict[str, Any] | None, 선택적): 새 인덱스 build params.
+            batch_size (int, 선택적): 복사할 때 한 번에 읽는 엔티티 수.
+            replica_number (int, 선택적): shadow 컬렉션을 load할 replica 수. shard 수는 원본과 같습니다.
+        """
+        vector_store = get_vector_store()
+        source = vector_store.collection(collection_name)
+        # partition key 컬렉션은 파티션별 복사(create_partition)를 할 수 없음
+        if any(field.is_partition_key for field in source.schema.fields):
+            raise ValueError(f"Collection '{collection_name}' uses a partition key; rebuild_index is not supported")
+        shadow_name = f"{collection_name}__rebuild"
+        retired_name = f"{collection_name}__retired"
+        # query_iterator는 load된 컬렉션에서만 동작하며, residency 관리로 release된 컬렉션일 수 있음
+        if cls._client.get_load_state(collection_name)["state"] != LoadState.Loaded:
+            cls._client.load_collection(collection_name=collection_name, replica_number=replica_number)
+        cls.drop_collection(shadow_name)
+        cls._client.create_collection(
+            collection_name=shadow_name,
+            schema=source.schema,
+            consistency_level=settings.MILVUS_CONSISTENCY_LEVEL,
+            shards_num=source.num_shards,
+        )
+        for index in source.indexes:
+            if index.field_name == field_name:
+                cls.create_index(
+                    shadow_name, field_name=field_name, index_type=index_type, metric_type=metric_type, params=params
+                )
+            elif "metric_type" not in index.params:
+                # metadata scalar index(STL_SORT, INVERTED)는 metric 없이 같은 유형으로 다시 만듦
+                scalar_index_params = cls._client.prepare_index_params()
+                scalar_index_params.add_index(field_name=index.field_name, index_type=index.params["index_type"])
+                cls._client.create_index(collection_name=shadow_name, index_params=scalar_index_params)
+            else:
+                cls.create_index(
+                    shadow_name,
+                    field_name=index.field_name,
+                    index_type=index.params["index_type"],
+                    metric_type=index.params["metric_type"],
+                    params=index.params.get("params"),
+                )
+
+        output_fields = [field.name for field in source.schema.fields if not field.auto_id]
+        for partition in source.partitions:
+            if partition.name != "_default":
+                cls.create_partition(shadow_name, partition.name)
+            iterator = source.query_iterator(
+                batch_size=batch_size, output_fields=output_fields, partition_names=[partition.name]
+            )
+            with ColumnarInsertWriter(shadow_name, partition.name) as writer:
+                while rows := iterator.next():
+                    writer.write({name: [row[name] for row in rows] for name in output_fields})
+            iterator.close()
+        vector_store.collection(shadow_name).flush()
+        cls._client.load_collection(collection_name=shadow_name, replica_number=replica_number)
+
+        cls._client.rename_collection(old_name=collection_name, new_name=retired_name)
+        cls._client.rename_collection(old_name=shadow_name, new_name=collection_name)
+        vector_store.invalidate(collection_name)
+        vector_store.invalidate(shadow_name)
+        cls.drop_collection(retired_name)
+
+    @classmethod
+    def copy_to_shared_collection(
+        cls,
+        collection_name: str,
+        shared_collection_name: str,
+        *,
+        knowledge_id: int,
+        store_chunks: Callable[[int, list[dict]], list[int]] | None = None,
+        batch_size: int = settings.MILVUS_SHARED_MIGRATION_BATCH_SIZE,
+    ) -> int:
+        """
+        지식 하나의 dedicated 컬렉션 데이터를 shared 컬렉션으로 복사합니다.
+
+        파티션별로 데이터를 읽어 지식 id와 함께 삽입합니다. 원본에 metadata field가 없으면 파일 id는 파티션 이름
+        (`{컬렉션 이름}_{파일 id}`)에서 얻고, 나머지 metadata는 `METADATA_DEFAULTS`로 채웁니다.
+        원본이 텍스트를 저장하는 auto_id 컬렉션이면 `store_chunks(파일 id, 행 목록)`으로 텍스트를 chunk store에 옮기고
+        반환된 chunk id를 primary key로 삽입합니다.
+        실패 후 다시 실행할 수 있도록 복사 전에 shared 컬렉션에 남아 있는 같은 지식의 엔티티를 지웁니다.
+        원본 컬렉션은 삭제하지 않으며, 복사 중에 적재한 데이터는 반영되지 않으므로 이전 동안에는 데이터셋 적재를 멈춰야
+        합니다. chunk id를 primary key로 쓰는 원본은 chunk id를 그대로 유지하며, 기존 auto_id 원본만 chunk store에서
+        chunk id가 새로 발급됩니다.
+
+        매개변수:
+            collection_name (str): 복사할 dedicated 컬렉션의 이름.
+            shared_collection_name (str): 복사할 shared 컬렉션의 이름. schema의 vector field가 같아야 합니다.
+            knowledge_id (int): partition key로 저장할 지식 id.
+            store_chunks (Callable[[int, list[dict]], list[int]] | None, 선택적): 텍스트 → chunk id 저장 함수.
+            batch_size (int, 선택적): 한 번에 읽는 엔티티 수.
+
+        반환:
+            int: 복사한 엔티티 수.
+        """
+        source = get_vector_store().collection(collection_name)
+        # residency 관리로 release된 컬렉션일 수 있음
+        cls._client.load_collection(collection_name=collection_name)
+        cls._client.delete(collection_name=shared_collection_name, filter=knowledge_filter(knowledge_id))
+
+        output_fields = [field.name for field in source.schema.fields if not field.auto_id]
+        if CHUNK_ID_FIELD not in output_fields and store_chunks is None:
+            raise ValueError(f"Collection '{collection_name}' stores texts; store_chunks is required")
+        prefix = f"{collection_name}_"
+        with ColumnarInsertWriter(shared_collection_name) as writer:
+            for partition in source.partitions:
+                file_id = partition.name.removeprefix(prefix)
+                # 파일별 파티션이 아닌 파티션(_default)의 엔티티는 파일 id 0
+                file_id = int(file_id) if partition.name.startswith(prefix) and file_id.isdigit() else 0
+                iterator = source.query_iterator(
+                    batch_size=batch_size, output_fields=output_fields, partition_names=[partition.name]
+                )
+                while rows := iterator.next():
+                    columns = {name: [row[name] for row in rows] for name in output_fields}
+                    if CHUNK_ID_FIELD not in columns:
+                        columns[CHUNK_ID_FIELD] = store_chunks(file_id, rows)
+                    columns[KNOWLEDGE_ID_FIELD] = [knowledge_id] * len(rows)
+                    columns.setdefault(KNOWLEDGE_FILE_ID_FIELD, [file_id] * len(rows))
+                    for name, default in METADATA_DEFAULTS.items():
+                        columns.setdefault(name, [default] * len(rows))
+                    writer.write(columns)
+                iterator.close()
+            writer.flush()
+        return writer.inserted_count
 
     # TODO: 필요시 schema 동적으로 추가할 수 있도록 <- 단순 vector store 역할만 수행하면되기에 필요여부 확인
     @classmethod
-    def _create_collection_schemas(cls, *, dimension: int = 1024, max_length: int = 8192):
+    def _create_collection_schemas(
+        cls,
+        *,
+        dimension: int = 1024,
+        vector_fields: tuple[str, ...] = (DENSE_VECTOR_FIELD, SPARSE_VECTOR_FIELD),
+        storage_mode: VectorStorageMode | str = VectorStorageMode.FLOAT32,
+        shared: bool = False,
+    ):
         """
-        컬렉션의 스키마를 생성합니다.
+        컬렉션의 스키마를 생성합니다. 텍스트는 chunk store(knowledge_chunk)에 두고, primary key로 chunk id를 저장합니다.
 
         매개변수:
             dimension (int, 선택적): 벡터 필드의 차원 수. 기본값은 1024.
-            max_length (int, 선택적): 벡터 필드의 차원 수. 기본값은 8192.
+            vector_fields (tuple[str, ...], 선택적): 저장할 vector field. 기본값은 dense, sparse 모두.
+            storage_mode (VectorStorageMode | str, 선택적): dense vector 저장 모드. 기본값은 float32.
+            shared (bool, 선택적): 지식 id partition key field 추가 여부. 기본값은 False.
         반환:
             schema: 컬렉션의 스키마 객체.
         """
+        if not vector_fields:
+            raise ValueError("At least one vector field is required")
         schema = cls._client.create_schema(
             auto_id=False,
             enable_dynamic_field=False,
         )
-        schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True, auto_id=True)
-        schema.add_field(field_name="dense_vector", datatype=DataType.FLOAT_VECTOR, dim=dimension)
-        schema.add_field(field_name="sparse_vector", datatype=DataType.SPARSE_FLOAT_VECTOR)
-        schema.add_field(field_name="text", datatype=DataType.VARCHAR, max_length=max_length)
+        schema.add_field(field_name=CHUNK_ID_FIELD, datatype=DataType.INT64, is_primary=True, auto_id=False)
+        if DENSE_VECTOR_FIELD in vector_fields:
+            schema.add_field(
+                field_name=DENSE_VECTOR_FIELD,
+                datatype=DENSE_VECTOR_DATATYPES[VectorStorageMode(storage_mode)],
+                dim=dimension,
+            )
+        if SPARSE_VECTOR_FIELD in vector_fields:
+            schema.add_field(field_name=SPARSE_VECTOR_FIELD, datatype=DataType.SPARSE_FLOAT_VECTOR)
+        schema.add_field(field_name=KNOWLEDGE_FILE_ID_FIELD, datatype=DataType.INT64)
+        schema.add_field(field_name=FILE_TYPE_FIELD, datatype=DataType.VARCHAR, max_length=16)
+        schema.add_field(field_name=PAGE_FIELD, datatype=DataType.INT64)
+        schema.add_field(field_name=CHUNK_INDEX_FIELD, datatype=DataType.INT64)
+        schema.add_field(field_name=CREATED_AT_FIELD, datatype=DataType.INT64)
+        if shared:
+            schema.add_field(field_name=KNOWLEDGE_ID_FIELD, datatype=DataType.INT64, is_partition_key=True)
         return schema
 
     @classmethod
@@ -124,18 +715,36 @@ class MilvusManager:
         return partition_name
 
     @classmethod
-    def embed_documents(cls, collection_name: str, entities: list[dict[str, Any]], partition_name: str = None):
+    def embed_documents(
+        cls,
+        collection_name: str,
+        columns: dict[str, list],
+        partition_name: str = None,
+        *,
+        flush: bool = settings.MILVUS_FLUSH_AFTER_INSERT,
+    ) -> int:
         """
-        지정된 컬렉션에 문서(엔티티)를 삽입합니다.
+        지정된 컬렉션에 문서(엔티티)를 column 단위 batch로 나누어 삽입합니다.
+
+        컬렉션은 생성 시 load되어 있으므로 삽입 후 다시 load하지 않으며, 삽입한 데이터는 컬렉션의 일관성 수준에 따라
+        검색에 반영됩니다. `flush`를 지정하면 마지막에 한 번 flush하여 growing segment를 seal합니다.
 
         매개변수:
             collection_name (str): 컬렉션의 이름.
-            entities (list[dict[str, int | float]]): 컬렉션에 삽입할 엔티티 목록.
+            columns (dict[str, list]): field 이름 → 값 목록. 모든 목록의 길이는 같아야 합니다.
+            partition_name (str, 선택적): 삽입할 파티션의 이름. 없으면 생성합니다.
+            flush (bool, 선택적): 삽입 후 flush 여부. 기본값은 MILVUS_FLUSH_AFTER_INSERT.
+
+        반환:
+            int: 삽입한 엔티티 수.
         """
-        if not cls._client.has_partition(collection_name, partition_name):
-            partition_name = cls.create_partition(collection_name, partition_name)
-        cls._client.insert(collection_name=collection_name, data=entities, partition_name=partition_name)
-        cls._client.load_collection(collection_name=collection_name)
+        if partition_name is not None:
+            cls.create_partition(collection_name, partition_name)
+        with ColumnarInsertWriter(collection_name, partition_name) as writer:
+            writer.write(columns)
+        if flush:
+            writer.flush()
+        return writer.inserted_count
 
     @classmethod
     def drop_collection(cls, collection_name: str) -> bool:
@@ -151,6 +760,7 @@ class MilvusManager:
         try:
             if cls._client.has_collection(collection_name):
                 cls._client.drop_collection(collection_name)
+                get_vector_store().invalidate(collection_name)
                 return True
             else:
                 return False
@@ -158,12 +768,13 @@ class MilvusManager:
             raise Exception(f"An error occurred while droping the collection '{collection_name}': {e}")
 
     @classmethod
-    def load_collection(cls, collection_name: str) -> bool:
+    def load_collection(cls, collection_name: str, replica_number: int = 1) -> bool:
         """
         Loads a collection into memory if it exists.
 
         Args:
             collection_name (str): The name of the collection to load.
+            replica_number (int): The number of replicas to load across query nodes.
 
         Returns:
             bool: True if the collection exists and is loaded successfully, False otherwise.
@@ -173,13 +784,44 @@ class MilvusManager:
         """
         try:
             if cls._client.has_collection(collection_name):
-                cls._client.load_collection(collection_name)
+                cls._client.load_collection(collection_name, replica_number=replica_number)
                 return True
             else:
                 return False
         except Exception as e:
             raise Exception(f"An error occurred while loading the collection '{collection_name}': {e}")
 
+    @classmethod
+    def set_replica_number(cls, collection_name: str, replica_number: int) -> bool:
+        """
+        load된 컬렉션의 replica 수를 바꿉니다.
+
+        Milvus는 load된 컬렉션의 replica 수를 그대로 바꿀 수 없으므로 release한 뒤 새 replica 수로 다시 load합니다.
+        다시 load하는 동안에는 컬렉션을 검색할 수 없습니다. release된 컬렉션은 다음 load부터 적용되도록 그대로 둡니다.
+        새 replica 수로 load하지 못하면 기존 replica 수로 다시 load합니다.
+
+        매개변수:
+            collection_name (str): 컬렉션의 이름.
+            replica_number (int): 새 replica 수. query node 수보다 많을 수 없습니다.
+
+        반환:
+            bool: 컬렉션을 다시 load했으면 True, load되어 있지 않아 바꾸지 않았으면 False.
+
+        Raises:
+            ValueError: 새 replica 수로 load하지 못한 경우 (query node 부족 등).
+        """
+        if cls._client.get_load_state(collection_name)["state"] != LoadState.Loaded:
+            return False
+        current_replica_number = len(get_vector_store().collection(collection_name).get_replicas().groups)
+        cls._client.release_collection(collection_name)
+        try:
+            cls._client.load_collection(collection_name, replica_number=replica_number)
+        except Exception as e:
+            cls._client.release_collection(collection_name)
+            cls._client.load_collection(collection_name, replica_number=current_replica_number)
+            raise ValueError(f"Failed to load '{collection_name}' with {replica_number} replicas: {e}")
+        return True
+
     @classmethod
     def release_collection(cls, collection_name: str) -> bool:
         """
@@ -213,69 +855,160 @@ class MilvusManager:
 
 
 class MilvusSearchManager:
-    def __init__(self, collection_name: str, top_k: int):
+    def __init__(
+        self,
+        collection_name: str,
+        top_k: int,
+        *,
+        storage_mode: VectorStorageMode | str = VectorStorageMode.FLOAT32,
+        truncated_dimension: int | None = None,
+        rescore_multiplier: int = 4,
+        rescore_vectors: Callable[[list[int]], dict[int, bytes]] | None = None,
+        index_type: str | None = None,
+        search_params: dict[str, Any] | None = None,
+        filter_expr: str | None = None,
+        partition_names: list[str] | None = None,
+        min_score: float | None = None,
+    ):
         """
         MilvusSearchManager 클래스의 생성자. 주어진 컬렉션 이름과 상위 k개의 결과 제한을 설정하고,
-        Milvus에 연결하여 컬렉션을 초기화합니다.
+        공유 VectorStore에서 캐시된 컬렉션 handle을 가져옵니다.
+
+        압축 저장 모드(float16, binary, truncated)에서는 `top_k * rescore_multiplier`개의 후보를 coarse search로 찾은 뒤
+        적재할 때 저장한 full-precision dense vector(float32 byte)를 `rescore_vectors`로 한 번에 조회하여
+        cosine similarity를 다시 계산하고 top_k를 고릅니다. 후보를 다시 인코딩하지 않으며, vector가 없는 후보가 있으면
+        MissingRescoreVectorsError를 발생시킵니다. 검색 결과에 텍스트가 없으면 호출하는 쪽에서 최종 결과의 텍스트를 조회합니다.
+
+        `min_score`를 지정하면 점수가 그보다 큰 결과만 반환하며, top_k는 결과 수의 상한이 됩니다. dense 검색은
+        range search(`radius`)로 Milvus에서 거르고, sparse vector field는 range search를 지원하지 않으므로 sparse 검색
+        결과는 client에서 거릅니다. hybrid 검색은 dense/sparse 결과를 가져와 client에서 합친 뒤 거르며, weighted 방식은
+        fusion 후 `min_score`를 넘을 수 없는 후보를 각 검색의 하한으로 미리 제외합니다. rescoring하는 압축 저장 모드의
+        dense 점수는 rescoring 후에 거릅니다.
 
         Args:
             collection_name (str): 사용할 Milvus 컬렉션의 이름.
             top_k (int): 검색 시 반환할 상위 k개의 결과 수.
+            storage_mode (VectorStorageMode | str): 컬렉션의 dense vector 저장 모드.
+            truncated_dimension (int | None): truncated 모드에서 저장한 앞쪽 차원 수.
+            rescore_multiplier (int): rescoring할 후보 수 배수.
+            rescore_vectors (Callable[[list[int]], dict[int, bytes]] | None): chunk id 목록 → 저장된 float32 vector 조회 함수.
+            index_type (str | None): 컬렉션의 dense vector index 유형. None이면 저장 모드의 기본값.
+            search_params (dict[str, Any] | None): dense vector search params (ef, nprobe, search_list 등).
+            filter_expr (str | None): ANN 검색 안에서 적용할 scalar filter (`metadata_filter`, shared 컬렉션의
+                `knowledge_filter`). 후보를 가져온 뒤 거르지 않으므로 filter가 있어도 top_k개를 찾습니다.
+            partition_names (list[str] | None): 검색할 파티션 (partition routing). None이면 모든 파티션.
+            min_score (float | None): 반환할 결과의 점수 하한 (제외). None이면 점수로 거르지 않음.
         """
-        self.connect_to_milvus()
-        self._collection = Collection(collection_name)
+        self._collection = get_vector_store().collection(collection_name)
+        self._filter_expr = filter_expr
+        self._partition_names = partition_names
+        self._min_score = min_score
         self._top_k = top_k
-        self._dense_search_param = {"metric_type": "COSINE", "params": {}}
+        self._storage_mode = VectorStorageMode(storage_mode)
+        self._truncated_dimension = truncated_dimension
+        self._rescore = requires_rescoring(self._storage_mode)
+        if self._rescore and rescore_vectors is None:
+            raise ValueError(f"{self._storage_mode.value} storage requires stored rescore vectors")
+        self._rescore_limit = min(top_k * max(rescore_multiplier, 1), 16384)
+        self._rescore_vectors = rescore_vectors
+        dense_index_type, _ = resolve_index(self._storage_mode, index_type)
+        dense_limit = self._rescore_limit if self._rescore else top_k
+        self._dense_search_param = {
+            "metric_type": dense_metric_type(self._storage_mode),
+            "params": resolve_search_params(dense_index_type, search_params, dense_limit),
+        }
         self._sparse_search_param = {"metric_type": "IP", "params": {}}
+        # 캐시된 schema 정보에서 컬렉션에 존재하는 출력 field만 요청
+        fields = get_vector_store().field_names(collection_name)
+        self._output_fields = [field for field in SEARCH_OUTPUT_FIELDS if field in fields]
 
-    @staticmethod
-    def connect_to_milvus():
-        """
-        Milvus 서버에 연결합니다. 연결 정보는 환경 변수에서 설정된 값을 사용합니다.
-        """
-        connections.connect(
-            uri=f"http://{settings.MILVUS_DB_HOST}:{settings.MILVUS_DB_PORT}",
-            token=f"{settings.MILVUS_DB_USERNAME}:{settings.MILVUS_DB_PASSWORD}",
-            db_name=settings.MILVUS_DB_NAME,
-        )
-
-    def dense_search(self, embeded_query: np.ndarray):
+    def dense_search(self, embeded_query: np.ndarray) -> list[list[SearchHit]]:
         """
         주어진 밀집(dense) 임베딩을 기반으로 Milvus에서 검색을 수행합니다.
 
         Args:
-            embeded_query (np.ndarray): 검색에 사용할 밀집 임베딩 벡터.
+            embeded_query (np.ndarray): 검색에 사용할 full-precision 밀집 임베딩 벡터.
 
         Returns:
-            list: 검색된 결과를 반환합니다.
+            list[list[SearchHit]]: query별 검색 결과. 압축 저장 모드에서는 rescoring된 cosine similarity를 distance로 반환.
         """
+        if not self._rescore:
+            return self._coarse_dense_search(embeded_query, self._min_score)
+        # coarse search 점수는 rescoring한 점수와 다르므로 rescoring 후에 거름
+        hits = self._coarse_dense_search(embeded_query)
+        return [
+            self._above_min_score(self._rescore_hits(query, query_hits))[: self._top_k]
+            for query, query_hits in zip(embeded_query, hits)
+        ]
+
+    def _above_min_score(self, hits: list[SearchHit]) -> list[SearchHit]:
+        return self._above_score(hits, self._min_score)
+
+    @staticmethod
+    def _above_score(hits: list[SearchHit], bound: float | None) -> list[SearchHit]:
+        """점수가 bound보다 큰 결과. range search를 지원하지 않는 sparse 검색 결과를 client에서 거를 때 사용합니다."""
+        if bound is None:
+            return hits
+        return [hit for hit in hits if hit.distance > bound]
+
+    @staticmethod
+    def _range_param(param: dict[str, Any], radius: float | None) -> dict[str, Any]:
+        """radius를 지정하면 점수가 radius보다 큰 결과만 찾는 dense range search param (COSINE, IP 기준)"""
+        if radius is None:
+            return param
+        return {**param, "params": {**param["params"], "radius": radius}}
+
+    def _coarse_dense_search(self, embeded_query: np.ndarray, radius: float | None = None) -> list[list[SearchHit]]:
         search_results = self._collection.search(
-            embeded_query,
-            anns_field="dense_vector",
-            limit=self._top_k,
-            output_fields=["text"],
-            param=self._dense_search_param,
+            to_storage_vectors(embeded_query, self._storage_mode, self._truncated_dimension),
+            anns_field=DENSE_VECTOR_FIELD,
+            limit=self._rescore_limit if self._rescore else self._top_k,
+            expr=self._filter_expr,
+            partition_names=self._partition_names,
+            output_fields=self._output_fields,
+            param=self._range_param(self._dense_search_param, radius),
         )
-        return search_results
+        return SearchHit.from_results(search_results, self._output_fields)
 
-    def sparse_search(self, embeded_query: np.ndarray):
+    def _rescore_hits(self, query: np.ndarray, hits: list[SearchHit]) -> list[SearchHit]:
+        """후보의 full-precision dense vector로 cosine similarity를 다시 계산하여 내림차순으로 정렬합니다."""
+        if not hits:
+            return hits
+        vectors = self._rescore_vectors([hit.id for hit in hits])
+        missing = [hit.id for hit in hits if hit.id not in vectors]
+        if missing:
+            raise MissingRescoreVectorsError(missing)
+        full_vectors = np.stack([np.frombuffer(vectors[hit.id], dtype=np.float32) for hit in hits])
+        scores = cosine_scores(query, full_vectors)
+        rescored = [SearchHit(hit.id, float(score), hit.fields) for hit, score in zip(hits, scores)]
+        return sorted(rescored, key=lambda hit: hit.distance, reverse=True)
+
+    def sparse_search(self, embeded_query: np.ndarray, limit: int | None = None) -> list[list[SearchHit]]:
         """
         주어진 희소(sparse) 임베딩을 기반으로 Milvus에서 검색을 수행합니다.
 
         Args:
             embeded_query (np.ndarray): 검색에 사용할 희소 임베딩 벡터.
+            limit (int | None): 반환할 결과 수. None이면 top_k.
 
         Returns:
-            list: 검색된 결과를 반환합니다.
+            list[list[SearchHit]]: query별 검색 결과.
         """
+        hits = self._sparse_search(embeded_query, limit or self._top_k)
+        return [self._above_min_score(query_hits) for query_hits in hits]
+
+    def _sparse_search(self, embeded_query, limit: int) -> list[list[SearchHit]]:
+        # SPARSE_FLOAT_VECTOR field는 range search(radius)를 지원하지 않으므로 점수 하한은 호출하는 쪽에서 적용
         search_results = self._collection.search(
             embeded_query,
-            anns_field="sparse_vector",
-            limit=self._top_k,
-            output_fields=["text"],
+            anns_field=SPARSE_VECTOR_FIELD,
+            limit=limit,
+            expr=self._filter_expr,
+            partition_names=self._partition_names,
+            output_fields=self._output_fields,
             param=self._sparse_search_param,
         )
-        return search_results
+        return SearchHit.from_results(search_results, self._output_fields)
 
     def hybrid_search(
         self,
@@ -283,26 +1016,120 @@ class MilvusSearchManager:
         sparse_embeded_query: np.ndarray,
         dense_weight=0.6,
         sparse_weight=0.4,
-    ):
+        fusion_method: FusionMethod | str = FusionMethod.WEIGHTED,
+        rrf_k: int = 60,
+        fusion_mode: FusionMode | str = FusionMode.SERVER,
+    ) -> list[list[SearchHit]]:
         """
         밀집(dense) 및 희소(sparse) 임베딩을 결합하여 하이브리드 검색을 수행합니다. 각 검색 결과에
-        가중치를 부여하여 순위를 재조정합니다.
+        가중치를 부여하거나(weighted, normalized) 순위를 합쳐(rrf) 순위를 재조정합니다.
+
+        server 방식은 Milvus hybrid_search의 ranker로 합치고, client 방식은 dense/sparse 검색을 동시에 실행하여
+        프로세스에서 합칩니다. normalized 방식, 압축 저장 모드, `min_score`를 지정한 경우는 항상 client 방식입니다.
 
         Args:
             dense_embeded_query (np.ndarray): 밀집 임베딩 벡터.
             sparse_embeded_query (np.ndarray): 희소 임베딩 벡터.
-            sparse_weight (float, optional): 희소 임베딩 결과에 부여할 가중치. 기본값은 0.6.
-            dense_weight (float, optional): 밀집 임베딩 결과에 부여할 가중치. 기본값은 0.4.
+            dense_weight (float, optional): 밀집 임베딩 결과에 부여할 가중치. 기본값은 0.6.
+            sparse_weight (float, optional): 희소 임베딩 결과에 부여할 가중치. 기본값은 0.4.
+            fusion_method (FusionMethod | str, optional): 결과를 합치는 방식. 기본값은 weighted.
+            rrf_k (int, optional): rrf 방식의 smoothing 상수. 기본값은 60.
+            fusion_mode (FusionMode | str, optional): 결과를 합치는 위치(server | client). 기본값은 server.
 
         Returns:
-            list: 하이브리드 검색을 통해 얻은 결과를 반환합니다.
+            list[list[SearchHit]]: 하이브리드 검색을 통해 얻은 결과를 반환합니다.
         """
-        dense_req = AnnSearchRequest(dense_embeded_query, "dense_vector", self._dense_search_param, limit=self._top_k)
+        fusion_method = FusionMethod(fusion_method)
+        client_fusion = FusionMode(fusion_mode) == FusionMode.CLIENT or fusion_method == FusionMethod.NORMALIZED
+        if client_fusion or self._rescore or self._min_score is not None:
+            return self._client_hybrid_search(
+                dense_embeded_query,
+                sparse_embeded_query,
+                fusion_method=fusion_method,
+                dense_weight=dense_weight,
+                sparse_weight=sparse_weight,
+                rrf_k=rrf_k,
+            )
+        dense_req = AnnSearchRequest(
+            dense_embeded_query, DENSE_VECTOR_FIELD, self._dense_search_param, limit=self._top_k, expr=self._filter_expr
+        )
         sparse_req = AnnSearchRequest(
-            sparse_embeded_query, "sparse_vector", self._sparse_search_param, limit=self._top_k
+            sparse_embeded_query,
+            SPARSE_VECTOR_FIELD,
+            self._sparse_search_param,
+            limit=self._top_k,
+            expr=self._filter_expr,
         )
-        rerank = WeightedRanker(dense_weight, sparse_weight)
+        if fusion_method == FusionMethod.RRF:
+            rerank = RRFRanker(rrf_k)
+        else:
+            rerank = WeightedRanker(dense_weight, sparse_weight)
         search_results = self._collection.hybrid_search(
-            [dense_req, sparse_req], rerank=rerank, limit=self._top_k, output_fields=["text"]
+            [dense_req, sparse_req],
+            rerank=rerank,
+            limit=self._top_k,
+            partition_names=self._partition_names,
+            output_fields=self._output_fields,
+        )
+        return SearchHit.from_results(search_results, self._output_fields)
+
+    def _client_hybrid_search(
+        self,
+        dense_embeded_query: np.ndarray,
+        sparse_embeded_query,
+        *,
+        fusion_method: FusionMethod,
+        dense_weight: float,
+        sparse_weight: float,
+        rrf_k: int,
+    ) -> list[list[SearchHit]]:
+        """
+        client에서 결과를 합치는 hybrid search.
+
+        dense 검색을 thread pool에서 sparse 검색과 동시에 실행하므로 latency는 두 검색 중 느린 쪽에 가깝습니다.
+        결과는 `util.fusion.fuse_hit_lists`로 모든 query를 한 번에 합친 뒤 `min_score`로 거릅니다.
+        weighted 방식은 fusion 후 `min_score`를 넘을 수 없는 후보를 dense는 range search radius로, sparse는 client에서
+        제외합니다.
+        압축 저장 모드는 dense coarse search 후보와 sparse 후보를 합친 뒤 모든 후보의 dense 점수를 full-precision
+        vector로 다시 계산하여 합칩니다.
+        """
+        dense_radius = sparse_bound = None
+        if self._min_score is not None and fusion_method == FusionMethod.WEIGHTED:
+            # fusion 점수의 최댓값은 가중치 합
+            if self._min_score >= dense_weight + sparse_weight:
+                return [[] for _ in range(len(dense_embeded_query))]
+            dense_radius, sparse_bound = weighted_leg_bounds(self._min_score, dense_weight, sparse_weight)
+        # coarse search 점수는 rescoring한 점수와 다르므로 radius를 적용하지 않음
+        dense_future = get_search_executor().submit(
+            self._coarse_dense_search, dense_embeded_query, None if self._rescore else dense_radius
+        )
+        sparse_hits = [
+            self._above_score(query_hits, sparse_bound)
+            for query_hits in self._sparse_search(
+                sparse_embeded_query, self._rescore_limit if self._rescore else self._top_k
+            )
+        ]
+        dense_hits = dense_future.result()
+        if self._rescore:
+            dense_hits = [
+                self._rescore_hits(
+                    query,
+                    list({hit.id: hit for hit in [*query_sparse_hits, *query_dense_hits]}.values()),
+                )
+                for query, query_dense_hits, query_sparse_hits in zip(dense_embeded_query, dense_hits, sparse_hits)
+            ]
+        fused = fuse_hit_lists(
+            dense_hits,
+            sparse_hits,
+            method=fusion_method,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            rrf_k=rrf_k,
+            limit=self._top_k,
+            min_score=self._min_score,
         )
-        return search_results
+        results = []
+        for query_fused, query_dense_hits, query_sparse_hits in zip(fused, dense_hits, sparse_hits):
+            fields = {hit.id: hit.fields for hit in [*query_sparse_hits, *query_dense_hits]}
+            results.append([SearchHit(hit_id, score, fields[hit_id]) for hit_id, score in query_fused])
+        return results
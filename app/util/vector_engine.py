@@ -0,0 +1,24 @@
+from enum import Enum
+
+from util.local_vector_engine import LocalSearchManager, LocalVectorManager
+from util.vector_database import MilvusManager, MilvusSearchManager
+
+
+class VectorEngine(str, Enum):
+    MILVUS = "milvus"
+    LOCAL = "local"  # 프로세스 안에서 memory-map 파일로 검색 (소규모 지식, 오프라인 benchmark)
+
+
+class CollectionLayout(str, Enum):
+    DEDICATED = "dedicated"  # 지식마다 컬렉션, 파일마다 파티션
+    SHARED = "shared"  # 지식 id를 partition key로 쓰는 공유 컬렉션 (milvus engine 전용)
+
+
+def get_vector_manager(engine: VectorEngine | str) -> type[MilvusManager] | type[LocalVectorManager]:
+    """지식의 vector engine에 맞는 collection 관리 class"""
+    return LocalVectorManager if VectorEngine(engine) == VectorEngine.LOCAL else MilvusManager
+
+
+def get_search_manager_class(engine: VectorEngine | str) -> type[MilvusSearchManager] | type[LocalSearchManager]:
+    """지식의 vector engine에 맞는 검색 class. 두 class는 생성자와 검색 method가 같습니다."""
+    return LocalSearchManager if VectorEngine(engine) == VectorEngine.LOCAL else MilvusSearchManager
@@ -0,0 +1,102 @@
+from enum import Enum
+from typing import Any
+
+from util.vector_storage import VectorStorageMode
+
+
+class DenseIndexType(str, Enum):
+    AUTOINDEX = "AUTOINDEX"
+    FLAT = "FLAT"
+    HNSW = "HNSW"
+    IVF_FLAT = "IVF_FLAT"
+    IVF_PQ = "IVF_PQ"
+    DISKANN = "DISKANN"
+    SCANN = "SCANN"
+    # binary 저장 모드 전용
+    BIN_FLAT = "BIN_FLAT"
+    BIN_IVF_FLAT = "BIN_IVF_FLAT"
+
+
+BINARY_INDEX_TYPES = (DenseIndexType.BIN_FLAT, DenseIndexType.BIN_IVF_FLAT)
+
+# index 생성 시 기본 build params (저장된 index_params가 덮어씀)
+DEFAULT_INDEX_PARAMS: dict[DenseIndexType, dict[str, Any]] = {
+    DenseIndexType.HNSW: {"M": 16, "efConstruction": 200},
+    DenseIndexType.IVF_FLAT: {"nlist": 1024},
+    DenseIndexType.IVF_PQ: {"nlist": 1024, "m": 16, "nbits": 8},
+    DenseIndexType.SCANN: {"nlist": 1024, "with_raw_data": True},
+    DenseIndexType.BIN_IVF_FLAT: {"nlist": 128},
+}
+
+# 검색 시 기본 search params (저장된 search_params가 덮어씀)
+DEFAULT_SEARCH_PARAMS: dict[DenseIndexType, dict[str, Any]] = {
+    DenseIndexType.HNSW: {"ef": 64},
+    DenseIndexType.IVF_FLAT: {"nprobe": 16},
+    DenseIndexType.IVF_PQ: {"nprobe": 16},
+    DenseIndexType.DISKANN: {"search_list": 100},
+    DenseIndexType.SCANN: {"nprobe": 16, "reorder_k": 100},
+    DenseIndexType.BIN_IVF_FLAT: {"nprobe": 16},
+}
+
+# index 유형별로 허용하는 search params
+SEARCH_PARAM_NAMES: dict[DenseIndexType, tuple[str, ...]] = {
+    DenseIndexType.HNSW: ("ef",),
+    DenseIndexType.IVF_FLAT: ("nprobe",),
+    DenseIndexType.IVF_PQ: ("nprobe",),
+    DenseIndexType.DISKANN: ("search_list",),
+    DenseIndexType.SCANN: ("nprobe", "reorder_k"),
+    DenseIndexType.BIN_IVF_FLAT: ("nprobe",),
+}
+
+
+def default_index_type(storage_mode: VectorStorageMode | str) -> DenseIndexType:
+    if VectorStorageMode(storage_mode) == VectorStorageMode.BINARY:
+        return DenseIndexType.BIN_IVF_FLAT
+    return DenseIndexType.AUTOINDEX
+
+
+def resolve_index(
+    storage_mode: VectorStorageMode | str, index_type: str | None = None, index_params: dict | None = None
+) -> tuple[DenseIndexType, dict[str, Any]]:
+    """
+    지식에 저장된 index 설정을 검증하고 기본 build params와 합칩니다.
+
+    Args:
+        storage_mode (VectorStorageMode | str): dense vector 저장 모드.
+        index_type (str | None): index 유형. None이면 저장 모드의 기본값.
+        index_params (dict | None): index build params.
+
+    Returns:
+        tuple[DenseIndexType, dict[str, Any]]: index 유형과 build params.
+
+    Raises:
+        ValueError: 저장 모드에서 사용할 수 없는 index 유형인 경우.
+    """
+    resolved = DenseIndexType(index_type) if index_type else default_index_type(storage_mode)
+    is_binary = VectorStorageMode(storage_mode) == VectorStorageMode.BINARY
+    if is_binary != (resolved in BINARY_INDEX_TYPES):
+        raise ValueError(f"{resolved.value} index is not supported for {VectorStorageMode(storage_mode).value} storage")
+    return resolved, {**DEFAULT_INDEX_PARAMS.get(resolved, {}), **(index_params or {})}
+
+
+def resolve_search_params(index_type: DenseIndexType | str, search_params: dict | None, limit: int) -> dict[str, Any]:
+    """
+    index 유형에 맞는 search params를 만듭니다. 허용되지 않는 key는 무시하고,
+    HNSW의 `ef`와 DiskANN의 `search_list`는 Milvus 제약에 맞게 limit 이상으로 올립니다.
+
+    Args:
+        index_type (DenseIndexType | str): index 유형.
+        search_params (dict | None): 지식에 저장된 search params.
+        limit (int): 검색할 결과 수.
+
+    Returns:
+        dict[str, Any]: Milvus search `params`.
+    """
+    index_type = DenseIndexType(index_type)
+    allowed = SEARCH_PARAM_NAMES.get(index_type, ())
+    params = {**DEFAULT_SEARCH_PARAMS.get(index_type, {}), **(search_params or {})}
+    params = {key: value for key, value in params.items() if key in allowed}
+    for key in ("ef", "search_list"):
+        if key in params:
+            params[key] = max(int(params[key]), limit)
+    return params
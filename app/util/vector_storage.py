@@ -0,0 +1,82 @@
+from enum import Enum
+
+import numpy as np
+
+
+class VectorStorageMode(str, Enum):
+    FLOAT32 = "float32"  # FLOAT_VECTOR (기본값, 압축하지 않음)
+    FLOAT16 = "float16"  # FLOAT16_VECTOR, 메모리 1/2
+    BINARY = "binary"  # 부호 비트만 저장하는 BINARY_VECTOR (HAMMING), 메모리 1/32
+    TRUNCATED = "truncated"  # Matryoshka 방식으로 앞쪽 차원만 저장하는 FLOAT_VECTOR
+
+
+def requires_rescoring(mode: VectorStorageMode | str) -> bool:
+    """압축 저장 모드는 coarse search 후 full-precision vector로 후보를 다시 점수화합니다."""
+    return VectorStorageMode(mode) != VectorStorageMode.FLOAT32
+
+
+def stored_dimension(mode: VectorStorageMode | str, dimension: int, truncated_dimension: int | None = None) -> int:
+    """
+    저장 모드에서 Milvus dense vector field에 사용할 차원 수를 반환합니다.
+
+    Args:
+        mode (VectorStorageMode | str): 저장 모드.
+        dimension (int): 임베딩 모델의 dense vector 차원.
+        truncated_dimension (int | None): truncated 모드에서 남길 앞쪽 차원 수.
+
+    Returns:
+        int: 저장 차원 수. binary 모드는 bit 수.
+    """
+    mode = VectorStorageMode(mode)
+    if mode == VectorStorageMode.TRUNCATED:
+        if truncated_dimension is None or not 0 < truncated_dimension <= dimension:
+            raise ValueError(f"truncated storage requires 0 < truncated_dimension <= {dimension}")
+        return truncated_dimension
+    if mode == VectorStorageMode.BINARY and dimension % 8 != 0:
+        raise ValueError("binary storage requires a dimension that is a multiple of 8")
+    return dimension
+
+
+def bytes_per_vector(mode: VectorStorageMode | str, dimension: int, truncated_dimension: int | None = None) -> int:
+    mode = VectorStorageMode(mode)
+    stored = stored_dimension(mode, dimension, truncated_dimension)
+    if mode == VectorStorageMode.FLOAT16:
+        return stored * 2
+    if mode == VectorStorageMode.BINARY:
+        return stored // 8
+    return stored * 4
+
+
+def to_storage_vectors(
+    vectors: np.ndarray, mode: VectorStorageMode | str, truncated_dimension: int | None = None
+) -> list:
+    """
+    full-precision dense vector를 저장 모드의 Milvus 입력 형식으로 변환합니다. insert와 coarse search에 모두 사용합니다.
+
+    Args:
+        vectors (np.ndarray): (n, dim) 크기의 dense vector.
+        mode (VectorStorageMode | str): 저장 모드.
+        truncated_dimension (int | None): truncated 모드에서 남길 앞쪽 차원 수.
+
+    Returns:
+        list: float32/float16 모드는 np.ndarray 행 목록, binary 모드는 bytes 목록.
+    """
+    mode = VectorStorageMode(mode)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if mode == VectorStorageMode.FLOAT16:
+        return list(vectors.astype(np.float16))
+    if mode == VectorStorageMode.BINARY:
+        return [row.tobytes() for row in np.packbits(vectors > 0, axis=-1)]
+    if mode == VectorStorageMode.TRUNCATED:
+        truncated = vectors[:, :truncated_dimension]
+        norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+        return list(truncated / np.maximum(norms, 1e-12))
+    return list(vectors)
+
+
+def cosine_scores(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """query 1개와 후보 vector들 사이의 cosine similarity"""
+    query = np.asarray(query, dtype=np.float32).reshape(-1)
+    candidates = np.asarray(candidates, dtype=np.float32)
+    norms = np.linalg.norm(candidates, axis=-1) * np.linalg.norm(query)
+    return candidates @ query / np.maximum(norms, 1e-12)